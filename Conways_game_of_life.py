@@ -1,77 +1,151 @@
-import pygame
+import os
 from sys import exit
+from hashlife import HashlifeBoard
+from sparse import IncrementalLife
+from rules import life
+from simulation import Simulation
+from renderer import GridOverlay, TextCache, visibleWindow, windowFromCells, drawWindow, drawCells, drawSparkline, np
+from patterns import readPattern, writePattern, cellsFromRuns
+from timeline import Timeline, cellsState, cellsFromState
+from stats import StatsCollector, fields
 
-# standard setup
-pygame.init()
-screen = pygame.display.set_mode((2020, 1100))
-pygame.display.set_caption("Conway's game of life")
-clock = pygame.time.Clock()
+# standard setup (pygame is only imported and the window only opened by main(), so the module can be imported without them)
+pygame = None
+screen = None
+clock = None
+# the simulation thread, started by main()
+simulation = None
 
 # deciding the size of a cell
 cell_size = 20
-# list with all the positions of the cell
-pos_list = []
+# the rule of the game (see rules.py), only rules with two states and the 8 direct neighbours work here
+rule = life
+# set with all the positions of the alive cells, it keeps the neighbour counts up to date with every change (see sparse.py)
+universe = IncrementalLife(rule=rule)
+# the hashlife universe while the game jumps 2^step_exponent generations at once, it keeps everything it computed between the jumps
+# (the cells only go back into the universe above when a single generation is advanced or the cells are edited)
+jump_board = None
 # boolean for showing the squares (or not)
 display_squares = False
 # list with all the colors of the game
 color_list = ["purple", "white", "red", "blue", "green", "yellow", "brown", "grey"]
 # the color that is currently used
 color = 0
-# variable for advancing the state of the game continuously
-advance_continuously = False
 # how fast the program should advance continuously
 tempo = 5
+# every state advances 2^step_exponent generations (computed with hashlife if it's bigger than 0)
+step_exponent = 0
+# pixel position of the cell (0, 0) on the screen, the cells themselves never move (panning only changes this)
+camera_pos = (0, 0)
 # list for the booleans for moving the camera
 moving_list = [0, 0, 0, 0]
 # counting the frames of the game
 frames = 0
 # variable for reducing the speed of the camera (otherwise the camera would scroll every frame)
 frame_camera_reduce = 0
-# variable for reducing the amount of states that are displayed in one second
-frame_state_reduce = 0
-# font of the game
-font = pygame.font.Font("Pixeltype.ttf", 45)
+# font of the game, every text is only rendered again when it changes (the font file is loaded with the first text)
+font = TextCache(45, "Pixeltype.ttf", None)
+# cached surface with the background squares
+grid_overlay = GridOverlay()
+# every generation and every edit (for stepping back with left and undo/redo with z and y), needs numpy
+# recording is switched on and off with "r" (it copies all cells every generation, so it's off at the start)
+timeline = None
+# amount of generations since the start
+generation = 0
+# population, births, deaths and bounding box of the last generations (see stats.py, shown as a sparkline)
+statistics = StatsCollector()
+# pattern files that can be pasted with the keys 1 to 9 (listed by main())
+pattern_files = []
 
 def save_cells_onto_file():
-    # function for saving the cells (via transferring them onto a different cell)
-    global pos_list
-    # opening the file
-    with open("saved_cells.txt", "w") as sc:
-        for cell in pos_list:
-            sc.write(str(cell))
-            # writing the words not in one row
-            sc.write("\n")
+    # function for saving the cells as RLE (see patterns.py), the simulation has to be stopped before
+    writePattern("saved_cells.rle", current_cells())
 
 def load_cells():
-    # loading in the saved cells from the file saved_cells (just look up Project 2)
-    # the tuple (as a string) is going to be stored in two variables that change
-    # the comma. These will then be aded as a integer to the tuple
-    global pos_list
-    with open("saved_cells.txt", "r") as sc: 
-        for tuple in sc:
-            first_num = ""
-            second_num = ""
-            iterate_string = tuple
-            change_num = False
-            
-            for c in iterate_string:
-                if c in "0123456789":
-                    if not change_num: first_num += c
-                    else             : second_num += c
-                elif c == ",": change_num = True
-            
-            pos_list.append((int(first_num), int(second_num)))
+    # loading in the saved cells from saved_cells.rle (or the old saved_cells.txt if there is no rle file yet)
+    # the file is read line by line, so big patterns never have to be in memory as text
+    global universe
+    for path in ("saved_cells.rle", "saved_cells.txt"):
+        if os.path.exists(path):
+            for cell in cellsFromRuns(readPattern(path)):
+                universe.add(cell)
+            return
+
+def record_state(kind):
+    # adding the current cells to the timeline ("step" after advancing, "edit" after changing cells)
+    if timeline is None:
+        return
+    timeline.record(cellsState(current_cells()), generation, kind)
+
+def current_cells():
+    # the alive cells (of the hashlife universe while jumping)
+    if jump_board is not None:
+        return list(jump_board.liveCells())
+    return universe
+
+def leave_jump_mode():
+    # putting the cells of the hashlife universe back into the universe (before advancing by one or editing)
+    global universe, jump_board
+    if jump_board is not None:
+        universe = IncrementalLife(jump_board.liveCells(), rule)
+        jump_board = None
+
+def seek_state(position):
+    # putting the cells of a recorded entry of the timeline back (if it's still recorded)
+    global universe, generation, jump_board
+    if timeline is None or position is None or not timeline.available(position):
+        return
+    jump_board = None
+    universe = IncrementalLife(cellsFromState(timeline.seek(position)), rule)
+    generation = timeline.generationOf(position)
+    statistics.resync()
+
+def toggle_timeline():
+    # starting to record (the current cells are the first entry) or dropping everything that was recorded
+    global timeline
+    if timeline is not None or np is None:
+        timeline = None
+        return
+    timeline = Timeline()
+    record_state("edit")
+
+def step_back():
+    # going back by one entry of the timeline
+    if timeline is not None:
+        seek_state(timeline.position - 1)
+
+def undo():
+    # going back to the state before the last edit
+    if timeline is not None:
+        seek_state(timeline.undoTarget())
+
+def redo():
+    # redoing the next edit that was undone
+    if timeline is not None:
+        seek_state(timeline.redoTarget())
 
 def paste_copy(number_of_copy, mouse_cell_x, mouse_cell_y):
     # function for pasting predeclared cells
-    global pos_list
+    # 0: Glider, 1 to 9: the pattern files in the patterns folder (rle, life 1.06, cells or mc) in alphabetical order
+    global universe
+    leave_jump_mode()
     copy_list = [
         [(mouse_cell_x + 2, mouse_cell_y), (mouse_cell_x + 2, mouse_cell_y + 1), (mouse_cell_x + 2, mouse_cell_y + 2), (mouse_cell_x + 1, mouse_cell_y + 2), (mouse_cell_x, mouse_cell_y + 1)]
 
         ]
-    # 0: Glider
-    for cells in copy_list[number_of_copy]:
-        pos_list.append(cells)
+    if number_of_copy < len(copy_list):
+        for cells in copy_list[number_of_copy]:
+            universe.add(cells)
+    elif number_of_copy - len(copy_list) < len(pattern_files):
+        for x, y in cellsFromRuns(readPattern(pattern_files[number_of_copy - len(copy_list)])):
+            universe.add((mouse_cell_x + x, mouse_cell_y + y))
+    statistics.resync()
+    record_state("edit")
+
+def mouse_cell():
+    # the cell under the mouse (the camera position is taken into account)
+    mouse_x, mouse_y = pygame.mouse.get_pos()
+    return int((mouse_x - camera_pos[0]) // cell_size), int((mouse_y - camera_pos[1]) // cell_size)
 
 def check_for_copy_inputs(pressed_key):
     # function for determinig if the user has pressed a number (and the copy the cells with the according copy slot)
@@ -94,136 +168,87 @@ def check_for_copy_inputs(pressed_key):
             } 
         copy_index = dic[pressed_key]
         # actually pasting the copies (via the function)
-        paste_copy(copy_index, pygame.mouse.get_pos()[0] // cell_size, pygame.mouse.get_pos()[1] // cell_size)
-
-def around_cell(x, y):
-    # function for returning a list with the positions of the cells around the cell which is the parameter
-    # used for checking the cells around the targeted cell
-    return [(x - 1, y - 1), (x, y - 1), (x + 1, y - 1), (x - 1, y), (x + 1, y), (x - 1, y + 1), (x, y + 1), (x + 1, y + 1)]
-
-def amount_neighbours(x, y):
-    # function for determining how many neighbours a cell has
-    global pos_list
-    n = 0
-    for cell in around_cell(x, y):
-        if cell in pos_list:
-            n += 1
-    return n
-
-def list_of_dead_neighbours(x, y):
-    # function that returns a list of all dead neighbours
-    lis = []
-    for cell in around_cell(x, y):
-        if cell not in pos_list:
-            lis.append(cell)
-    return lis
-
-def new_cell_possible(x, y):
-    # function for determining if a new cell can spawn around the targeted cell
-    global pos_list
-    ret_list = []
-    # determining if there are exactly two neighbours
-    if amount_neighbours(x, y) == 2 or amount_neighbours(x, y) == 1:
-        # iterating over the dead neighbours to see if one of them has exactly three neighbours
-        for cell in list_of_dead_neighbours(x, y):
-            if amount_neighbours(cell[0], cell[1]) == 3:
-                # if so then adding the cell to a list that will be returned
-                ret_list.append(cell)
-        return ret_list
-    else:
-        return "none"
-
-def cell_is_alive(x, y):
-    # function for checking if the clicked cell already exists
-    global pos_list
-    for pos in pos_list: if pos == (x, y): return True
-    return False
-    # alternative solution lmao: return [(0, 0) for pos in pos_list if pos == (x, y)]
-
-def display_all_cells():
-    # function for displaying all cells (via iterating over them in the pos_list)
-    global pos_list, cell_size, color_list, color
-    for pos in pos_list:
-        # drawing the rectangle from the position of the cell and the lengths (and heights) by multiplying
-        # with the cell size)
-        pygame.draw.rect(screen, pygame.Color(color_list[color]),
-                         pygame.rect.Rect(pos[0] * cell_size, pos[1] * cell_size, cell_size, cell_size))
+        simulation.submit(paste_copy, copy_index, *mouse_cell())
+
+def display_all_cells(cells):
+    # function for displaying all cells (the latest snapshot of the simulation)
+    # only the cells on the screen are drawn: one pixel per cell, scaled up by the cell size
+    global cell_size, color_list, color
+    if np is None:
+        drawCells(screen, cells, camera_pos, cell_size, pygame.Color(color_list[color]))
+        return
+    x0, y0, x1, y1 = visibleWindow(camera_pos, cell_size, screen.get_size())
+    window = windowFromCells(cells, x0, y0, x1, y1)
+    drawWindow(screen, window, x0, y0, camera_pos, cell_size, pygame.Color(color_list[color]))
 
 def create_new_cell(x, y):
     # creating a new cell with the position as a parameter
-    global pos_list
-    # checking if the cell is already there
-    if not cell_is_alive(x, y):
-        pos_list.append((x, y))
-    # "killing" the cell if it is already alive
-    else:
-        pos_list.remove((x, y))
+    # ("killing" the cell if it is already alive)
+    global universe
+    leave_jump_mode()
+    universe.toggle((x, y))
+    statistics.resync()
+    record_state("edit")
 
 def advance_state():
     # function for advancing the state of the game by one (killing overcrowded or isolated cells and creating new ones)
-    global pos_list
-    # checking for every currently living cell
-    dead_cells = []
-    new_cells = []
-    for pos in pos_list:
-        # checking if the cell should die (if it has one or zero or four or more neighbouring cells)
-        neighbouring_cells = amount_neighbours(pos[0], pos[1])
-        if neighbouring_cells <= 1 or neighbouring_cells >= 4:
-            # appending the cell into the dead_cells list to delete it later
-            dead_cells.append(pos)
-        # checking if the conditions are met for a new cell to be created
-        if not new_cell_possible(pos[0], pos[1]) == "none":
-            # adding the cells to a list of cells which will be created
-            # (sometimes there are two that's why the for statement)
-            for new_cell in new_cell_possible(pos[0], pos[1]):
-                if new_cell not in new_cells:
-                    new_cells.append(new_cell)
-    # creating a list to iterate over
-    iterate_list = pos_list.copy()
-    # now deleting the cells that should be deleted
-    for cell2 in iterate_list:
-        # checking if the cell should be deleted
-        if cell2 in dead_cells:
-            pos_list.remove(cell2)
-    # creating the cells that should be created
-    for new_cell2 in new_cells:
-        pos_list.append(new_cell2)
+    global universe, generation
+    leave_jump_mode()
+    universe.step()
+    generation += 1
+    statistics.observe(universe, generation)
+    record_state("step")
+    return 1
+
+def advance_state_by_exponent():
+    # function for advancing the state by 2^step_exponent generations at once using hashlife
+    global generation, jump_board
+    if step_exponent == 0:
+        return advance_state()
+    if jump_board is None:
+        jump_board = HashlifeBoard(0)
+        jump_board.setRule(rule)
+        for x, y in universe:
+            jump_board.setCell(x, y, 1)
+    generations = jump_board.jump(step_exponent)
+    generation += generations
+    # hashlife doesn't know its births and deaths, so the statistics are counted
+    statistics.observe(jump_board, generation, generations)
+    record_state("step")
+    return generations
+
+def clear_cells():
+    # deleting all cells
+    global universe
+    leave_jump_mode()
+    universe.clear()
+    statistics.resync()
+    record_state("edit")
 
 def make_squares():
-    # function for making the field of the game
+    # function for making the field of the game (the lines are cached and only redrawn after zooming)
+    # the grid looks the same every cell_size pixels, so panning doesn't redraw it
     global cell_size
-    x = cell_size
-    for i in range(2020 // cell_size):
-        pygame.draw.line(screen, pygame.Color(color_list[color]), (x, 0), (x, 1100), 1)
-        x += cell_size
-    x = cell_size
-    for i in range(1100 // cell_size):
-        pygame.draw.line(screen, pygame.Color(color_list[color]), (0, x), (2020, x))
-        x += cell_size
+    grid_overlay.draw(screen, (camera_pos[0] % cell_size, camera_pos[1] % cell_size), cell_size, pygame.Color(color_list[color]))
 
 def change_cell_size(operator):
     # function for changing the cell_size when the user scrolls
-    # bigger when the user scrolls up and vice versa
-    global cell_size
+    # bigger when the user scrolls up and vice versa, the cell under the mouse stays under the mouse
+    global cell_size, camera_pos
+    mouse_x, mouse_y = pygame.mouse.get_pos()
+    world_x, world_y = (mouse_x - camera_pos[0]) / cell_size, (mouse_y - camera_pos[1]) / cell_size
     if operator == "plus":
         if cell_size < 100:
             cell_size += 1
     elif operator == "minus":
         if cell_size > 2:
             cell_size -= 1
+    camera_pos = (round(mouse_x - world_x * cell_size), round(mouse_y - world_y * cell_size))
 
 def move_camera(change_x, change_y):
-    # function for moving the "camera"
-    global pos_list
-    iterate_list = pos_list.copy()
-    for cell in iterate_list:
-        # converting the tuple to a list so we can change it
-        c = list(cell)
-        # changing the list
-        c[0] += change_x
-        c[1] += change_y
-        pos_list.append(tuple(c))
-        pos_list.remove(cell)
+    # function for moving the "camera" (by whole cells, the cells stay where they are)
+    global camera_pos
+    camera_pos = (camera_pos[0] + change_x * cell_size, camera_pos[1] + change_y * cell_size)
 
 def moving_camera_continuously():
     # function for iterating over the moving list and moving the camera accordingly
@@ -270,27 +295,32 @@ def change_color():
 def display_tempo():
     # function for displaying the tempo in the top right corner of the game
     global tempo, color, screen, color_list, font
-    text = font.render(f"Tempo: {tempo}", True, pygame.Color(color_list[color]))
-    rect = text.get_rect(topleft=(0, 0))
-    screen.blit(text, rect)
+    font.draw(screen, "tempo", f"Tempo: {tempo}  ({simulation.gensPerSecond:.0f} gens/s)", pygame.Color(color_list[color]), topleft=(0, 0))
+
+def display_statistics():
+    # function for displaying the population (and its sparkline) of the last generations in the bottom left corner
+    global statistics, color, screen, color_list, font
+    sample = statistics.last
+    if sample is None:
+        return
+    drawSparkline(screen, statistics.series("population"), pygame.Rect(10, screen.get_height() - 120, 400, 75), pygame.Color(color_list[color]))
+    font.draw(screen, "population", f"Population: {sample[1]}", pygame.Color(color_list[color]), bottomleft=(10, screen.get_height()))
 
 def display_running():
     # function for displaying the tempo in the top right corner of the game
     global tempo, color, screen, color_list, font
-    text = font.render("fast mode", True, pygame.Color(color_list[color]))
-    rect = text.get_rect(topright=(2020, 0))
-    screen.blit(text, rect)
+    font.draw(screen, "running", "fast mode", pygame.Color(color_list[color]), topright=(2020, 0))
 
 def execute_standard_functions():
     # function purely to make the code (the game loop) more readable
     # background color (has to be set otherwise you can't easily delete the cells)
-    global frame_camera_reduce, clock, frame_state_reduce, frames, display_squares, tempo
+    global frame_camera_reduce, clock, frames, display_squares, tempo
     screen.fill(pygame.Color("black"))
     # displaying the background squares
     if display_squares:
         make_squares()
     # displaying all cells
-    display_all_cells()
+    display_all_cells(simulation.snapshot)
     # making the camera faster if the cells are smaller
     frame_camera_reduce = round(cell_size * 0.1)
     if frame_camera_reduce == 0:
@@ -299,15 +329,13 @@ def execute_standard_functions():
     if frames % frame_camera_reduce == 0:
         if not moving_list == [0, 0, 0, 0]:
             moving_camera_continuously()
-    # taking control over the speed of the continuous advancing of the game state
-    frame_state_reduce = 20 - tempo * 2 + 1
     # displaying the tempo of the game
     display_tempo()
-    # advancing continuously if the user wants at capped frames
-    if advance_continuously:
+    display_step_size()
+    display_statistics()
+    # the simulation is advancing on its own thread, just showing that it's running
+    if simulation.running:
         display_running()
-        if frames % frame_state_reduce == 0:
-            advance_state()
     # updating the screen
     pygame.display.update()
     # updating the frames of the game
@@ -326,58 +354,119 @@ def change_tempo(change):
         tempo = 10
     elif tempo == 0:
         tempo = 1
+    update_interval()
+
+def update_interval():
+    # the time between two states is the same as it was at 120 fps (tempo 10 runs as fast as possible)
+    simulation.interval = (20 - tempo * 2 + 1) / 120 if tempo != 10 else 0
+
+def change_step_exponent(change):
+    # function for changing how many generations one state advances (2^step_exponent)
+    global step_exponent
+    step_exponent = min(max(step_exponent + change, 0), 60)
+
+def display_step_size():
+    # function for displaying the step size below the tempo
+    global step_exponent, color, screen, color_list, font
+    font.draw(screen, "step", f"Step: 2^{step_exponent}", pygame.Color(color_list[color]), topleft=(0, 40))
 
 def exit_game():
     # I think this is kinda obvious isn't it?
+    simulation.stop()
     save_cells_onto_file()
     pygame.quit()
     exit()
 
-# loading the cells
-load_cells()
-
-while True:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            exit_game()
-        if event.type == pygame.KEYDOWN:
-            # printing the pos_list if the user wants
-            if event.key == pygame.K_t:
-                print(f"Cell_list: {pos_list}")
-            # changing the color of the game
-            if event.key == pygame.K_c:
-                change_color()
-            # deleting all cells if the user presses "b"
-            if event.key == pygame.K_b:
-                pos_list = []
-            # making the squares invisible when the user presses "v"
-            if event.key == pygame.K_v:
-                display_squares = not display_squares
-            # advancing the state of the game by one if the user presses right
-            if event.key == pygame.K_RIGHT:
-                advance_state()
-            # advancing the state of the game continuously if the user presses "space"
-            if event.key == pygame.K_SPACE:
-                advance_continuously = not advance_continuously
-            # turning the booleans for the camera on if pressed
-            updating_bool_for_camera(event.key, 1)
-            if event.key == pygame.K_UP:
-                change_tempo(1)
-            if event.key == pygame.K_DOWN:
-                change_tempo(-1)
-            # closing the game if the user presses escape
-            if event.key == pygame.K_ESCAPE:
+def import_display():
+    # importing pygame, everything that draws or handles input needs it
+    global pygame
+    import pygame
+
+def open_window():
+    # opening the window (only the parts of pygame the game uses, pygame.init would also start audio, joysticks, ...)
+    global screen, clock
+    import_display()
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((2020, 1100))
+    pygame.display.set_caption("Conway's game of life")
+    clock = pygame.time.Clock()
+
+def main():
+    # the game loop (running the file starts the game, importing it only defines everything)
+    global simulation, pattern_files, display_squares
+    open_window()
+    # the pattern files next to the game
+    pattern_files = sorted(os.path.join("patterns", name) for name in os.listdir("patterns")) if os.path.isdir("patterns") else []
+    # loading the cells (the first entry of the timeline)
+    load_cells()
+    record_state("edit")
+    # starting the simulation thread (it owns the universe from now on, so changes go through simulation.submit)
+    simulation = Simulation(advance_state_by_exponent, lambda: list(current_cells()))
+    update_interval()
+    simulation.start()
+
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
                 exit_game()
-            # checking if the user wants to copy anything
-            check_for_copy_inputs(event.key)
-        if event.type == pygame.KEYUP:
-            # moving the camera using wasd
-            updating_bool_for_camera(event.key, 0)
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            if pygame.mouse.get_pressed() == (True, False, False):
-                # creating a new cell when the user clicks in the position of the mouse
-                create_new_cell(pygame.mouse.get_pos()[0] // cell_size, pygame.mouse.get_pos()[1] // cell_size)
-            # zooming
-            inputs_for_zooming(event.button)
-    # doing everything that needs to be done every frame
-    execute_standard_functions()
+            if event.type == pygame.KEYDOWN:
+                # printing the statistics of the last generation if the user wants
+                if event.key == pygame.K_t and statistics.last is not None:
+                    print(", ".join(f"{name}: {value}" for name, value in zip(fields, statistics.last)))
+                # changing the color of the game
+                if event.key == pygame.K_c:
+                    change_color()
+                # deleting all cells if the user presses "b"
+                if event.key == pygame.K_b:
+                    simulation.submit(clear_cells)
+                # making the squares invisible when the user presses "v"
+                if event.key == pygame.K_v:
+                    display_squares = not display_squares
+                # advancing the state of the game by one if the user presses right
+                if event.key == pygame.K_RIGHT:
+                    simulation.stepOnce()
+                # going back by one generation (or edit) if the user presses left
+                if event.key == pygame.K_LEFT:
+                    simulation.submit(step_back)
+                # undoing and redoing edits with "z" and "y"
+                if event.key == pygame.K_z:
+                    simulation.submit(undo)
+                if event.key == pygame.K_y:
+                    simulation.submit(redo)
+                # switching the recording of the timeline on and off with "r"
+                if event.key == pygame.K_r:
+                    simulation.submit(toggle_timeline)
+                # advancing the state of the game continuously if the user presses "space"
+                if event.key == pygame.K_SPACE:
+                    simulation.setRunning(not simulation.running)
+                # turning the booleans for the camera on if pressed
+                updating_bool_for_camera(event.key, 1)
+                if event.key == pygame.K_UP:
+                    change_tempo(1)
+                if event.key == pygame.K_DOWN:
+                    change_tempo(-1)
+                # changing the step size with page up and page down
+                if event.key == pygame.K_PAGEUP:
+                    change_step_exponent(1)
+                if event.key == pygame.K_PAGEDOWN:
+                    change_step_exponent(-1)
+                # closing the game if the user presses escape
+                if event.key == pygame.K_ESCAPE:
+                    exit_game()
+                # checking if the user wants to copy anything
+                check_for_copy_inputs(event.key)
+            if event.type == pygame.KEYUP:
+                # moving the camera using wasd
+                updating_bool_for_camera(event.key, 0)
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if pygame.mouse.get_pressed() == (True, False, False):
+                    # creating a new cell when the user clicks in the position of the mouse
+                    simulation.submit(create_new_cell, *mouse_cell())
+                # zooming
+                inputs_for_zooming(event.button)
+        # doing everything that needs to be done every frame
+        execute_standard_functions()
+
+if __name__ == "__main__":
+    main()
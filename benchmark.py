@@ -0,0 +1,318 @@
+import random, sys
+from time import perf_counter
+from engines import makeBoard, defaultEngine, np
+
+# compares the stepping engines on random fields of different sizes
+# usage: python benchmark.py [engines|tiles|memory|parallel|render|save|patterns|chunked|rules|incremental|timeline|disk]
+
+def randomRows(size: int, density: float = 0.3, seed: int = 1) -> list[list[int]]:
+    rng = random.Random(seed)
+    return [[1 if rng.random() < density else 0 for _ in range(size)] for _ in range(size)]
+
+def timeEngine(engine: str, size: int, gens: int) -> float:  # returns the average seconds per generation
+    board = makeBoard(engine, size)
+    board.loadList(randomRows(size))
+    start = perf_counter()
+    for _ in range(gens):
+        board.step()
+    return (perf_counter() - start) / gens
+
+def benchEngines(sizes: tuple[int, ...] = (50, 100, 200, 500, 2000)) -> None:
+    engineNames = ["list", "incremental"] + (["numpy", "bits"] if np is not None else [])
+    print(f"{'size':>6} " + " ".join(f"{name + ' ms/gen':>16}" for name in engineNames) + f" {'speedup':>9}")
+    for size in sizes:
+        results = []
+        for engine in engineNames:
+            if engine in ("list", "incremental") and size > 500:  # the pure python engines need minutes for these sizes
+                results.append(None)
+                continue
+            gens = max(1, 5_000 // size) if engine in ("list", "incremental") else max(5, 2_000_000 // (size * size))
+            results.append(timeEngine(engine, size, gens))
+        columns = " ".join(f"{r * 1000:>16.3f}" if r is not None else f"{'-':>16}" for r in results)
+        speedup = f"{results[0] / results[-1]:>8.1f}x" if results[0] is not None and len(results) > 1 else f"{'-':>9}"
+        print(f"{size:>6} {columns} {speedup}")
+
+def benchTiles(size: int = 2000, gens: int = 200) -> None:  # mostly empty field: a small soup that settles down
+    board = makeBoard("tiled", size)
+    reference = makeBoard("numpy", size)
+    rng = random.Random(1)
+    for _ in range(3000):
+        x, y = rng.randrange(900, 1100), rng.randrange(900, 1100)
+        board.setCell(x, y, 1)
+        reference.setCell(x, y, 1)
+    print(f"{'gen':>6} {'active tiles':>13} {'tiled ms':>9} {'numpy ms':>9}")
+    for gen in range(1, gens + 1):
+        start = perf_counter()
+        board.step()
+        tiled = perf_counter() - start
+        start = perf_counter()
+        reference.step()
+        full = perf_counter() - start
+        if gen in (1, 10, 50, 100, gens):
+            print(f"{gen:>6} {board.lastActiveTiles:>6}/{board.tilesPerSide ** 2:<6} {tiled * 1000:>9.3f} {full * 1000:>9.3f}")
+
+def benchMemory(size: int = 10_000) -> None:  # memory footprint of one field per representation
+    listBytes = size * (sys.getsizeof([0] * size) + 8)  # the small ints are shared, so it's the pointers + list overhead
+    numpyBoard = makeBoard("numpy", size)
+    bitBoard = makeBoard("bits", size)
+    print(f"field of {size}x{size} cells:")
+    print(f"{'nested list':>20} {listBytes / 2**20:>10.1f} MiB")
+    print(f"{'json text':>20} {size * size * 3 / 2**20:>10.1f} MiB")
+    print(f"{'numpy uint8':>20} {numpyBoard.cells.nbytes / 2**20:>10.1f} MiB")
+    print(f"{'bits':>20} {bitBoard.nbytes / 2**20:>10.1f} MiB")
+    rng = random.Random(1)
+    for _ in range(size * 10):
+        x, y = rng.randrange(size), rng.randrange(size)
+        numpyBoard.setCell(x, y, 1)
+        bitBoard.setCell(x, y, 1)
+    for board in (numpyBoard, bitBoard):
+        start = perf_counter()
+        board.step()
+        print(f"{board.name + ' step':>20} {(perf_counter() - start) * 1000:>10.1f} ms")
+
+def benchParallel(size: int = 4000, gens: int = 10) -> None:  # scaling of the parallel engine with the amount of workers
+    from parallel import ParallelBoard
+    reference = makeBoard("numpy", size)
+    rng = random.Random(1)
+    data = bytes(rng.getrandbits(8) for _ in range(size * size // 8))
+    reference.loadBits(data)
+    start = perf_counter()
+    for _ in range(gens):
+        reference.step()
+    single = (perf_counter() - start) / gens
+    print(f"{size}x{size} field, numpy (no pool): {single * 1000:.1f} ms/gen")
+    print(f"{'workers':>8} {'ms/gen':>9} {'speedup':>8} {'identical':>10}")
+    for workers in (1, 2, 4, 8):
+        board = ParallelBoard(size, workers=workers)
+        board.loadBits(data)
+        board.step()  # warming up the pool
+        board.loadBits(data)
+        start = perf_counter()
+        for _ in range(gens):
+            board.step()
+        elapsed = (perf_counter() - start) / gens
+        identical = bool((board.cells == reference.cells).all())
+        print(f"{workers:>8} {elapsed * 1000:>9.1f} {single / elapsed:>7.2f}x {str(identical):>10}")
+        board.close()
+
+def benchRender(frames: int = 20) -> None:  # frame time of the old per cell drawing vs. the windowed renderer, zoomed out
+    import os
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from renderer import GridOverlay, visibleWindow, drawWindow
+    screen = pygame.Surface((1600, 900))
+    cellSize = 2
+    print(f"{'size':>6} {'per cell rects ms':>18} {'windowed ms':>12} {'grid lines ms':>14} {'cached grid ms':>15}")
+    for size in (500, 2000, 5000):
+        board = makeBoard("numpy", size)
+        board.loadBits(bytes(random.Random(1).getrandbits(8) for _ in range(size * size // 8)))
+        cameraPos = (-(size * cellSize - 1600) / 2, -(size * cellSize - 900) / 2)
+        old = None
+        if size <= 2000:  # the old way takes seconds per frame above that
+            start = perf_counter()
+            for x, y in board.liveCells():
+                pygame.draw.rect(screen, "gray", pygame.Rect(x * cellSize + cameraPos[0], y * cellSize + cameraPos[1], cellSize, cellSize))
+            old = perf_counter() - start
+        start = perf_counter()
+        for _ in range(frames):
+            x0, y0, x1, y1 = visibleWindow(cameraPos, cellSize, screen.get_size(), (0, 0, size, size))
+            drawWindow(screen, board.window(x0, y0, x1, y1), x0, y0, cameraPos, cellSize, "gray")
+        windowed = (perf_counter() - start) / frames
+        grid = GridOverlay()
+        start = perf_counter()
+        grid.draw(screen, cameraPos, cellSize, "gray", (0, 0, size, size))
+        lines = perf_counter() - start
+        start = perf_counter()
+        for _ in range(frames):
+            grid.draw(screen, cameraPos, cellSize, "gray", (0, 0, size, size))
+        cached = (perf_counter() - start) / frames
+        oldText = f"{old * 1000:>18.1f}" if old is not None else f"{'-':>18}"
+        print(f"{size:>6} {oldText} {windowed * 1000:>12.2f} {lines * 1000:>14.2f} {cached * 1000:>15.2f}")
+
+def benchSave() -> None:  # the old json config vs. the binary save file (random field with 30% alive cells)
+    import json, os, tempfile
+    from savefile import saveSnapshot, loadSnapshot
+    settings = {"steps": 0, "cameraPos": (0.0, 0.0), "cellSize": 40, "panSpeed": 0.1, "genSpeed": 5, "screenSize": (1600, 900)}
+    print(f"{'size':>6} {'json KiB':>10} {'json save/load ms':>18} {'binary KiB':>11} {'binary save/load ms':>20}")
+    with tempfile.TemporaryDirectory() as folder:
+        for size in (100, 2000, 10_000):
+            board = makeBoard("numpy", size)
+            rng = random.Random(1)
+            board.loadBits(bytes(rng.choice((0, 1, 2, 4, 8, 16, 32, 64, 128, 3, 5, 9)) for _ in range(size * size // 8)))
+            jsonText = "-"
+            if size <= 2000:
+                jsonFile = os.path.join(folder, "config.ini")
+                start = perf_counter()
+                with open(jsonFile, "w") as f:
+                    f.write(json.dumps(dict(settings, fieldSize=size, field=board.toList())))
+                saved = perf_counter() - start
+                start = perf_counter()
+                with open(jsonFile, "r") as f:
+                    makeBoard("numpy", size).loadList(json.loads(f.read())["field"])
+                loaded = perf_counter() - start
+                jsonText = f"{os.path.getsize(jsonFile) / 1024:>10.0f} {saved * 1000:>8.1f}/{loaded * 1000:<9.1f}"
+            else:
+                jsonText = f"{'-':>10} {'-':>18}"
+            saveFile = os.path.join(folder, "life.sav")
+            start = perf_counter()
+            saveSnapshot(saveFile, settings, board)
+            saved = perf_counter() - start
+            start = perf_counter()
+            loadSnapshot(saveFile)
+            loaded = perf_counter() - start
+            print(f"{size:>6} {jsonText} {os.path.getsize(saveFile) / 1024:>11.0f} {saved * 1000:>9.1f}/{loaded * 1000:<10.1f}")
+
+def legacyLoadCells(path: str) -> list[tuple[int, int]]:  # load_cells as it was in Conways_game_of_life.py
+    pos_list = []
+    with open(path, "r") as sc:
+        for tuple in sc:
+            first_num = ""
+            second_num = ""
+            change_num = False
+            for c in tuple:
+                if c in "0123456789":
+                    if not change_num: first_num += c
+                    else             : second_num += c
+                elif c == ",": change_num = True
+            pos_list.append((int(first_num), int(second_num)))
+    return pos_list
+
+def benchPatterns(size: int = 1000, density: float = 0.3) -> None:  # loading a big soup in every pattern format
+    import os, tempfile
+    from patterns import readPattern, writePattern, cellsFromRuns
+    rng = random.Random(1)
+    cells = [(x, y) for y in range(size) for x in range(size) if rng.random() < density]
+    print(f"{len(cells)} cells")
+    print(f"{'format':>12} {'KiB':>8} {'load ms':>9}")
+    with tempfile.TemporaryDirectory() as folder:
+        legacy = os.path.join(folder, "saved_cells.txt")
+        with open(legacy, "w") as f:
+            for cell in cells:
+                f.write(str(cell) + "\n")
+        start = perf_counter()
+        legacyLoadCells(legacy)
+        print(f"{'load_cells':>12} {os.path.getsize(legacy) / 1024:>8.0f} {(perf_counter() - start) * 1000:>9.1f}")
+        for extension in (".txt", ".rle", ".lif", ".cells", ".mc"):
+            path = os.path.join(folder, "pattern" + extension)
+            if extension == ".txt":
+                path = legacy
+            else:
+                writePattern(path, cells)
+            start = perf_counter()
+            loaded = sum(1 for _ in cellsFromRuns(readPattern(path)))
+            elapsed = perf_counter() - start
+            assert loaded == len(cells)
+            print(f"{extension:>12} {os.path.getsize(path) / 1024:>8.0f} {elapsed * 1000:>9.1f}")
+
+def benchChunked(gens: int = 100) -> None:  # a small pattern (acorn) on fixed fields of growing size vs. the chunked plane
+    acorn = [(1, 0), (3, 1), (0, 2), (1, 2), (4, 2), (5, 2), (6, 2)]
+    print(f"{'board':>16} {'ms/gen':>9} {'KiB':>9}")
+    for engine, size in (("numpy", 256), ("numpy", 1024), ("numpy", 4096), ("chunked", 4096)):
+        board = makeBoard(engine, size)
+        for x, y in acorn:
+            board.setCell(x + size // 2, y + size // 2, 1)
+        start = perf_counter()
+        for _ in range(gens):
+            board.step()
+        elapsed = (perf_counter() - start) / gens
+        nbytes = board.nbytes if engine == "chunked" else board.cells.nbytes
+        print(f"{engine + ' ' + str(size):>16} {elapsed * 1000:>9.3f} {nbytes / 1024:>9.0f}")
+
+def benchRules(size: int = 500, gens: int = 20) -> None:  # every preset rule on every engine that can run it (life is the reference)
+    from rules import presets
+    engineNames = ["numpy", "tiled", "bits", "chunked", "hashlife"]
+    print(f"{'rule':>14} " + " ".join(f"{name + ' ms/gen':>16}" for name in engineNames))
+    for name, rule in presets.items():
+        results = []
+        for engine in engineNames:
+            try:
+                board = makeBoard(engine, size, "frozen", rule)
+            except ValueError:  # the engine cant run the rule
+                results.append(None)
+                continue
+            board.loadList(randomRows(size))
+            start = perf_counter()
+            for _ in range(gens if engine != "hashlife" else 2):  # hashlife is slow on soups, it shines on jumps
+                board.step()
+            results.append((perf_counter() - start) / (gens if engine != "hashlife" else 2))
+        print(f"{name:>14} " + " ".join(f"{r * 1000:>16.3f}" if r is not None else f"{'-':>16}" for r in results))
+
+def benchIncremental(size: int = 200, settle: int = 1000, gens: int = 50) -> None:  # a soup that settled into still lifes and oscillators
+    from sparse import SparseLife, IncrementalLife
+    cells = [(x, y) for y, row in enumerate(randomRows(size)) for x, cell in enumerate(row) if cell]
+    boards = {engine: makeBoard(engine, size) for engine in ["list", "incremental"] + (["numpy"] if np is not None else [])}
+    boards["sparse"], boards["incremental sparse"] = SparseLife(cells), IncrementalLife(cells)
+    print(f"{'engine':>18} {'fresh ms/gen':>13} {'settled ms/gen':>15}")
+    for name, board in boards.items():
+        if hasattr(board, "loadList"):
+            board.loadList(randomRows(size))
+        start = perf_counter()
+        for _ in range(5):
+            board.step()
+        fresh = (perf_counter() - start) / 5
+        for _ in range(settle):
+            board.step()
+        start = perf_counter()
+        for _ in range(gens):
+            board.step()
+        print(f"{name:>18} {fresh * 1000:>13.3f} {(perf_counter() - start) / gens * 1000:>15.3f}")
+
+def benchTimeline(size: int = 500, gens: int = 512, seeks: int = 50) -> None:  # memory of the timeline vs. full copies and its seek latency
+    if np is None:
+        print("the timeline requires numpy")
+        return
+    from timeline import Timeline, boardState, loadBoardState
+    board = makeBoard("numpy", size)
+    board.loadList(randomRows(size))
+    print(f"{'interval':>9} {'KiB/gen':>9} {'copies KiB/gen':>15} {'record ms':>10} {'seek ms':>8} {'worst seek ms':>14}")
+    for interval in (8, 32, 128):
+        timeline, recording = Timeline(interval), 0.0
+        for generation in range(gens):
+            start = perf_counter()
+            timeline.record(boardState(board), generation)
+            recording += perf_counter() - start
+            board.step()
+        latencies = []
+        for position in random.Random(1).choices(range(gens), k=seeks):
+            start = perf_counter()
+            loadBoardState(board, timeline.seek(position))
+            latencies.append(perf_counter() - start)
+        print(f"{interval:>9} {timeline.nbytes / gens / 1024:>9.2f} {size * size / 1024:>15.0f} {recording / gens * 1000:>10.3f} "
+              f"{sum(latencies) / seeks * 1000:>8.3f} {max(latencies) * 1000:>14.3f}")
+        board.loadList(randomRows(size))
+
+def benchDisk(size: int = 100_000, gens: int = 50, budget: int = 64 * 2**20) -> None:  # a huge field in a tile file, soups spread over it
+    if np is None:
+        print("the disk engine requires numpy")
+        return
+    import os, resource, tempfile
+    from diskboard import DiskBoard
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as folder:
+        board = DiskBoard(size, "dead", os.path.join(folder, "field.tiles"))
+        board.budget = budget
+        for _ in range(200):  # 200x200 soups at random places
+            x0, y0 = rng.randrange(size - 200), rng.randrange(size - 200)
+            board.loadWindow(x0, y0, (np.random.default_rng(rng.randrange(1 << 30)).random((200, 200)) < 0.3).astype(np.uint8))
+        print(f"{size}x{size} field ({size * size / 8 / 2**30:.2f} GiB bit packed), {board.population} alive cells, budget {budget / 2**20:.0f} MiB")
+        start = perf_counter()
+        for _ in range(gens):
+            board.step()
+        elapsed = (perf_counter() - start) / gens
+        start = perf_counter()
+        board.flush()
+        flushed = perf_counter() - start
+        stat = os.stat(board.path)
+        print(f"{'ms/gen':>8} {'active tiles':>13} {'resident MiB':>13} {'paged in':>9} {'written':>8} {'flush ms':>9} {'file GiB':>9} {'on disk MiB':>12} {'peak RSS MiB':>13}")
+        print(f"{elapsed * 1000:>8.1f} {board.lastActiveTiles:>13} {board.residentBytes / 2**20:>13.0f} {board.pagedIn:>9} {board.writtenBack:>8} "
+              f"{flushed * 1000:>9.1f} {stat.st_size / 2**30:>9.2f} {stat.st_blocks * 512 / 2**20:>12.1f} {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:>13.0f}")
+        board.close()
+
+benchmarks = {"engines": benchEngines, "tiles": benchTiles, "memory": benchMemory, "parallel": benchParallel, "render": benchRender, "save": benchSave,
+              "patterns": benchPatterns, "chunked": benchChunked, "rules": benchRules, "incremental": benchIncremental,
+              "timeline": benchTimeline, "disk": benchDisk}
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or benchmarks:
+        print(f"--- {name} ---")
+        benchmarks[name]()
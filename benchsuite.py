@@ -0,0 +1,273 @@
+from typing import Any, Callable, Iterator, Optional  # more typehints
+from time import perf_counter
+import argparse, json, os, platform, random, sys, tempfile
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # rendering goes into offscreen surfaces
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # the results can go to stdout
+import pygame
+import life
+import Conways_game_of_life as conways
+from engines import makeBoard, defaultEngine, np
+from sparse import SparseLife, IncrementalLife
+from patterns import readRLE, readPattern, writePattern, cellsFromRuns
+from timeline import Timeline, boardState, loadBoardState
+from stats import StatsCollector
+
+# reproducible benchmark suite: fixed seeded workloads through stepping, rendering and saving/loading
+#   python benchsuite.py run --out baseline.json              writes the results as json
+#   python benchsuite.py compare baseline.json                runs the suite again and flags regressions
+#   python benchsuite.py compare baseline.json --current new.json --threshold 0.1
+# every case is timed `repeat` times from a fresh state and the fastest run counts (the least noisy estimate)
+
+fieldSize: int = 256
+
+def soup(density: float) -> Callable[[], list[tuple[int, int]]]:
+    def cells() -> list[tuple[int, int]]:
+        rng = random.Random(int(density * 1000))
+        return [(x, y) for y in range(fieldSize) for x in range(fieldSize) if rng.random() < density]
+    return cells
+
+def pattern(rle: str) -> Callable[[], list[tuple[int, int]]]:  # a small pattern in the middle of the field
+    def cells() -> list[tuple[int, int]]:
+        return [(x + fieldSize // 2, y + fieldSize // 2) for x, y in cellsFromRuns(readRLE(rle.splitlines()))]
+    return cells
+
+workloads: dict[str, Callable[[], list[tuple[int, int]]]] = {
+    "soup10": soup(0.1),
+    "soup30": soup(0.3),
+    "soup50": soup(0.5),
+    "gosper": pattern("24bo$22bobo$12b2o6b2o12b2o$11bo3bo4b2o12b2o$2o8bo5bo3b2o$2o8bo3bob2o4bobo$10bo5bo7bo$11bo3bo$12b2o!"),
+    "rpentomino": pattern("b2o$2o$bo!"),
+    "acorn": pattern("bo$3bo$2o2b3o!"),
+    "empty": lambda: [],
+}
+
+# cases: name -> (setup, amount), setup returns the function that is timed, the result is seconds per `amount`
+Setup = Callable[[], Callable[[], None]]
+
+def lifeBoard(engine: str, cells: list[tuple[int, int]]):
+    board = makeBoard(engine, fieldSize)
+    for x, y in cells:
+        board.setCell(x, y, 1)
+    return board
+
+def stepLife(engine: str, cells: list[tuple[int, int]], gens: int) -> "Setup":  # life.py's advanceGeneration
+    def run() -> None:
+        for _ in range(gens):
+            life.advanceGeneration()
+    def setup() -> Callable[[], None]:
+        life.field = lifeBoard(engine, cells)
+        life.stepExponent = 0
+        life.timeline = None  # only the engine, the timeline and the statistics have their own cases
+        life.stats = None
+        return run
+    return setup
+
+def statsLife(engine: str, cells: list[tuple[int, int]], gens: int) -> "Setup":  # advanceGeneration with the statistics
+    def run() -> None:
+        for _ in range(gens):
+            life.advanceGeneration()
+    def setup() -> Callable[[], None]:
+        life.field = lifeBoard(engine, cells)
+        life.stepExponent = 0
+        life.timeline = None
+        life.stats = StatsCollector()
+        return run
+    return setup
+
+def stepConways(cells: list[tuple[int, int]], gens: int) -> "Setup":  # what advance_state of Conways_game_of_life.py runs
+    def setup() -> Callable[[], None]:
+        universe = IncrementalLife(cells)
+        def run() -> None:
+            for _ in range(gens):
+                universe.step()
+        return run
+    return setup
+
+def renderLife(cells: list[tuple[int, int]], screen: pygame.Surface) -> "Setup":
+    def setup() -> Callable[[], None]:
+        life.importDisplay()
+        life.screen = screen
+        life.field = lifeBoard(defaultEngine(), cells)
+        life.simulation = None
+        life.cellSize = 4
+        life.cameraPos = (-(fieldSize * 4 - screen.get_width()) / 2, -(fieldSize * 4 - screen.get_height()) / 2)
+        return life.drawField
+    return setup
+
+def uiLife(screen: pygame.Surface, frames: int) -> "Setup":  # displayUI, the steps change every frame
+    def run() -> None:
+        for _ in range(frames):
+            life.steps += 1
+            life.displayUI()
+    def setup() -> Callable[[], None]:
+        life.importDisplay()
+        life.screen = screen
+        life.field = lifeBoard(defaultEngine(), workloads["soup30"]())
+        life.simulation = None
+        life.stats = StatsCollector()
+        for _ in range(2):
+            life.stats.observe(life.field, life.steps)
+            life.field.step()
+        return run
+    return setup
+
+def renderConways(cells: list[tuple[int, int]], screen: pygame.Surface) -> "Setup":  # display_all_cells
+    def setup() -> Callable[[], None]:
+        conways.import_display()
+        conways.screen = screen
+        conways.cell_size = 4
+        conways.camera_pos = (-(fieldSize * 4 - screen.get_width()) // 2, -(fieldSize * 4 - screen.get_height()) // 2)
+        return lambda: conways.display_all_cells(cells)
+    return setup
+
+def saveLife(cells: list[tuple[int, int]], folder: str, load: bool) -> "Setup":  # configHandling
+    filename = os.path.join(folder, "life.sav")
+    def setup() -> Callable[[], None]:
+        life.field = lifeBoard(defaultEngine(), cells)
+        life.fieldSize = fieldSize
+        if load:
+            life.configHandling(filename, conf=life.currentConfig())
+            return lambda: life.configHandling(filename)
+        return lambda: life.configHandling(filename, conf=life.currentConfig())
+    return setup
+
+def saveConways(cells: list[tuple[int, int]], folder: str, load: bool) -> "Setup":  # save_cells_onto_file / load_cells
+    filename = os.path.join(folder, "saved_cells.rle")
+    def run() -> None:
+        if load:
+            universe = IncrementalLife()
+            for cell in cellsFromRuns(readPattern(filename)):
+                universe.add(cell)
+        else:
+            writePattern(filename, cells)
+    def setup() -> Callable[[], None]:
+        if load:
+            writePattern(filename, cells)
+        return run
+    return setup
+
+def recordTimeline(cells: list[tuple[int, int]], gens: int) -> "Setup":  # recording one entry per generation
+    def setup() -> Callable[[], None]:
+        board, timeline = lifeBoard(defaultEngine(), cells), Timeline()
+        states = []
+        for _ in range(gens):
+            board.step()
+            states.append(boardState(board))
+        def run() -> None:
+            for generation, state in enumerate(states):
+                timeline.record(state, generation)
+        return run
+    return setup
+
+def seekTimeline(cells: list[tuple[int, int]], gens: int, seeks: int) -> "Setup":  # seek latency: random entries, loaded into the board
+    def setup() -> Callable[[], None]:
+        board, timeline = lifeBoard(defaultEngine(), cells), Timeline()
+        for generation in range(gens):
+            timeline.record(boardState(board), generation)
+            board.step()
+        positions = random.Random(gens).choices(range(gens), k=seeks)
+        def run() -> None:
+            for position in positions:
+                loadBoardState(board, timeline.seek(position))
+        return run
+    return setup
+
+def cases(folder: str) -> Iterator[tuple[str, Setup, int]]:
+    screen = pygame.Surface((1600, 900))
+    engineNames = ["list", "incremental", "numpy", "tiled", "bits", "chunked", "hashlife"] if np is not None else ["list", "incremental", "hashlife"]
+    for workload, makeCells in workloads.items():
+        cells = makeCells()
+        for engine in engineNames:
+            gens = 2 if engine in ("list", "incremental") else 20
+            yield f"step/{workload}/{engine}", stepLife(engine, cells, gens), gens
+        yield f"step/{workload}/conways", stepConways(cells, 20), 20
+        for engine in ["incremental"] + (["numpy", "chunked"] if np is not None else []):
+            gens = 2 if engine == "incremental" else 20
+            yield f"stats/{workload}/{engine}", statsLife(engine, cells, gens), gens
+        if np is not None:
+            yield f"timeline/{workload}/record", recordTimeline(cells, 64), 64
+            yield f"timeline/{workload}/seek", seekTimeline(cells, 256, 20), 20
+            yield f"render/{workload}/life", renderLife(cells, screen), 1
+            yield f"render/{workload}/conways", renderConways(cells, screen), 1
+        yield f"save/{workload}/life", saveLife(cells, folder, False), 1
+        yield f"load/{workload}/life", saveLife(cells, folder, True), 1
+        yield f"save/{workload}/conways", saveConways(cells, folder, False), 1
+        yield f"load/{workload}/conways", saveConways(cells, folder, True), 1
+    yield "render/ui/life", uiLife(screen, 100), 100
+
+def runSuite(repeat: int = 5, only: Optional[str] = None) -> dict[str, Any]:
+    results: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as folder:
+        for name, setup, amount in cases(folder):
+            if only and only not in name:
+                continue
+            best = float("inf")
+            for _ in range(repeat):
+                run = setup()
+                start = perf_counter()
+                run()
+                best = min(best, perf_counter() - start)
+            results[name] = best / amount
+            print(f"{name:<32} {results[name] * 1000:>10.3f} ms", file=sys.stderr)
+    meta = {"python": platform.python_version(), "numpy": np.__version__ if np is not None else None, "pygame": pygame.version.ver,
+            "machine": platform.machine(), "system": platform.system(), "fieldSize": fieldSize, "repeat": repeat}
+    return {"meta": meta, "results": results}
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float, minimum: float) -> list[str]:  # returns the regressed cases
+    # a case regressed if it got slower by more than `threshold` (relative) and `minimum` seconds,
+    # so the timer noise of the sub millisecond cases doesnt count
+    regressions = []
+    print(f"{'case':<32} {'baseline ms':>12} {'current ms':>12} {'change':>8}")
+    for name in sorted(baseline["results"].keys() | current["results"].keys()):
+        old, new = baseline["results"].get(name), current["results"].get(name)
+        if old is None or new is None:
+            print(f"{name:<32} {'-' if old is None else f'{old * 1000:.3f}':>12} {'-' if new is None else f'{new * 1000:.3f}':>12} {'missing' if new is None else 'new':>8}")
+            continue
+        change = new / old - 1 if old else 0.0
+        flag = ""
+        if change > threshold and new - old > minimum:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<32} {old * 1000:>12.3f} {new * 1000:>12.3f} {change:>+8.0%}{flag}")
+    return regressions
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python benchsuite.py", description="reproducible benchmarks of the engines, renderers and save files")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="run the suite and write the results")
+    run.add_argument("--out", default=None, help="json file for the results (default: stdout)")
+    compareParser = commands.add_parser("compare", help="compare against a baseline, exits with 1 on regressions")
+    compareParser.add_argument("baseline", help="json file written by run")
+    compareParser.add_argument("--current", default=None, help="results to compare (default: run the suite now)")
+    compareParser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown (0.2: 20%%)")
+    compareParser.add_argument("--min-ms", type=float, default=0.1, help="slowdowns below this many ms are never regressions")
+    for command in (run, compareParser):
+        command.add_argument("--repeat", type=int, default=5, help="runs per case, the fastest counts")
+        command.add_argument("--only", default=None, help="only the cases whose name contains this")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    if args.command == "run":
+        results = runSuite(args.repeat, args.only)
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump(results, f, indent=2)
+        else:
+            print(json.dumps(results, indent=2))
+        return 0
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f)
+    if args.current:
+        with open(args.current, "r") as f:
+            current = json.load(f)
+    else:
+        current = runSuite(args.repeat, args.only)
+    if args.only:  # the skipped cases are not missing
+        baseline["results"] = {name: seconds for name, seconds in baseline["results"].items() if args.only in name}
+        current["results"] = {name: seconds for name, seconds in current["results"].items() if args.only in name}
+    regressions = compare(baseline, current, args.threshold, args.min_ms / 1000)
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+from typing import Iterator, Literal  # more typehints
+from engines import Board, Edge, np
+from rules import life
+
+# one bit per cell: every row of the field is stored as 64 bit words (bit i of word j is the cell x = 64 * j + i)
+# a generation adds up the 8 neighbour bitplanes with bit-sliced full adders, so one word op updates 64 cells
+
+class BitBoard(Board):
+    name = "bits"
+
+    def __init__(self, size: int, edge: Edge = "frozen") -> None:
+        if np is None:
+            raise ImportError("the bits engine requires numpy")
+        super().__init__(size, edge)
+        self.words = -(-size // 64)
+        self.rows = np.zeros((size, self.words), dtype="<u8")
+        # bits that belong to the field (the last word of a row can have unused bits)
+        cells = np.zeros((size, self.words * 64), dtype=np.uint8)
+        cells[:, :size] = 1
+        self.validMask = self.pack(cells)
+        cells[[0, -1], :] = 0
+        cells[:, [0, size - 1]] = 0
+        self.interiorMask = self.pack(cells)  # everything but the outer ring (for the frozen edge)
+
+    # conversion between one byte and one bit per cell
+    def pack(self, cells: "np.ndarray") -> "np.ndarray":
+        padded = np.zeros((cells.shape[0], self.words * 64), dtype=np.uint8)
+        padded[:, :cells.shape[1]] = cells
+        return np.packbits(padded, axis=1, bitorder="little").view("<u8")
+
+    def unpack(self) -> "np.ndarray":
+        return np.unpackbits(self.rows.view(np.uint8), axis=1, bitorder="little")[:, :self.size]
+
+    # accessor api
+    def getCell(self, x: int, y: int) -> int:
+        return int(self.rows[y, x >> 6] >> np.uint64(x & 63)) & 1
+
+    def setCell(self, x: int, y: int, state: Literal[1, 0]) -> None:
+        bit = np.uint64(1) << np.uint64(x & 63)
+        if state:
+            self.rows[y, x >> 6] |= bit
+        else:
+            self.rows[y, x >> 6] &= ~bit
+
+    def liveCells(self) -> Iterator[tuple[int, int]]:
+        ys, xs = np.nonzero(self.unpack())
+        return zip(xs.tolist(), ys.tolist())
+
+    def clear(self) -> None:
+        self.rows = np.zeros((self.size, self.words), dtype="<u8")
+
+    def toList(self) -> list[list[int]]:
+        return self.unpack().tolist()
+
+    def loadList(self, rows: list[list[int]]) -> None:
+        self.rows = self.pack(np.array(rows, dtype=np.uint8).reshape(self.size, self.size))
+
+    def toBits(self) -> bytes:
+        return np.packbits(self.unpack(), axis=None, bitorder="little").tobytes()
+
+    def loadBits(self, data: bytes) -> None:
+        cells = np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=self.size * self.size, bitorder="little")
+        self.rows = self.pack(cells.reshape(self.size, self.size))
+
+    def copy(self) -> "BitBoard":  # the masks never change, so they are shared
+        board = BitBoard.__new__(BitBoard)
+        board.__dict__.update(self.__dict__)
+        board.rows = self.rows.copy()
+        return board
+
+    def window(self, x0: int, y0: int, x1: int, y1: int) -> "np.ndarray":  # only the needed rows and words are unpacked
+        out = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        cx0, cy0, cx1, cy1 = max(x0, 0), max(y0, 0), min(x1, self.size), min(y1, self.size)
+        if cx0 < cx1 and cy0 < cy1:
+            word0, word1 = cx0 >> 6, ((cx1 - 1) >> 6) + 1
+            bits = np.unpackbits(np.ascontiguousarray(self.rows[cy0:cy1, word0:word1]).view(np.uint8), axis=1, bitorder="little")
+            out[cy0 - y0:cy1 - y0, cx0 - x0:cx1 - x0] = bits[:, cx0 - word0 * 64:cx1 - word0 * 64]
+        return out
+
+    @property
+    def population(self) -> int:
+        return int(np.unpackbits(self.rows.view(np.uint8)).sum(dtype=np.int64))
+
+    @property
+    def nbytes(self) -> int:
+        return self.rows.nbytes
+
+    # shifting whole bitplanes
+    def shiftWest(self, plane: "np.ndarray") -> "np.ndarray":  # every cell gets the value of its neighbour at x - 1
+        out = plane << np.uint64(1)
+        out[:, 1:] |= plane[:, :-1] >> np.uint64(63)
+        if self.edge == "wrap":
+            last = self.size - 1
+            out[:, 0] |= (plane[:, last >> 6] >> np.uint64(last & 63)) & np.uint64(1)
+        return out
+
+    def shiftEast(self, plane: "np.ndarray") -> "np.ndarray":  # every cell gets the value of its neighbour at x + 1
+        out = plane >> np.uint64(1)
+        out[:, :-1] |= plane[:, 1:] << np.uint64(63)
+        if self.edge == "wrap":
+            last = self.size - 1
+            out[:, last >> 6] |= (plane[:, 0] & np.uint64(1)) << np.uint64(last & 63)
+        return out
+
+    def shiftSouth(self, plane: "np.ndarray") -> "np.ndarray":  # every cell gets the value of its neighbour at y - 1
+        out = np.empty_like(plane)
+        out[1:] = plane[:-1]
+        out[0] = plane[-1] if self.edge == "wrap" else 0
+        return out
+
+    def shiftNorth(self, plane: "np.ndarray") -> "np.ndarray":  # every cell gets the value of its neighbour at y + 1
+        out = np.empty_like(plane)
+        out[:-1] = plane[1:]
+        out[-1] = plane[0] if self.edge == "wrap" else 0
+        return out
+
+    def neighborPlanes(self) -> tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray"]:  # the neighbour count as 4 bitplanes
+        rows = self.rows
+        west, east = self.shiftWest(rows), self.shiftEast(rows)
+        neighbours = (west, east)
+        for plane in (rows, west, east):
+            neighbours += (self.shiftSouth(plane), self.shiftNorth(plane))
+        bit0 = np.zeros_like(rows)
+        bit1 = np.zeros_like(rows)
+        bit2 = np.zeros_like(rows)
+        bit3 = np.zeros_like(rows)
+        for plane in neighbours:  # adding one bitplane at a time (ripple carry)
+            carry0 = bit0 & plane
+            bit0 ^= plane
+            carry1 = bit1 & carry0
+            bit1 ^= carry0
+            bit3 |= bit2 & carry1
+            bit2 ^= carry1
+        return bit0, bit1, bit2, bit3
+
+    def countEquals(self, planes: tuple["np.ndarray", ...], count: int) -> "np.ndarray":  # bits of the cells with exactly `count` neighbours
+        result = None
+        for bit, plane in enumerate(planes):
+            term = plane if count >> bit & 1 else ~plane
+            result = term if result is None else result & term
+        return result
+
+    def step(self) -> int:
+        old = self.rows
+        planes = self.neighborPlanes()
+        rule = self.rule
+        if rule is life:
+            bit0, bit1, bit2, bit3 = planes
+            new = ~bit3 & ~bit2 & bit1 & (bit0 | old)  # B3/S23: count == 3, or count == 2 and alive
+        else:  # any other rule: one equality term per count, born cells are dead and surviving cells alive before
+            new = np.zeros_like(old)
+            for count in rule.birth | rule.survive:
+                term = self.countEquals(planes, count)
+                if count not in rule.survive:
+                    term &= ~old
+                elif count not in rule.birth:
+                    term &= old
+                new |= term
+        if self.edge == "frozen":
+            new = (new & self.interiorMask) | (old & ~self.interiorMask)
+        self.rows = new & self.validMask
+        return 1
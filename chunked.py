@@ -0,0 +1,157 @@
+from typing import Iterator, Literal, Optional  # more typehints
+from engines import Board, Edge, changeCounts, np
+from rules import stepCells, aliveCells
+
+# the infinite plane in chunkSize x chunkSize chunks (uint8 arrays) that only exist where cells are alive:
+# a chunk is allocated as soon as an alive cell touches its border and freed as soon as it is empty,
+# so memory and the cost of a generation follow the populated area and not the size of the field.
+# Chunk (cx, cy) holds the cells x = cx * chunkSize ... and y = cy * chunkSize ... (negative positions included)
+
+class ChunkedBoard(Board):
+    name = "chunked"
+    bounded = False
+    ruleKinds = frozenset({"simple", "generations"})  # the halo of a chunk is one cell wide
+    chunkSize: int = 64
+    reportsFlips = True
+
+    def __init__(self, size: int, edge: Edge = "frozen") -> None:  # size is only the area the camera starts on, edge has no meaning here
+        if np is None:
+            raise ImportError("the chunked engine requires numpy")
+        super().__init__(size, edge)
+        self.chunks: dict[tuple[int, int], "np.ndarray"] = {}
+        self.lastActiveChunks = 0  # amount of chunks the last step computed
+
+    def getCell(self, x: int, y: int) -> int:
+        n = self.chunkSize
+        chunk = self.chunks.get((x // n, y // n))
+        return int(chunk[y % n, x % n]) if chunk is not None else 0
+
+    def setCell(self, x: int, y: int, state: Literal[1, 0]) -> None:
+        n = self.chunkSize
+        key = (x // n, y // n)
+        chunk = self.chunks.get(key)
+        self.flips = None
+        if chunk is None:
+            if not state:
+                return
+            chunk = self.chunks[key] = np.zeros((n, n), dtype=np.uint8)
+        chunk[y % n, x % n] = state
+        if not state and not chunk.any():
+            del self.chunks[key]
+
+    # stepping
+    def candidates(self) -> set[tuple[int, int]]:  # the chunks that can have alive cells next generation
+        keys = set(self.chunks)
+        for (cx, cy), chunk in self.chunks.items():  # new chunks next to alive cells on a border
+            top, bottom, left, right = chunk[0].any(), chunk[-1].any(), chunk[:, 0].any(), chunk[:, -1].any()
+            if top: keys.add((cx, cy - 1))
+            if bottom: keys.add((cx, cy + 1))
+            if left: keys.add((cx - 1, cy))
+            if right: keys.add((cx + 1, cy))
+            if chunk[0, 0]: keys.add((cx - 1, cy - 1))
+            if chunk[0, -1]: keys.add((cx + 1, cy - 1))
+            if chunk[-1, 0]: keys.add((cx - 1, cy + 1))
+            if chunk[-1, -1]: keys.add((cx + 1, cy + 1))
+        return keys
+
+    def haloRegion(self, cx: int, cy: int) -> "np.ndarray":  # the chunk plus a one cell border from its 8 neighbours
+        n = self.chunkSize
+        region = np.zeros((n + 2, n + 2), dtype=np.uint8)
+        get = self.chunks.get
+        for offsetY, rows, source in ((-1, slice(0, 1), slice(n - 1, n)), (0, slice(1, n + 1), slice(0, n)), (1, slice(n + 1, n + 2), slice(0, 1))):
+            for offsetX, cols, sourceCols in ((-1, slice(0, 1), slice(n - 1, n)), (0, slice(1, n + 1), slice(0, n)), (1, slice(n + 1, n + 2), slice(0, 1))):
+                chunk = get((cx + offsetX, cy + offsetY))
+                if chunk is not None:
+                    region[rows, cols] = chunk[source, sourceCols]
+        return region
+
+    def step(self) -> int:
+        rule = self.rule
+        newChunks: dict[tuple[int, int], "np.ndarray"] = {}
+        candidates = self.candidates()
+        births = deaths = 0
+        for cx, cy in candidates:
+            region = self.haloRegion(cx, cy)
+            new = stepCells(aliveCells(region, rule), region[1:-1, 1:-1], rule)
+            if self.trackStats:
+                born, died = changeCounts(region[1:-1, 1:-1], new)
+                births, deaths = births + born, deaths + died
+            if self.flips is not None:
+                ys, xs = np.nonzero(region[1:-1, 1:-1] != new)
+                if len(xs):
+                    self.recordFlips(xs + cx * self.chunkSize, ys + cy * self.chunkSize, region[1:-1, 1:-1][ys, xs], new[ys, xs])
+            if new.any():  # empty chunks are freed
+                newChunks[(cx, cy)] = new
+        self.chunks = newChunks
+        self.lastActiveChunks = len(candidates)
+        if self.trackStats:
+            self.lastStats = (births, deaths, self.boundingBox())
+        return 1
+
+    # accessor api
+    def liveCells(self) -> Iterator[tuple[int, int]]:
+        n = self.chunkSize
+        for (cx, cy), chunk in self.chunks.items():
+            ys, xs = np.nonzero(chunk)
+            yield from zip((xs + cx * n).tolist(), (ys + cy * n).tolist())
+
+    def clear(self) -> None:
+        self.chunks = {}
+        self.flips = None
+
+    def copy(self) -> "ChunkedBoard":
+        board = ChunkedBoard(self.size, self.edge)
+        board.rule = self.rule
+        board.chunks = {key: chunk.copy() for key, chunk in self.chunks.items()}
+        return board
+
+    def window(self, x0: int, y0: int, x1: int, y1: int) -> "np.ndarray":
+        n = self.chunkSize
+        out = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        for (cx, cy), chunk in self.chunks.items():
+            left, top = cx * n, cy * n
+            ax0, ay0, ax1, ay1 = max(x0, left), max(y0, top), min(x1, left + n), min(y1, top + n)
+            if ax0 < ax1 and ay0 < ay1:
+                out[ay0 - y0:ay1 - y0, ax0 - x0:ax1 - x0] = chunk[ay0 - top:ay1 - top, ax0 - left:ax1 - left]
+        return out
+
+    def loadWindow(self, x0: int, y0: int, window: "np.ndarray") -> None:
+        n = self.chunkSize
+        self.flips = None
+        h, w = window.shape
+        for cy in range(y0 // n, (y0 + h - 1) // n + 1):
+            for cx in range(x0 // n, (x0 + w - 1) // n + 1):
+                left, top = cx * n, cy * n
+                ax0, ay0, ax1, ay1 = max(x0, left), max(y0, top), min(x0 + w, left + n), min(y0 + h, top + n)
+                part = window[ay0 - y0:ay1 - y0, ax0 - x0:ax1 - x0]
+                if not part.any():
+                    continue
+                chunk = self.chunks.setdefault((cx, cy), np.zeros((n, n), dtype=np.uint8))
+                np.copyto(chunk[ay0 - top:ay1 - top, ax0 - left:ax1 - left], part, where=part != 0)
+
+    def boundingBox(self) -> Optional[tuple[int, int, int, int]]:  # only the outermost chunks are looked at
+        if not self.chunks:
+            return None
+        n = self.chunkSize
+        minX, minY = min(cx for cx, _ in self.chunks), min(cy for _, cy in self.chunks)
+        maxX, maxY = max(cx for cx, _ in self.chunks), max(cy for _, cy in self.chunks)
+        box = None
+        for (cx, cy), chunk in self.chunks.items():
+            if cx not in (minX, maxX) and cy not in (minY, maxY):
+                continue
+            ys, xs = np.nonzero(chunk)
+            x0, y0, x1, y1 = cx * n + int(xs.min()), cy * n + int(ys.min()), cx * n + int(xs.max()) + 1, cy * n + int(ys.max()) + 1
+            box = (x0, y0, x1, y1) if box is None else (min(box[0], x0), min(box[1], y0), max(box[2], x1), max(box[3], y1))
+        return box
+
+    @property
+    def population(self) -> int:
+        return sum(int(np.count_nonzero(chunk)) for chunk in self.chunks.values())
+
+    @property
+    def activeCells(self) -> int:
+        return self.lastActiveChunks * self.chunkSize * self.chunkSize
+
+    @property
+    def nbytes(self) -> int:
+        return sum(chunk.nbytes for chunk in self.chunks.values())
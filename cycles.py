@@ -0,0 +1,154 @@
+from typing import Any, Optional  # more typehints
+from collections import deque
+from engines import Board, np
+
+# cycle detection: every generation the board gets a zobrist style hash, the xor of one random 64 bit key per
+# (position, state) of every non empty cell. Engines that report the cells their steps changed (Board.reportsFlips:
+# incremental, chunked) only xor those out and back in, so a generation costs O(changes) and a settled board nothing.
+# The whole board is only hashed again after edits (they make the flips unknown) or a reset.
+# The other engines are compared with the last generation instead: bounded boards as 64 cell words of the packed field
+# (one key per (position, content) of a word, only the changed words are xored), rules with dying states (Generations)
+# as the bytes of the field, so the states count too.
+# The last `window` hashes are kept with their generation. When a hash comes back the board repeats itself:
+# period 1 means it stabilized, anything else is an oscillator (blinkers, pulsars, ...).
+
+mask64: int = (1 << 64) - 1
+
+def cellKey(x: int, y: int) -> int:  # key of a cell on the unbounded plane (splitmix64 of the position)
+    z = (((x & 0xFFFFFFFF) << 32) | (y & 0xFFFFFFFF)) + 0x9E3779B97F4A7C15 & mask64
+    z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9 & mask64
+    z = (z ^ (z >> 27)) * 0x94D049BB133111EB & mask64
+    return z ^ (z >> 31)
+
+def mixWords(z: "np.ndarray") -> "np.ndarray":  # splitmix64 finalizer on a uint64 array (wraps around like the scalar version)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+def cellKeys(xs: "np.ndarray", ys: "np.ndarray", states: "np.ndarray") -> "np.ndarray":  # cellKey (and state) of every cell, 0 for empty ones
+    positions = ((xs.astype(np.uint64) & np.uint64(0xFFFFFFFF)) << np.uint64(32)) | (ys.astype(np.uint64) & np.uint64(0xFFFFFFFF))
+    keys = mixWords(positions + np.uint64(0x9E3779B97F4A7C15)) ^ ((states.astype(np.uint64) - np.uint64(1)) * np.uint64(0x9E3779B97F4A7C15))
+    return np.where(states != 0, keys, np.uint64(0))
+
+def boardKey(board: Board) -> int:  # xor of the cellKeys of the whole board
+    if board.bounded:
+        cells = board.window(0, 0, board.size, board.size)
+        ys, xs = np.nonzero(cells)
+        states = cells[ys, xs]
+    else:
+        positions = np.fromiter((c for cell in board.liveCells() for c in cell), dtype=np.int64).reshape(-1, 2)
+        xs, ys = positions[:, 0], positions[:, 1]
+        if board.rule.states == 2:
+            states = np.ones(len(xs), dtype=np.uint8)
+        else:
+            states = np.array([board.getCell(x, y) for x, y in positions.tolist()], dtype=np.uint8)
+    return int(np.bitwise_xor.reduce(cellKeys(xs, ys, states))) if len(xs) else 0
+
+def wordKeys(positions: "np.ndarray", words: "np.ndarray") -> "np.ndarray":  # key of every (position, word), 0 for empty words
+    keys = mixWords(words ^ mixWords(positions.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)))
+    return np.where(words != 0, keys, np.uint64(0))
+
+
+class BoardHasher:  # incremental hash of a board
+    def __init__(self) -> None:
+        self.hash = 0
+        self.previous: Any = None  # the cells of the last update (packed uint64 words or set of positions)
+        self.board: Optional[Board] = None  # the board whose flips are collected
+
+    def update(self, board: Board) -> int:
+        if board.reportsFlips and np is not None:
+            flips = board.takeFlips()
+            if board is not self.board or flips is None:  # a new board, an edit or a reset
+                self.hash = boardKey(board)
+            elif flips:
+                xs, ys, old, new = (np.concatenate(parts) for parts in zip(*flips))
+                self.hash ^= int(np.bitwise_xor.reduce(cellKeys(xs, ys, old) ^ cellKeys(xs, ys, new)))
+            self.board = board
+        elif board.bounded and np is not None:
+            data = board.toBits() if board.rule.states == 2 else board.window(0, 0, board.size, board.size).tobytes()
+            words = np.frombuffer(data + bytes(-len(data) % 8), dtype="<u8")
+            if not isinstance(self.previous, np.ndarray) or self.previous.shape != words.shape:
+                self.previous, self.hash = np.zeros_like(words), 0
+            changed = np.flatnonzero(words != self.previous)
+            if len(changed):
+                keys = wordKeys(changed, self.previous[changed]) ^ wordKeys(changed, words[changed])
+                self.hash ^= int(np.bitwise_xor.reduce(keys))
+            self.previous = words
+        else:  # unbounded boards (and no numpy): the alive cells as a set, one key per cell (and state)
+            if board.rule.states == 2:
+                cells = {(x, y, 1) for x, y in board.liveCells()}
+            else:
+                cells = {(x, y, board.getCell(x, y)) for x, y in board.liveCells()}
+            if not isinstance(self.previous, set):
+                self.previous, self.hash = set(), 0
+            for x, y, state in cells ^ self.previous:
+                self.hash ^= cellKey(x, y) ^ (state - 1) * 0x9E3779B97F4A7C15 & mask64
+            self.previous = cells
+        return self.hash
+
+    def reset(self) -> None:
+        self.hash = 0
+        self.previous = None
+        if self.board is not None:  # nothing collects the flips until the next update
+            self.board.flips = None
+            self.board = None
+
+
+class Cycle:  # a detected cycle: the board at generation `start + n * period + i` is always the same
+    def __init__(self, start: int, period: int, detectedAt: int, states: list[Any]) -> None:
+        self.start = start  # first generation of the cycle that was seen
+        self.period = period  # in generations (a multiple of the real period if the board was advanced in jumps)
+        self.detectedAt = detectedAt
+        self.states = states  # snapshots of the generations detectedAt ... detectedAt + period - 1 (empty if not recorded)
+
+    def index(self, generation: int) -> int:  # which of the states the board is in at `generation`
+        return (generation - self.detectedAt) % self.period
+
+    def __repr__(self) -> str:
+        return f"Cycle(start={self.start}, period={self.period})"
+
+
+class CycleDetector:
+    def __init__(self, window: int = 1024) -> None:
+        self.window = window  # amount of generations that are remembered, longer periods are not found
+        self.hasher = BoardHasher()
+        self.seen: dict[int, int] = {}  # hash -> last generation with that hash
+        self.order: deque[tuple[int, int]] = deque()  # (generation, hash) oldest first, for evicting
+
+    def observe(self, board: Board, generation: int) -> Optional[Cycle]:  # call after every advance, returns the cycle once found
+        h = self.hasher.update(board)
+        previous = self.seen.get(h)
+        self.seen[h] = generation
+        self.order.append((generation, h))
+        while len(self.order) > self.window:
+            oldGeneration, oldHash = self.order.popleft()
+            if self.seen.get(oldHash) == oldGeneration:
+                del self.seen[oldHash]
+        if previous is not None and previous != generation:
+            return Cycle(previous, generation - previous, generation, [])
+        return None
+
+    def reset(self) -> None:  # after edits the history doesnt say anything about the new board anymore
+        self.hasher.reset()
+        self.seen.clear()
+        self.order.clear()
+
+
+def recordStates(board: Board, cycle: Cycle, maxPeriod: int = 64) -> bool:
+    # steps a copy of the board through one period and keeps the snapshots, so the cycle can be replayed without simulating
+    # (toBits for bounded boards, the field as array for bounded boards with dying states, copies for unbounded ones).
+    # False if the period is too long to keep in memory
+    if cycle.period > maxPeriod:
+        return False
+    state = board.copy()
+    states = []
+    for _ in range(cycle.period):
+        if not board.bounded:
+            states.append(state.copy())
+        elif board.rule.states == 2:
+            states.append(state.toBits())
+        else:
+            states.append(state.window(0, 0, board.size, board.size))
+        state.step()
+    cycle.states = states
+    return True
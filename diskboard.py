@@ -0,0 +1,410 @@
+from typing import Iterator, Literal, Optional, Union  # more typehints
+from collections import OrderedDict
+import mmap, os, struct, tempfile
+from engines import Board, Edge, cellBox, changeCounts, np
+from rules import Rule, parseRule, stepCells
+
+# bounded field that lives in a memory mapped file instead of RAM (100k x 100k cells and beyond):
+# the field is split into tileSize x tileSize tiles, stored bit packed at a fixed place of the file. Empty tiles are
+# never written, so the file stays sparse on disk. Only the tiles that are stepped or looked at are paged in
+# (unpacked into uint8 arrays) and they stay resident up to `budget` bytes. Past that the least recently used tiles
+# are evicted: written back if they changed (dirty), then their pages are dropped from the mapping, so the
+# resident memory is bounded by the budget and not by the size of the field.
+# A generation only steps the active tiles (changed or next to a change, like the tiled engine), row by row:
+# the new tiles of a row are written once the rows below are computed too, so only ~3 rows of them are held at once.
+# Saving (flush) only writes the dirty tiles and the index back, the file is consistent after every flush.
+# file layout:
+#   header: magic, version, size, tileSize
+#   index:  the amount of alive cells of every tile (uint32, row by row), empty tiles are never read
+#   tiles:  tilesPerSide^2 tiles of tileSize^2 / 8 bytes (row by row, lowest bit first), starting at a page boundary
+
+magic: bytes = b"GOLTILES"
+version: int = 1
+headerFormat: str = "<8sHQI"  # little endian, no padding
+
+def wrapRuns(start: int, stop: int, size: int) -> Iterator[tuple[int, int, int]]:  # (from, to, offset) of start...stop on a torus
+    position = start
+    while position < stop:
+        source = position % size
+        length = min(stop - position, size - source)
+        yield source, source + length, position - start
+        position += length
+
+
+class WindowCopy(Board):  # what the renderer gets instead of a copy of a field that doesnt fit into memory
+    name = "window"
+
+    def __init__(self, board: Board, x0: int, y0: int, x1: int, y1: int) -> None:
+        super().__init__(board.size, board.edge)
+        self.rule = board.rule
+        self.x0, self.y0 = x0, y0
+        self.cells = board.window(x0, y0, x1, y1)
+        self.fieldPopulation = board.population
+
+    def getCell(self, x: int, y: int) -> int:
+        h, w = self.cells.shape
+        return int(self.cells[y - self.y0, x - self.x0]) if 0 <= x - self.x0 < w and 0 <= y - self.y0 < h else 0
+
+    def liveCells(self) -> Iterator[tuple[int, int]]:  # only the cells of the window
+        ys, xs = np.nonzero(self.cells)
+        return zip((xs + self.x0).tolist(), (ys + self.y0).tolist())
+
+    def window(self, x0: int, y0: int, x1: int, y1: int) -> "np.ndarray":
+        out = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        h, w = self.cells.shape
+        cx0, cy0, cx1, cy1 = max(x0, self.x0), max(y0, self.y0), min(x1, self.x0 + w), min(y1, self.y0 + h)
+        if cx0 < cx1 and cy0 < cy1:
+            out[cy0 - y0:cy1 - y0, cx0 - x0:cx1 - x0] = self.cells[cy0 - self.y0:cy1 - self.y0, cx0 - self.x0:cx1 - self.x0]
+        return out
+
+    @property
+    def population(self) -> int:  # of the whole field
+        return self.fieldPopulation
+
+
+class DiskBoard(Board):
+    name = "disk"
+    inMemory = False
+    ruleKinds = frozenset({"simple"})  # one bit per cell in the file
+    tileSize: int = 256  # multiple of 8 (a packed row is whole bytes), 256 makes a packed tile two 4 KiB pages
+    budget: int = 256 * 1024 * 1024  # bytes of resident (unpacked) tiles
+    folder: Optional[str] = None  # where the file of a board without a path goes (None: the default temp folder)
+
+    def __init__(self, size: int, edge: Edge = "frozen", path: Optional[str] = None) -> None:
+        # path: the tile file, opened if it exists (and has the same size), created otherwise.
+        # Without a path the board is in a temporary file that is deleted once it's closed
+        if np is None:
+            raise ImportError("the disk engine requires numpy")
+        super().__init__(size, edge)
+        self.path = path
+        self.file, self.map = self.openFile(path)
+        self.resident: OrderedDict[tuple[int, int], "np.ndarray"] = OrderedDict()  # paged in tiles, least recently used first
+        self.dirty: set[tuple[int, int]] = set()  # resident tiles that differ from the file
+        self.active: set[tuple[int, int]] = {(int(tx), int(ty)) for ty, tx in zip(*np.nonzero(self.counts))}  # tiles to compute next generation
+        self.markAll()
+        self.pagedIn = self.writtenBack = 0  # amount of tiles read from and written to the file
+        self.lastActiveTiles = 0
+        self.box: Optional[tuple[int, int, int, int]] = None  # bounding box kept along for lastStats (None: empty)
+        self.boxStale = True  # the box has to be searched again (after edits and loads)
+
+    # the file
+    def openFile(self, path: Optional[str]):
+        t = self.tileSize
+        headerSize = struct.calcsize(headerFormat)
+        if path is not None and os.path.exists(path):
+            f = open(path, "r+b")
+            fileMagic, fileVersion, fileSize, tileSize = struct.unpack(headerFormat, f.read(headerSize))
+            if fileMagic != magic or fileVersion > version:
+                f.close()
+                raise ValueError(f"{path} is not a tile file (or a newer version)")
+            if fileSize != self.size:
+                f.close()
+                raise ValueError(f"{path} holds a {fileSize}x{fileSize} field, not {self.size}x{self.size}")
+            self.tileSize = t = tileSize
+        else:
+            f = open(path, "w+b") if path is not None else tempfile.TemporaryFile(prefix="tiles-", dir=self.folder)
+            f.write(struct.pack(headerFormat, magic, version, self.size, t))
+        n = self.tilesPerSide = -(-self.size // t)
+        self.tileBytes = t * t // 8
+        self.indexOffset = headerSize
+        granularity = mmap.ALLOCATIONGRANULARITY
+        self.dataOffset = -(-(headerSize + 4 * n * n) // granularity) * granularity
+        length = self.dataOffset + n * n * self.tileBytes
+        if os.fstat(f.fileno()).st_size < length:
+            f.truncate(length)  # sparse: the empty tiles take no space on disk
+        data = mmap.mmap(f.fileno(), length)
+        self.counts = np.frombuffer(data, dtype="<u4", count=n * n, offset=self.indexOffset).reshape(n, n).astype(np.int64)  # alive cells per tile
+        return f, data
+
+    def tileOffset(self, key: tuple[int, int]) -> int:
+        return self.dataOffset + (key[1] * self.tilesPerSide + key[0]) * self.tileBytes
+
+    def dropPages(self, offset: int) -> None:  # the pages of a tile leave the resident memory (the file keeps them)
+        if hasattr(self.map, "madvise") and hasattr(mmap, "MADV_DONTNEED") and offset % mmap.PAGESIZE == 0 and self.tileBytes % mmap.PAGESIZE == 0:
+            self.map.madvise(mmap.MADV_DONTNEED, offset, self.tileBytes)
+
+    def writeBack(self, key: tuple[int, int]) -> None:
+        if self.counts[key[1], key[0]]:  # empty tiles are never read again, their old bits can stay
+            offset = self.tileOffset(key)
+            self.map[offset:offset + self.tileBytes] = np.packbits(self.resident[key], axis=None, bitorder="little").tobytes()
+            self.dropPages(offset)
+            self.writtenBack += 1
+        self.dirty.discard(key)
+
+    def flush(self) -> None:  # writes back the dirty tiles and the index
+        for key in list(self.dirty):
+            self.writeBack(key)
+        self.map[self.indexOffset:self.indexOffset + 4 * self.counts.size] = self.counts.astype("<u4").tobytes()
+        self.map.flush()
+
+    def saveAs(self, path: str) -> None:  # from now on the board lives in `path` (only the dirty tiles are written if it already does)
+        if self.path is not None and os.path.abspath(path) == os.path.abspath(self.path):
+            self.flush()
+            return
+        board = DiskBoard.__new__(DiskBoard)
+        Board.__init__(board, self.size, self.edge)
+        board.tileSize = self.tileSize
+        if os.path.exists(path):
+            os.unlink(path)
+        f, data = board.openFile(path)
+        for ty, tx in zip(*np.nonzero(self.counts)):  # only the non empty tiles are copied
+            key = (int(tx), int(ty))
+            offset = self.tileOffset(key)
+            if key in self.resident:
+                data[offset:offset + self.tileBytes] = np.packbits(self.resident[key], axis=None, bitorder="little").tobytes()
+            else:
+                data[offset:offset + self.tileBytes] = self.map[offset:offset + self.tileBytes]
+                self.dropPages(offset)
+        self.closeFile()
+        self.file, self.map, self.path = f, data, path
+        self.dirty.clear()  # the new file has the resident tiles already
+        self.flush()
+
+    def closeFile(self) -> None:
+        self.map.close()
+        self.file.close()
+
+    def close(self) -> None:  # saves the board if it has a path (a temporary one is deleted)
+        if self.map.closed:
+            return
+        if self.path is not None:
+            self.flush()
+        self.closeFile()
+
+    # tiles
+    def tile(self, key: tuple[int, int]) -> "np.ndarray":  # the cells of a tile, paged in if needed (most recently used from now on)
+        cells = self.resident.get(key)
+        if cells is not None:
+            self.resident.move_to_end(key)
+            return cells
+        t = self.tileSize
+        if self.counts[key[1], key[0]]:
+            offset = self.tileOffset(key)
+            packed = np.frombuffer(self.map[offset:offset + self.tileBytes], dtype=np.uint8)
+            cells = np.unpackbits(packed, bitorder="little").reshape(t, t)
+            self.dropPages(offset)
+            self.pagedIn += 1
+        else:
+            cells = np.zeros((t, t), dtype=np.uint8)
+        self.resident[key] = cells
+        self.evict()
+        return cells
+
+    def evict(self) -> None:  # the least recently used tiles go back into the file until the budget fits
+        limit = max(9, self.budget // (self.tileSize * self.tileSize))  # a tile and its neighbours always fit
+        while len(self.resident) > limit:
+            key = next(iter(self.resident))
+            if key in self.dirty:
+                self.writeBack(key)
+            del self.resident[key]
+
+    @property
+    def residentBytes(self) -> int:
+        return len(self.resident) * self.tileSize * self.tileSize
+
+    def tileBounds(self, key: tuple[int, int]) -> tuple[int, int, int, int]:  # (x0, y0, x1, y1) of the cells of a tile inside the field
+        t = self.tileSize
+        return (key[0] * t, key[1] * t, min((key[0] + 1) * t, self.size), min((key[1] + 1) * t, self.size))
+
+    def markChanged(self, key: tuple[int, int]) -> None:  # the tile and its neighbours have to be computed next generation
+        n = self.tilesPerSide
+        for offsetY in (-1, 0, 1):
+            for offsetX in (-1, 0, 1):
+                nx, ny = key[0] + offsetX, key[1] + offsetY
+                if self.edge == "wrap":
+                    nx, ny = nx % n, ny % n
+                elif not (0 <= nx < n and 0 <= ny < n):
+                    continue
+                self.active.add((nx, ny))
+
+    def markAll(self) -> None:  # every non empty tile (and its neighbours)
+        for key in list(self.active):
+            self.markChanged(key)
+
+    def setRule(self, rule: Union[Rule, str]) -> None:
+        rule = parseRule(rule) if isinstance(rule, str) else rule
+        if 0 in rule.birth:  # B0 changes tiles that are never looked at
+            raise ValueError(f"the {self.name} engine cant run B0 rules ({rule.string})")
+        super().setRule(rule)
+        self.active |= {(int(tx), int(ty)) for ty, tx in zip(*np.nonzero(self.counts))}
+        self.markAll()
+
+    # accessor api
+    def getCell(self, x: int, y: int) -> int:
+        t = self.tileSize
+        if not self.counts[y // t, x // t]:
+            return 0
+        return int(self.tile((x // t, y // t))[y % t, x % t])
+
+    def setCell(self, x: int, y: int, state: Literal[1, 0]) -> None:
+        t = self.tileSize
+        key = (x // t, y // t)
+        cells = self.tile(key)
+        old = cells[y % t, x % t]
+        if old != state:
+            cells[y % t, x % t] = state
+            self.counts[key[1], key[0]] += int(state != 0) - int(old != 0)
+            self.dirty.add(key)
+            self.markChanged(key)
+            self.boxStale = True
+
+    def store(self, key: tuple[int, int], cells: "np.ndarray") -> None:  # replaces the cells of a tile
+        self.resident[key] = cells
+        self.resident.move_to_end(key)
+        self.counts[key[1], key[0]] = np.count_nonzero(cells)
+        self.dirty.add(key)
+        self.markChanged(key)
+        self.evict()
+
+    def region(self, x0: int, y0: int, x1: int, y1: int) -> "np.ndarray":  # the cells plus a one cell border (edge mode included)
+        if self.edge != "wrap" or (x0 > 0 and y0 > 0 and x1 < self.size and y1 < self.size):
+            return self.window(x0 - 1, y0 - 1, x1 + 1, y1 + 1)  # outside of the field is dead
+        out = np.zeros((y1 - y0 + 2, x1 - x0 + 2), dtype=np.uint8)
+        for fromY, toY, offsetY in wrapRuns(y0 - 1, y1 + 1, self.size):
+            for fromX, toX, offsetX in wrapRuns(x0 - 1, x1 + 1, self.size):
+                out[offsetY:offsetY + toY - fromY, offsetX:offsetX + toX - fromX] = self.window(fromX, fromY, toX, toY)
+        return out
+
+    def stepTile(self, key: tuple[int, int]) -> Optional["np.ndarray"]:  # the next cells of a tile, None if they dont change
+        x0, y0, x1, y1 = self.tileBounds(key)
+        region = self.region(x0, y0, x1, y1)
+        old = region[1:-1, 1:-1]
+        new = stepCells(region, old, self.rule)
+        if self.edge == "frozen":  # the outer ring of the field keeps its state
+            last = self.size - 1
+            if y0 == 0: new[0, :] = old[0, :]
+            if y1 - 1 == last: new[-1, :] = old[-1, :]
+            if x0 == 0: new[:, 0] = old[:, 0]
+            if x1 - 1 == last: new[:, -1] = old[:, -1]
+        if np.array_equal(new, old):
+            return None
+        if self.trackStats:
+            born, died = changeCounts(old, new)
+            self.births, self.deaths = self.births + born, self.deaths + died
+            self.trackBox(x0, y0, x1, y1, new, born, died)
+        t = self.tileSize
+        if new.shape != (t, t):  # the last row/column of tiles reaches over the field
+            new = np.pad(new, ((0, t - new.shape[0]), (0, t - new.shape[1])))
+        return new
+
+    def step(self) -> int:
+        candidates, self.active = self.active, set()
+        self.births = self.deaths = 0  # of this step (counted by stepTile if trackStats)
+        rows: dict[int, list[int]] = {}
+        for tx, ty in candidates:
+            rows.setdefault(ty, []).append(tx)
+        # the new tiles of a row are stored once the rows around it are computed (they need its old cells),
+        # with a wrapping edge the first row also waits for the last one
+        keepFirst = self.edge == "wrap" and 0 in rows and self.tilesPerSide - 1 in rows
+        pending: dict[int, list[tuple[tuple[int, int], "np.ndarray"]]] = {}
+        for ty in sorted(rows):
+            pending[ty] = [(key, new) for key in ((tx, ty) for tx in sorted(rows[ty])) if (new := self.stepTile(key)) is not None]
+            for done in [row for row in pending if row < ty - 1 and not (keepFirst and row == 0)]:
+                for key, new in pending.pop(done):
+                    self.store(key, new)
+        for updates in pending.values():
+            for key, new in updates:
+                self.store(key, new)
+        self.lastActiveTiles = len(candidates)
+        if self.trackStats:
+            if self.boxStale:
+                self.box = self.boundingBox()
+            self.boxStale = False
+            self.lastStats = (self.births, self.deaths, self.box)
+        else:
+            self.boxStale = True
+        return 1
+
+    def trackBox(self, x0: int, y0: int, x1: int, y1: int, new: "np.ndarray", born: int, died: int) -> None:
+        # the box grows by the changed tiles, the tiles are only searched again if cells died in a tile on its border
+        box = self.box
+        if self.boxStale:
+            return
+        if died and box is not None and (x0 <= box[0] < x1 or x0 < box[2] <= x1 or y0 <= box[1] < y1 or y0 < box[3] <= y1):
+            self.boxStale = True
+        elif born:
+            tileBox = cellBox(new, x0, y0)
+            self.box = tileBox if box is None else (min(box[0], tileBox[0]), min(box[1], tileBox[1]), max(box[2], tileBox[2]), max(box[3], tileBox[3]))
+
+    def liveCells(self) -> Iterator[tuple[int, int]]:
+        for ty, tx in zip(*np.nonzero(self.counts)):
+            x0, y0, _, _ = self.tileBounds((int(tx), int(ty)))
+            ys, xs = np.nonzero(self.tile((int(tx), int(ty))))
+            yield from zip((xs + x0).tolist(), (ys + y0).tolist())
+
+    def clear(self) -> None:  # the file keeps the old bits, but the index says every tile is empty
+        self.resident.clear()
+        self.dirty.clear()
+        self.active.clear()
+        self.counts[:] = 0
+        self.box, self.boxStale = None, False
+
+    def copy(self) -> "DiskBoard":  # a board in a new temporary file
+        board = DiskBoard(self.size, self.edge)
+        board.rule = self.rule
+        for ty, tx in zip(*np.nonzero(self.counts)):
+            board.store((int(tx), int(ty)), self.tile((int(tx), int(ty))).copy())
+        return board
+
+    def copyWindow(self, x0: int, y0: int, x1: int, y1: int) -> WindowCopy:  # the snapshot for the renderer: only the visible cells
+        return WindowCopy(self, x0, y0, x1, y1)
+
+    def window(self, x0: int, y0: int, x1: int, y1: int) -> "np.ndarray":
+        t = self.tileSize
+        out = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        cx0, cy0, cx1, cy1 = max(x0, 0), max(y0, 0), min(x1, self.size), min(y1, self.size)
+        for ty in range(cy0 // t, (cy1 - 1) // t + 1 if cy0 < cy1 else 0):
+            for tx in range(cx0 // t, (cx1 - 1) // t + 1 if cx0 < cx1 else 0):
+                if not self.counts[ty, tx]:
+                    continue
+                left, top = tx * t, ty * t
+                ax0, ay0, ax1, ay1 = max(cx0, left), max(cy0, top), min(cx1, left + t), min(cy1, top + t)
+                out[ay0 - y0:ay1 - y0, ax0 - x0:ax1 - x0] = self.tile((tx, ty))[ay0 - top:ay1 - top, ax0 - left:ax1 - left]
+        return out
+
+    def loadWindow(self, x0: int, y0: int, window: "np.ndarray") -> None:  # tile by tile instead of cell by cell
+        t = self.tileSize
+        h, w = window.shape
+        cx0, cy0, cx1, cy1 = max(x0, 0), max(y0, 0), min(x0 + w, self.size), min(y0 + h, self.size)
+        for ty in range(cy0 // t, (cy1 - 1) // t + 1 if cy0 < cy1 else 0):
+            for tx in range(cx0 // t, (cx1 - 1) // t + 1 if cx0 < cx1 else 0):
+                left, top = tx * t, ty * t
+                ax0, ay0, ax1, ay1 = max(cx0, left), max(cy0, top), min(cx1, left + t), min(cy1, top + t)
+                part = window[ay0 - y0:ay1 - y0, ax0 - x0:ax1 - x0]
+                if not part.any():
+                    continue
+                cells = self.tile((tx, ty)).copy()
+                np.copyto(cells[ay0 - top:ay1 - top, ax0 - left:ax1 - left], part, where=part != 0)
+                self.store((tx, ty), cells)
+                self.boxStale = True
+
+    def loadBits(self, data: bytes) -> None:  # a row of tiles at a time
+        self.clear()
+        t, size = self.tileSize, self.size
+        bits = np.frombuffer(data, dtype=np.uint8)
+        for y0 in range(0, size, t):
+            rows = min(t, size - y0)
+            first, shift = divmod(y0 * size, 8)  # a row of tiles doesnt have to start at a whole byte
+            cells = np.unpackbits(bits[first:-(-(y0 + rows) * size // 8)], bitorder="little")[shift:shift + rows * size]
+            self.loadWindow(0, y0, cells.reshape(rows, size))
+
+    def boundingBox(self) -> Optional[tuple[int, int, int, int]]:  # only the outermost tiles are looked at
+        tileYs, tileXs = np.nonzero(self.counts)
+        if not len(tileYs):
+            return None
+        t = self.tileSize
+        outer = (tileXs == tileXs.min()) | (tileXs == tileXs.max()) | (tileYs == tileYs.min()) | (tileYs == tileYs.max())
+        box = None
+        for ty, tx in zip(tileYs[outer].tolist(), tileXs[outer].tolist()):
+            ys, xs = np.nonzero(self.tile((tx, ty)))
+            x0, y0, x1, y1 = tx * t + int(xs.min()), ty * t + int(ys.min()), tx * t + int(xs.max()) + 1, ty * t + int(ys.max()) + 1
+            box = (x0, y0, x1, y1) if box is None else (min(box[0], x0), min(box[1], y0), max(box[2], x1), max(box[3], y1))
+        return box
+
+    @property
+    def population(self) -> int:
+        return int(self.counts.sum())
+
+    @property
+    def activeCells(self) -> int:
+        return self.lastActiveTiles * self.tileSize * self.tileSize
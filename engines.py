@@ -0,0 +1,330 @@
+from typing import Iterator, Literal, Optional, Union  # more typehints
+import copy, importlib
+from rules import Rule, life, parseRule, stepCells, aliveCells
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, the list engine works without it
+    np = None
+
+# "frozen": the outer ring never changes (the original behaviour of life.py)
+# "dead":   everything outside the field counts as dead, the outer ring evolves normally
+# "wrap":   the field is a torus, the edges are glued together
+Edge = Literal["frozen", "dead", "wrap"]
+edgeModes: tuple[str, ...] = ("frozen", "dead", "wrap")
+
+class Board:  # common interface of all stepping engines
+    name: str = ""
+    bounded: bool = True  # False if cells outside of the field are simulated too
+    inMemory: bool = True  # False if the field is too big to be copied, hashed or recorded as a whole (disk)
+    rule: Rule = life  # see rules.py, set with setRule
+    ruleKinds: frozenset[str] = frozenset({"simple"})  # the kinds of rules (Rule.kind) the engine can run
+    trackStats: bool = False  # set by stats.StatsCollector, step() then also fills lastStats (the engines that can)
+    lastStats: Optional[tuple[int, int, Optional[tuple[int, int, int, int]]]] = None  # (births, deaths, bounding box) of the last step
+    reportsFlips: bool = False  # True if step() records the cells it changed (recordFlips), for the incremental hash of cycles.py
+    flips: Optional[list[tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray"]]] = None  # (xs, ys, old states, new states) since takeFlips, None: unknown
+    flipCells: int = 0  # amount of cells in flips
+    maxFlipCells: int = 1 << 20  # if nobody takes the flips for that long they are dropped (and become unknown)
+    maxJumpExponent: int = 16  # jump() of an engine without a faster way runs 2^exponent steps, longer jumps are refused
+
+    def __init__(self, size: int, edge: Edge = "frozen") -> None:
+        if edge not in edgeModes:
+            raise ValueError(f"unknown edge mode: {edge!r}")
+        self.size = size
+        self.edge = edge
+
+    def setRule(self, rule: Union[Rule, str]) -> None:
+        rule = parseRule(rule) if isinstance(rule, str) else rule
+        if rule.kind not in self.ruleKinds:
+            raise ValueError(f"the {self.name} engine cant run {rule.string} ({rule.kind} rules)")
+        if not self.bounded and 0 in rule.birth:
+            raise ValueError(f"{rule.string} would fill the whole unbounded plane (B0)")
+        if rule.states < self.rule.states:  # dying cells that the new rule doesnt have
+            self.dropStates(rule.states)
+        self.rule = rule
+
+    def dropStates(self, states: int) -> None:  # clears the cells in state `states` and above
+        for x, y in [(x, y) for x, y in self.liveCells() if self.getCell(x, y) >= states]:
+            self.setCell(x, y, 0)
+
+    def getCell(self, x: int, y: int) -> int:
+        raise NotImplementedError
+
+    def setCell(self, x: int, y: int, state: int) -> None:  # state is 1 for alive, 0 for dead (2 and up are dying cells of Generations rules)
+        raise NotImplementedError
+
+    def step(self) -> int:  # advances the board, returns the amount of generations that passed
+        raise NotImplementedError
+
+    def jump(self, exponent: int) -> int:  # advances the board by 2^exponent generations
+        if not 0 <= exponent <= self.maxJumpExponent:
+            raise ValueError(f"the {self.name} engine can only jump up to 2^{self.maxJumpExponent} generations at once, not 2^{exponent}")
+        for _ in range(1 << exponent):
+            self.step()
+        return 1 << exponent
+
+    def liveCells(self) -> Iterator[tuple[int, int]]:  # yields the (x, y) position of every alive (or dying) cell
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def toList(self) -> list[list[int]]:  # the field as a nested list (field[y][x]), used for saving
+        return [[self.getCell(x, y) for x in range(self.size)] for y in range(self.size)]
+
+    def loadList(self, rows: list[list[int]]) -> None:
+        self.clear()
+        for y, row in enumerate(rows):
+            for x, cell in enumerate(row):
+                if cell:
+                    self.setCell(x, y, cell)
+
+    def toBits(self) -> bytes:  # the field packed to one bit per cell (row by row, lowest bit first)
+        data = bytearray(-(-self.size * self.size // 8))
+        for x, y in self.liveCells():
+            if self.inside(x, y):
+                i = y * self.size + x
+                data[i >> 3] |= 1 << (i & 7)
+        return bytes(data)
+
+    def loadBits(self, data: bytes) -> None:
+        self.clear()
+        for byteIndex, byte in enumerate(data):
+            while byte:
+                low = byte & -byte
+                i = byteIndex * 8 + low.bit_length() - 1
+                if i < self.size * self.size:
+                    self.setCell(i % self.size, i // self.size, 1)
+                byte ^= low
+
+    def copy(self) -> "Board":  # an independent copy of the field (used as snapshot for the renderer)
+        board = makeBoard(self.name, self.size, self.edge, self.rule)
+        board.loadBits(self.toBits())
+        return board
+
+    def window(self, x0: int, y0: int, x1: int, y1: int) -> "np.ndarray":  # the cells from (x0, y0) to (x1, y1) (exclusive) as uint8 array
+        out = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        for x, y in self.liveCells():
+            if x0 <= x < x1 and y0 <= y < y1:
+                out[y - y0, x - x0] = self.getCell(x, y)
+        return out
+
+    def loadWindow(self, x0: int, y0: int, window: "np.ndarray") -> None:  # sets the non empty cells of a window (the counterpart of window)
+        ys, xs = np.nonzero(window)
+        for x, y, state in zip((xs + x0).tolist(), (ys + y0).tolist(), window[ys, xs].tolist()):
+            self.setCell(x, y, state)
+
+    def boundingBox(self) -> Optional[tuple[int, int, int, int]]:  # (x0, y0, x1, y1) (exclusive) around all alive cells, None if empty
+        box = None
+        for x, y in self.liveCells():
+            box = (x, y, x + 1, y + 1) if box is None else (min(box[0], x), min(box[1], y), max(box[2], x + 1), max(box[3], y + 1))
+        return box
+
+    @property
+    def population(self) -> int:
+        return sum(1 for _ in self.liveCells())
+
+    @property
+    def activeCells(self) -> int:  # amount of cells the last step computed
+        return self.size * self.size if self.bounded else self.population
+
+    def inside(self, x: int, y: int) -> bool:
+        return 0 <= x < self.size and 0 <= y < self.size
+
+    # changed cells (cycles.BoardHasher): the steps after takeFlips collect the cells they changed, edits make them unknown
+    def takeFlips(self) -> Optional[list[tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray"]]]:
+        # the flips since the last call (None: unknown), and collecting starts again
+        flips = self.flips
+        self.flips, self.flipCells = ([] if self.reportsFlips else None), 0
+        return flips
+
+    def recordFlips(self, xs: "np.ndarray", ys: "np.ndarray", old: "np.ndarray", new: "np.ndarray") -> None:
+        if self.flips is None:
+            return
+        self.flips.append((xs, ys, old, new))
+        self.flipCells += len(xs)
+        if self.flipCells > self.maxFlipCells:
+            self.flips = None
+
+
+# numpy helpers for the statistics of the array based engines (Board.lastStats)
+def changeCounts(old: "np.ndarray", new: "np.ndarray") -> tuple[int, int]:  # (births, deaths): cells that became non empty / empty
+    before, after = old != 0, new != 0
+    both = np.count_nonzero(before & after)  # masks and counts only, gathering the changed cells is slower
+    return int(np.count_nonzero(after) - both), int(np.count_nonzero(before) - both)
+
+def cellBox(cells: "np.ndarray", x0: int = 0, y0: int = 0) -> Optional[tuple[int, int, int, int]]:  # bounding box of the non empty cells
+    rows = np.flatnonzero(cells.any(axis=1))
+    if not len(rows):
+        return None
+    cols = np.flatnonzero(cells[rows[0]:rows[-1] + 1].any(axis=0))
+    return (x0 + int(cols[0]), y0 + int(rows[0]), x0 + int(cols[-1]) + 1, y0 + int(rows[-1]) + 1)
+
+
+class ListBoard(Board):  # the original pure python implementation (nested lists)
+    name = "list"
+    ruleKinds = frozenset({"simple", "generations"})
+
+    def __init__(self, size: int, edge: Edge = "frozen") -> None:
+        super().__init__(size, edge)
+        self.field: list[list[int]] = [[0 for _ in range(size)] for _ in range(size)]
+
+    def getCell(self, x: int, y: int) -> int:
+        return self.field[y][x]
+
+    def setCell(self, x: int, y: int, state: Literal[1, 0]) -> None:
+        self.field[y][x] = state
+
+    def listNeighbors(self, x: int, y: int, tempField: list[list[int]]) -> int:
+        size = self.size
+        alive = 0
+        for offsetY in [-1, 0, 1]:
+            for offsetX in [-1, 0, 1]:
+                nx, ny = x + offsetX, y + offsetY
+                if self.edge == "wrap":
+                    nx, ny = nx % size, ny % size
+                elif not (0 <= nx < size and 0 <= ny < size):
+                    continue
+                if tempField[ny][nx] == 1:  # dying cells (Generations) dont count
+                    alive += 1
+        return alive - (tempField[y][x] == 1)
+
+    def step(self) -> int:
+        size = self.size
+        countTable = self.rule.countTable  # next state by [state][neighbors]
+        tempField = copy.deepcopy(self.field)  # so that the new cells dont interfere w/ the old ones
+        for y, row in enumerate(tempField):
+            for x, cell in enumerate(row):
+                if self.edge == "frozen" and (x == 0 or x == size - 1 or y == 0 or y == size - 1):
+                    continue  # skipping the cell if its on the edge of the grid
+
+                neighbors = self.listNeighbors(x, y, tempField)
+                self.field[y][x] = countTable[cell][neighbors]
+        return 1
+
+    def liveCells(self) -> Iterator[tuple[int, int]]:
+        for y, row in enumerate(self.field):
+            for x, cell in enumerate(row):
+                if cell:
+                    yield (x, y)
+
+    def clear(self) -> None:
+        self.field = [[0 for _ in range(self.size)] for _ in range(self.size)]
+
+    def toList(self) -> list[list[int]]:
+        return copy.deepcopy(self.field)
+
+    def copy(self) -> "ListBoard":
+        board = ListBoard(self.size, self.edge)
+        board.rule = self.rule
+        board.field = copy.deepcopy(self.field)
+        return board
+
+
+class NumpyBoard(Board):  # vectorized engine, the field is a uint8 array and a generation is a few array ops
+    name = "numpy"
+    ruleKinds = frozenset({"simple", "generations", "larger"})
+
+    def __init__(self, size: int, edge: Edge = "frozen") -> None:
+        if np is None:
+            raise ImportError("the numpy engine requires numpy")
+        super().__init__(size, edge)
+        self.cells = np.zeros((size, size), dtype=np.uint8)
+
+    def getCell(self, x: int, y: int) -> int:
+        return int(self.cells[y, x])
+
+    def setCell(self, x: int, y: int, state: Literal[1, 0]) -> None:
+        self.cells[y, x] = state
+
+    def step(self) -> int:
+        old = self.cells
+        r = self.rule.radius
+        padded = np.pad(aliveCells(old, self.rule), r, mode="wrap" if self.edge == "wrap" else "constant")  # the alive cells + the neighbours outside
+        new = stepCells(padded, old, self.rule)  # table lookup, see rules.py
+        if self.edge == "frozen":  # the outer ring (as wide as the neighbourhood) keeps its state
+            new[:r, :], new[-r:, :], new[:, :r], new[:, -r:] = old[:r, :], old[-r:, :], old[:, :r], old[:, -r:]
+        if self.trackStats:
+            self.lastStats = (*changeCounts(old, new), cellBox(new))
+        self.cells = new
+        return 1
+
+    def dropStates(self, states: int) -> None:
+        self.cells[self.cells >= states] = 0
+
+    def liveCells(self) -> Iterator[tuple[int, int]]:
+        ys, xs = np.nonzero(self.cells)
+        return zip(xs.tolist(), ys.tolist())
+
+    def clear(self) -> None:
+        self.cells = np.zeros((self.size, self.size), dtype=np.uint8)
+
+    def toList(self) -> list[list[int]]:
+        return self.cells.tolist()
+
+    def loadList(self, rows: list[list[int]]) -> None:
+        self.cells = np.array(rows, dtype=np.uint8).reshape(self.size, self.size)
+
+    def toBits(self) -> bytes:
+        return np.packbits(self.cells, axis=None, bitorder="little").tobytes()
+
+    def loadBits(self, data: bytes) -> None:
+        cells = np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=self.size * self.size, bitorder="little")
+        self.cells = cells.reshape(self.size, self.size)
+
+    def copy(self) -> "NumpyBoard":  # always a plain NumpyBoard, subclasses dont have to copy their extra state (tiles, pools)
+        board = NumpyBoard.__new__(NumpyBoard)
+        Board.__init__(board, self.size, self.edge)
+        board.rule = self.rule
+        board.cells = self.cells.copy()
+        return board
+
+    def window(self, x0: int, y0: int, x1: int, y1: int) -> "np.ndarray":
+        out = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        cx0, cy0, cx1, cy1 = max(x0, 0), max(y0, 0), min(x1, self.size), min(y1, self.size)
+        if cx0 < cx1 and cy0 < cy1:
+            out[cy0 - y0:cy1 - y0, cx0 - x0:cx1 - x0] = self.cells[cy0:cy1, cx0:cx1]
+        return out
+
+    def loadWindow(self, x0: int, y0: int, window: "np.ndarray") -> None:  # the part inside the field, in one copy
+        h, w = window.shape
+        cx0, cy0, cx1, cy1 = max(x0, 0), max(y0, 0), min(x0 + w, self.size), min(y0 + h, self.size)
+        if cx0 < cx1 and cy0 < cy1:
+            part = window[cy0 - y0:cy1 - y0, cx0 - x0:cx1 - x0]
+            np.copyto(self.cells[cy0:cy1, cx0:cx1], part, where=part != 0)
+
+    def boundingBox(self) -> Optional[tuple[int, int, int, int]]:
+        return cellBox(self.cells)
+
+    @property
+    def population(self) -> int:
+        return int(np.count_nonzero(self.cells))
+
+
+# engine name -> (module, class), the modules are only imported when the engine is used
+engines: dict[str, tuple[str, str]] = {
+    "list": ("engines", "ListBoard"),
+    "numpy": ("engines", "NumpyBoard"),
+    "hashlife": ("hashlife", "HashlifeBoard"),
+    "tiled": ("tiled", "TiledBoard"),
+    "bits": ("bitboard", "BitBoard"),
+    "parallel": ("parallel", "ParallelBoard"),
+    "chunked": ("chunked", "ChunkedBoard"),
+    "incremental": ("incremental", "IncrementalBoard"),
+    "disk": ("diskboard", "DiskBoard"),
+}
+
+def canJump(board: Board) -> bool:  # True if jump() is faster than stepping (hashlife), any exponent works then
+    return type(board).jump is not Board.jump
+
+def defaultEngine() -> str:
+    return "numpy" if np is not None else "incremental"
+
+def makeBoard(engine: str, size: int, edge: Edge = "frozen", rule: Union[Rule, str] = life) -> Board:
+    if engine not in engines:
+        raise ValueError(f"unknown engine: {engine!r} (available: {', '.join(engines)})")
+    module, className = engines[engine]
+    board = getattr(importlib.import_module(module), className)(size, edge)
+    if rule is not life:
+        board.setRule(rule)
+    return board
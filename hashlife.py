@@ -0,0 +1,266 @@
+from typing import Iterable, Iterator, Literal, Optional, Union  # more typehints
+import copy
+from engines import Board, Edge, np
+from rules import Rule, life, parseRule
+
+# Hashlife: the plane is a quadtree of canonical (hash-consed) nodes, so equal regions
+# are the same object and the result of advancing a region is only ever computed once.
+# A node of level k covers 2^k x 2^k cells, level 0 nodes are single cells.
+
+class Node:
+    __slots__ = ("nw", "ne", "sw", "se", "level", "population")
+
+    def __init__(self, nw: Optional["Node"], ne: Optional["Node"], sw: Optional["Node"], se: Optional["Node"], level: int, population: int) -> None:
+        self.nw, self.ne, self.sw, self.se = nw, ne, sw, se
+        self.level = level
+        self.population = population
+    # nodes are canonical, so the default identity hash/eq is exactly what the caches need
+
+
+class Hashlife:
+    def __init__(self, maxNodes: int = 2_000_000, rule: Rule = life) -> None:
+        self.maxNodes = maxNodes  # node table + result cache size at which garbage is collected
+        self.rule = rule  # two states, radius 1 and no B0 (empty nodes have to stay empty)
+        self.off = Node(None, None, None, None, 0, 0)
+        self.on = Node(None, None, None, None, 0, 1)
+        self.table: dict[tuple[Node, Node, Node, Node], Node] = {}  # canonical node table
+        self.results: dict[tuple[Node, int], Node] = {}  # memoized RESULT of (node, step exponent)
+        self.empties: list[Node] = [self.off]
+        self.root: Node = self.empty(3)
+        self.originX = self.originY = -4  # position of the top left corner of the root
+        self.generation = 0
+
+    # node construction
+    def join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        key = (nw, ne, sw, se)
+        node = self.table.get(key)
+        if node is None:
+            node = Node(nw, ne, sw, se, nw.level + 1, nw.population + ne.population + sw.population + se.population)
+            self.table[key] = node
+        return node
+
+    def empty(self, level: int) -> Node:
+        while len(self.empties) <= level:
+            e = self.empties[-1]
+            self.empties.append(self.join(e, e, e, e))
+        return self.empties[level]
+
+    def centre(self, node: Node) -> Node:  # the node one level bigger with `node` in its middle
+        e = self.empty(node.level - 1)
+        return self.join(self.join(e, e, e, node.nw), self.join(e, e, node.ne, e),
+                         self.join(e, node.sw, e, e), self.join(node.se, e, e, e))
+
+    def expand(self) -> None:  # doubles the size of the root, keeping the pattern in place
+        half = 1 << (self.root.level - 1)
+        self.root = self.centre(self.root)
+        self.originX -= half
+        self.originY -= half
+
+    def isPadded(self, node: Node) -> bool:  # True if every alive cell is in the inner half of the node
+        return (node.nw.population == node.nw.se.se.population and node.ne.population == node.ne.sw.sw.population
+                and node.sw.population == node.sw.ne.ne.population and node.se.population == node.se.nw.nw.population)
+
+    # evolution
+    def life4x4(self, node: Node) -> Node:  # the 2x2 centre of a level 2 node one generation later
+        nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+        block = (nw.nw.population | nw.ne.population << 1 | ne.nw.population << 2 | ne.ne.population << 3  # bit y * 4 + x
+                 | nw.sw.population << 4 | nw.se.population << 5 | ne.sw.population << 6 | ne.se.population << 7
+                 | sw.nw.population << 8 | sw.ne.population << 9 | se.nw.population << 10 | se.ne.population << 11
+                 | sw.sw.population << 12 | sw.se.population << 13 | se.sw.population << 14 | se.se.population << 15)
+        out = self.rule.blockTable[block]  # see rules.py
+        on, off = self.on, self.off
+        return self.join(on if out & 1 else off, on if out & 2 else off, on if out & 4 else off, on if out & 8 else off)
+
+    def successor(self, node: Node, j: int) -> Node:  # centre of `node` (one level smaller) 2^j generations later
+        j = min(j, node.level - 2)
+        if node.population == 0:
+            return node.nw
+        key = (node, j)
+        result = self.results.get(key)
+        if result is not None:
+            return result
+        if node.level == 2:
+            result = self.life4x4(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            # the nine overlapping sub nodes, advanced by 2^j (or 2^(level - 3) at full speed)
+            c00 = self.successor(nw, j)
+            c01 = self.successor(self.join(nw.ne, ne.nw, nw.se, ne.sw), j)
+            c02 = self.successor(ne, j)
+            c10 = self.successor(self.join(nw.sw, nw.se, sw.nw, sw.ne), j)
+            c11 = self.successor(self.join(nw.se, ne.sw, sw.ne, se.nw), j)
+            c12 = self.successor(self.join(ne.sw, ne.se, se.nw, se.ne), j)
+            c20 = self.successor(sw, j)
+            c21 = self.successor(self.join(sw.ne, se.nw, sw.se, se.sw), j)
+            c22 = self.successor(se, j)
+            if j < node.level - 2:  # the requested step is already done, just take the centres
+                result = self.join(self.join(c00.se, c01.sw, c10.ne, c11.nw), self.join(c01.se, c02.sw, c11.ne, c12.nw),
+                                   self.join(c10.se, c11.sw, c20.ne, c21.nw), self.join(c11.se, c12.sw, c21.ne, c22.nw))
+            else:  # full speed: advance a second time
+                result = self.join(self.successor(self.join(c00, c01, c10, c11), j), self.successor(self.join(c01, c02, c11, c12), j),
+                                   self.successor(self.join(c10, c11, c20, c21), j), self.successor(self.join(c11, c12, c21, c22), j))
+        self.results[key] = result
+        return result
+
+    def step(self, exponent: int = 0) -> int:  # advances the universe by 2^exponent generations
+        while self.root.level < exponent + 2 or not self.isPadded(self.root):
+            self.expand()
+        self.expand()  # one more ring so nothing can escape the result
+        quarter = 1 << (self.root.level - 2)
+        self.root = self.successor(self.root, exponent)
+        self.originX += quarter
+        self.originY += quarter
+        self.generation += 1 << exponent
+        if len(self.table) + len(self.results) > self.maxNodes:
+            self.collect()
+        return 1 << exponent
+
+    def collect(self) -> None:  # garbage collection: drops every node that the root doesnt use anymore
+        self.results.clear()
+        table: dict[tuple[Node, Node, Node, Node], Node] = {}
+        stack = [self.root, *self.empties[1:]]
+        while stack:
+            node = stack.pop()
+            if node.level == 0:
+                continue
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key not in table:
+                table[key] = node
+                stack.extend(key)
+        self.table = table
+
+    # cell access
+    def getCell(self, x: int, y: int) -> int:
+        x -= self.originX
+        y -= self.originY
+        node = self.root
+        size = 1 << node.level
+        if not (0 <= x < size and 0 <= y < size):
+            return 0
+        while node.level > 0:
+            if node.population == 0:
+                return 0
+            half = 1 << (node.level - 1)
+            if y < half:
+                node = node.nw if x < half else node.ne
+            else:
+                node = node.sw if x < half else node.se
+            x, y = x % half, y % half
+        return node.population
+
+    def setCell(self, x: int, y: int, state: Literal[1, 0]) -> None:
+        while not (0 <= x - self.originX < (1 << self.root.level) and 0 <= y - self.originY < (1 << self.root.level)):
+            self.expand()
+        self.root = self.setInNode(self.root, x - self.originX, y - self.originY, state)
+
+    def setInNode(self, node: Node, x: int, y: int, state: int) -> Node:
+        if node.level == 0:
+            return self.on if state else self.off
+        half = 1 << (node.level - 1)
+        nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+        if y < half:
+            if x < half: nw = self.setInNode(nw, x, y, state)
+            else       : ne = self.setInNode(ne, x - half, y, state)
+        else:
+            if x < half: sw = self.setInNode(sw, x, y - half, state)
+            else       : se = self.setInNode(se, x - half, y - half, state)
+        return self.join(nw, ne, sw, se)
+
+    def liveCells(self) -> Iterator[tuple[int, int]]:
+        stack = [(self.root, self.originX, self.originY)]
+        while stack:
+            node, x, y = stack.pop()
+            if node.population == 0:
+                continue
+            if node.level == 0:
+                yield (x, y)
+                continue
+            half = 1 << (node.level - 1)
+            stack.extend(((node.se, x + half, y + half), (node.sw, x, y + half), (node.ne, x + half, y), (node.nw, x, y)))
+
+    def cellsIn(self, x0: int, y0: int, x1: int, y1: int) -> Iterator[tuple[int, int]]:  # alive cells inside the rectangle (exclusive)
+        stack = [(self.root, self.originX, self.originY)]
+        while stack:
+            node, x, y = stack.pop()
+            size = 1 << node.level
+            if node.population == 0 or x >= x1 or y >= y1 or x + size <= x0 or y + size <= y0:
+                continue
+            if node.level == 0:
+                yield (x, y)
+                continue
+            half = size >> 1
+            stack.extend(((node.se, x + half, y + half), (node.sw, x, y + half), (node.ne, x + half, y), (node.nw, x, y)))
+
+    def clear(self) -> None:
+        self.root = self.empty(3)
+        self.originX = self.originY = -4
+
+    @property
+    def population(self) -> int:
+        return self.root.population
+
+    def setRule(self, rule: Rule) -> None:  # the results were computed with the old rule (a new dict, copies share it)
+        self.rule = rule
+        self.results = {}
+
+    @classmethod
+    def fromCells(cls, cells: Iterable[tuple[int, int]], **kwargs) -> "Hashlife":
+        universe = cls(**kwargs)
+        for x, y in cells:
+            universe.setCell(x, y, 1)
+        return universe
+
+
+class HashlifeBoard(Board):  # Board adapter so life.py can use hashlife, always simulates the unbounded plane
+    name = "hashlife"
+    bounded = False
+
+    def __init__(self, size: int, edge: Edge = "frozen") -> None:
+        super().__init__(size, edge)
+        self.universe = Hashlife()
+
+    def setRule(self, rule: Union[Rule, str]) -> None:
+        super().setRule(rule)
+        self.universe.setRule(self.rule)
+
+    def getCell(self, x: int, y: int) -> int:
+        return self.universe.getCell(x, y)
+
+    def setCell(self, x: int, y: int, state: Literal[1, 0]) -> None:
+        self.universe.setCell(x, y, state)
+
+    def step(self) -> int:
+        return self.universe.step(0)
+
+    def jump(self, exponent: int) -> int:
+        return self.universe.step(exponent)
+
+    def liveCells(self) -> Iterator[tuple[int, int]]:
+        return self.universe.liveCells()
+
+    def clear(self) -> None:
+        self.universe.clear()
+
+    def copy(self) -> "HashlifeBoard":  # nodes never change, so a copy only needs its own root
+        board = HashlifeBoard.__new__(HashlifeBoard)
+        Board.__init__(board, self.size, self.edge)
+        board.rule = self.rule
+        board.universe = copy.copy(self.universe)
+        return board
+
+    def window(self, x0: int, y0: int, x1: int, y1: int) -> "np.ndarray":
+        out = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        for x, y in self.universe.cellsIn(x0, y0, x1, y1):
+            out[y - y0, x - x0] = 1
+        return out
+
+    def toList(self) -> list[list[int]]:  # only the part of the plane inside the field is saved
+        rows = [[0] * self.size for _ in range(self.size)]
+        for x, y in self.liveCells():
+            if self.inside(x, y):
+                rows[y][x] = 1
+        return rows
+
+    @property
+    def population(self) -> int:
+        return self.universe.population
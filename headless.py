@@ -0,0 +1,156 @@
+from typing import Any, Iterable, Optional  # more typehints
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+import argparse, itertools, json, random, sys
+from engines import Board, canJump, engines, edgeModes, makeBoard, defaultEngine
+from rules import parseRule
+
+try:
+    import resource
+except ImportError:  # not available on windows, the peak rss is reported as None there
+    resource = None
+
+# runs the simulation without a window, for benchmarks on machines without a display:
+#   python -m life run pattern.rle --gens 100000 --engine numpy --report json
+#   python -m life batch soup --seeds 16 --engines numpy,bits --gens 1000 --out results.jsonl
+#   python -m life run soup --gens 100000 --stats soup.stats     also logs the statistics of every generation (see stats.py)
+# a pattern is a pattern file (see patterns.py) or "soup" for a random field made from --seed
+# (python -m headless ... does the same, neither of them imports pygame)
+
+def loadBoard(pattern: str, engine: str, size: int, edge: str, seed: int = 0, density: float = 0.3, rule: str = "B3/S23") -> Board:
+    board = makeBoard(engine, size, edge, rule)
+    if pattern == "soup":
+        rng = random.Random(seed)
+        for y in range(size):
+            for x in range(size):
+                if rng.random() < density:
+                    board.setCell(x, y, 1)
+        return board
+    from patterns import readPattern, cellsFromRuns
+    cells = list(cellsFromRuns(readPattern(pattern)))
+    if cells:  # the pattern is placed in the middle of the field
+        minX, minY = min(x for x, _ in cells), min(y for _, y in cells)
+        maxX, maxY = max(x for x, _ in cells), max(y for _, y in cells)
+        offsetX, offsetY = (size - (maxX - minX + 1)) // 2 - minX, (size - (maxY - minY + 1)) // 2 - minY
+        for x, y in cells:
+            if not board.bounded or board.inside(x + offsetX, y + offsetY):
+                board.setCell(x + offsetX, y + offsetY, 1)
+    return board
+
+def advance(board: Board, gens: int) -> int:  # advances exactly `gens` generations in as few jumps as possible
+    done = 0
+    for exponent in reversed(range(gens.bit_length())):
+        if not gens >> exponent & 1:
+            continue
+        if not canJump(board) and exponent > board.maxJumpExponent:  # stepping engines in the largest jumps they take
+            for _ in range(1 << (exponent - board.maxJumpExponent)):
+                done += board.jump(board.maxJumpExponent)
+        else:
+            done += board.jump(exponent) if exponent else board.step()
+    return done
+
+def advanceWithStats(board: Board, gens: int, path: str) -> int:  # one generation at a time, every one is logged
+    from stats import StatsCollector
+    collector = StatsCollector(log=path)
+    try:
+        collector.observe(board, 0, 0)
+        for generation in range(1, gens + 1):
+            board.step()
+            collector.observe(board, generation)
+    finally:
+        collector.close()
+    return gens
+
+def peakRSS() -> Optional[int]:  # peak resident memory of this process in KiB
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macos reports bytes, linux KiB
+
+def simulatedCells(board: Board) -> int:  # cells per generation: the whole field, or the alive cells on the unbounded plane
+    return board.size * board.size if board.bounded else board.population
+
+def runJob(job: dict[str, Any]) -> dict[str, Any]:  # one run, also the entry point of the batch workers
+    board = loadBoard(job["pattern"], job["engine"], job["size"], job["edge"], job.get("seed", 0), job.get("density", 0.3), job.get("rule", "B3/S23"))
+    try:
+        start = perf_counter()
+        gens = advanceWithStats(board, job["gens"], job["stats"]) if job.get("stats") else advance(board, job["gens"])
+        seconds = perf_counter() - start
+        cells = simulatedCells(board)
+        return {**job, "seconds": seconds, "gensPerSecond": gens / seconds if seconds else None,
+                "cellsPerSecond": gens * cells / seconds if seconds else None, "peakRSSKiB": peakRSS(), "population": board.population}
+    finally:
+        if hasattr(board, "close"):  # the parallel engine has processes and shared memory to free
+            board.close()
+
+def printReport(result: dict[str, Any], report: str) -> None:
+    if report == "json":
+        print(json.dumps(result))
+        return
+    print(f"{result['pattern']} ({result['engine']}, {result['size']}x{result['size']}, {result['edge']}, {result.get('rule', 'B3/S23')}): {result['gens']} gens in {result['seconds']:.3f}s")
+    print(f"  {result['gensPerSecond'] or 0:,.0f} gens/s  {result['cellsPerSecond'] or 0:,.0f} cells/s")
+    print(f"  peak rss: {result['peakRSSKiB']} KiB  population: {result['population']}")
+
+def batchJobs(args: argparse.Namespace) -> Iterable[dict[str, Any]]:  # every combination of pattern, seed and engine
+    seeds = range(args.seed, args.seed + args.seeds)
+    for pattern, engine in itertools.product(args.patterns, args.engines.split(",")):
+        for seed in (seeds if pattern == "soup" else (args.seed,)):
+            yield {"pattern": pattern, "engine": engine, "edge": args.edge, "size": args.size, "gens": args.gens, "seed": seed, "density": args.density, "rule": args.rule}
+
+def runBatch(args: argparse.Namespace) -> None:  # one json line per job, written as soon as it is its turn
+    out = open(args.out, "w") if args.out else sys.stdout
+    try:
+        # one process per job, so the peak rss belongs to that job alone (the executors workers are no daemons,
+        # so the parallel engine can still start its own pool)
+        with ProcessPoolExecutor(args.workers, max_tasks_per_child=1) as pool:
+            for result in pool.map(runJob, batchJobs(args)):
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+def parseArgs(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m life", description="runs the game of life without a window")
+    commands = parser.add_subparsers(dest="command", required=True)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--gens", type=int, default=1000, help="generations to advance")
+    common.add_argument("--size", type=int, default=100, help="width and height of the field")
+    common.add_argument("--edge", choices=edgeModes, default="frozen")
+    common.add_argument("--seed", type=int, default=0, help="seed of the random soup")
+    common.add_argument("--density", type=float, default=0.3, help="share of alive cells in the random soup")
+    common.add_argument("--rule", default="B3/S23", help="rulestring, e.g. B36/S23, B2/S/C3 or R5,C0,M1,S34..58,B34..45,NM (see rules.py)")
+    run = commands.add_parser("run", parents=[common], help="advance one pattern and report the throughput")
+    run.add_argument("pattern", nargs="?", default="soup", help="pattern file or 'soup'")
+    run.add_argument("--engine", choices=list(engines), default=defaultEngine())
+    run.add_argument("--report", choices=("text", "json"), default="text")
+    run.add_argument("--stats", default=None, help="log the statistics of every generation into this file (.csv or binary, see stats.py)")
+    batch = commands.add_parser("batch", parents=[common], help="run many patterns, seeds and engines in a process pool")
+    batch.add_argument("patterns", nargs="*", default=["soup"], help="pattern files or 'soup'")
+    batch.add_argument("--engines", default=defaultEngine(), help="comma separated engines")
+    batch.add_argument("--seeds", type=int, default=1, help="amount of soups per engine (seeds --seed, --seed + 1, ...)")
+    batch.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    batch.add_argument("--out", default=None, help="jsonl file for the results (default: stdout)")
+    args = parser.parse_args(argv)
+    try:
+        parseRule(args.rule)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.command == "batch":
+        unknown = set(args.engines.split(",")) - set(engines)
+        if unknown:
+            parser.error(f"unknown engines: {', '.join(sorted(unknown))}")
+    return args
+
+def main(argv: Optional[list[str]] = None) -> None:
+    args = parseArgs(sys.argv[1:] if argv is None else argv)
+    if args.command == "run":
+        job = {"pattern": args.pattern, "engine": args.engine, "edge": args.edge, "size": args.size, "gens": args.gens, "seed": args.seed, "density": args.density, "rule": args.rule}
+        if args.stats:
+            job["stats"] = args.stats
+        printReport(runJob(job), args.report)
+    else:
+        runBatch(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+from typing import Iterator, Optional, Union  # more typehints
+from engines import Board, Edge, cellBox, np
+from rules import Rule, parseRule
+
+# pure python engine that never looks at cells that cant change: every cell keeps its amount of alive neighbours
+# in a persistent count array, which is updated by +1/-1 on the 8 neighbours whenever a cell flips (in a step or
+# by an edit). Only the cells that flipped or whose count moved can change in the next step, so they are collected
+# as its candidates: all other cells have the same state and the same count as last generation and so stay the same.
+# A generation costs O(changes) instead of O(area), e.g. a field of still lifes costs nothing at all.
+# The field and the counts are flat bytearrays, cell (x, y) is at index y * size + x
+
+neighbourOffsets: tuple[tuple[int, int], ...] = ((-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+
+class IncrementalBoard(Board):
+    name = "incremental"
+    ruleKinds = frozenset({"simple", "generations"})
+    reportsFlips = np is not None
+
+    def __init__(self, size: int, edge: Edge = "frozen") -> None:
+        super().__init__(size, edge)
+        self.cells = bytearray(size * size)  # state of every cell
+        self.counts = bytearray(size * size)  # amount of alive neighbours of every cell
+        self.border = bytearray(size * size)  # 1 for the outer ring, its neighbours need the edge mode
+        for i in range(size):
+            self.border[i] = self.border[(size - 1) * size + i] = self.border[i * size] = self.border[i * size + size - 1] = 1
+        self.offsets = (-size - 1, -size, -size + 1, -1, 1, size - 1, size, size + 1)  # of the neighbours of inner cells
+        self.candidates: set[int] = set()  # the only cells that can change in the next step (they or their count changed)
+        self.occupied = 0  # amount of non empty cells
+        self.lastVisited = 0  # amount of cells the last step looked at
+        self.box: Optional[tuple[int, int, int, int]] = None  # bounding box kept along for lastStats (None: unknown or empty)
+
+    def setRule(self, rule: Union[Rule, str]) -> None:
+        rule = parseRule(rule) if isinstance(rule, str) else rule
+        if 0 in rule.birth:  # B0 changes cells without any changes around them
+            raise ValueError(f"the {self.name} engine cant run B0 rules ({rule.string})")
+        super().setRule(rule)
+        self.flips = None
+        self.candidates = {i for i, count in enumerate(self.counts) if count} | {i for i, cell in enumerate(self.cells) if cell}
+
+    def neighbours(self, i: int) -> tuple[int, ...]:  # flat indices of the neighbours of cell i
+        if not self.border[i]:
+            return tuple(i + offset for offset in self.offsets)
+        size = self.size
+        y, x = divmod(i, size)
+        if self.edge == "wrap":
+            return tuple((y + offsetY) % size * size + (x + offsetX) % size for offsetX, offsetY in neighbourOffsets)
+        return tuple((y + offsetY) * size + x + offsetX for offsetX, offsetY in neighbourOffsets
+                     if 0 <= x + offsetX < size and 0 <= y + offsetY < size)
+
+    def apply(self, updates: list[tuple[int, int]]) -> None:  # sets the cells and moves the counts of their neighbours
+        cells, counts, border, offsets = self.cells, self.counts, self.border, self.offsets
+        moved = []
+        for i, state in updates:
+            old = cells[i]
+            cells[i] = state
+            self.occupied += (state != 0) - (old != 0)
+            delta = (state == 1) - (old == 1)  # dying cells (Generations) dont count as neighbours
+            if delta:
+                neighbours = [i + offset for offset in offsets] if not border[i] else self.neighbours(i)
+                for n in neighbours:
+                    counts[n] += delta
+                moved += neighbours
+        self.candidates.update(moved)
+        self.candidates.update(i for i, _ in updates)
+
+    # accessor api
+    def getCell(self, x: int, y: int) -> int:
+        return self.cells[y * self.size + x]
+
+    def setCell(self, x: int, y: int, state: int) -> None:
+        i = y * self.size + x
+        if self.cells[i] != state:
+            self.apply([(i, state)])
+            self.flips = None
+            self.box = None
+
+    def step(self) -> int:
+        cells, counts, border = self.cells, self.counts, self.border
+        countTable = self.rule.countTable
+        candidates = self.candidates
+        if self.edge == "frozen":
+            candidates = [i for i in candidates if not border[i]]
+        # all new states first, then the counts are moved, so the cells dont interfere w/ each other
+        updates = [(i, state) for i in candidates if (state := countTable[cells[i]][counts[i]]) != cells[i]]
+        self.lastVisited = len(candidates)
+        if self.trackStats:  # from the changed cells (the bounding box is kept along, see trackBox)
+            born = [i for i, _ in updates if not cells[i]]
+            died = [i for i, state in updates if not state]
+        if self.flips is not None and updates:  # the old states, before they are overwritten
+            indices = np.fromiter((i for i, _ in updates), dtype=np.int64, count=len(updates))
+            old = np.fromiter((cells[i] for i, _ in updates), dtype=np.uint8, count=len(updates))
+            new = np.fromiter((state for _, state in updates), dtype=np.uint8, count=len(updates))
+            self.recordFlips(indices % self.size, indices // self.size, old, new)
+        self.candidates = set()
+        self.apply(updates)
+        if self.trackStats:
+            self.lastStats = (len(born), len(died), self.trackBox(born, died))
+        return 1
+
+    def trackBox(self, born: list[int], died: list[int]) -> Optional[tuple[int, int, int, int]]:
+        # like IncrementalLife.trackBox: the box only grows by the born cells, the field is only searched again
+        # if a cell on its border died
+        box, size = self.box, self.size
+        if box is not None and any(i % size in (box[0], box[2] - 1) or i // size in (box[1], box[3] - 1) for i in died):
+            box = None
+        if box is None:
+            box = self.boundingBox() if self.occupied else None
+        elif born:
+            xs, ys = [i % size for i in born], [i // size for i in born]
+            box = (min(box[0], min(xs)), min(box[1], min(ys)), max(box[2], max(xs) + 1), max(box[3], max(ys) + 1))
+        self.box = box
+        return box
+
+    def liveCells(self) -> Iterator[tuple[int, int]]:
+        size = self.size
+        for i, cell in enumerate(self.cells):
+            if cell:
+                yield (i % size, i // size)
+
+    def clear(self) -> None:
+        self.cells = bytearray(self.size * self.size)
+        self.counts = bytearray(self.size * self.size)
+        self.candidates = set()
+        self.occupied = 0
+        self.flips = None
+        self.box = None
+
+    def toList(self) -> list[list[int]]:
+        size = self.size
+        return [list(self.cells[y * size:(y + 1) * size]) for y in range(size)]
+
+    def copy(self) -> "IncrementalBoard":  # the border mask never changes, so it is shared
+        board = IncrementalBoard.__new__(IncrementalBoard)
+        board.__dict__.update(self.__dict__)
+        board.cells, board.counts, board.candidates = bytearray(self.cells), bytearray(self.counts), set(self.candidates)
+        board.flips = None  # the flips belong to this board
+        return board
+
+    def window(self, x0: int, y0: int, x1: int, y1: int) -> "np.ndarray":
+        out = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        cx0, cy0, cx1, cy1 = max(x0, 0), max(y0, 0), min(x1, self.size), min(y1, self.size)
+        if cx0 < cx1 and cy0 < cy1:
+            field = np.frombuffer(self.cells, dtype=np.uint8).reshape(self.size, self.size)
+            out[cy0 - y0:cy1 - y0, cx0 - x0:cx1 - x0] = field[cy0:cy1, cx0:cx1]
+        return out
+
+    def boundingBox(self) -> Optional[tuple[int, int, int, int]]:  # one vectorised pass over the field
+        if np is None:
+            return super().boundingBox()
+        return cellBox(np.frombuffer(self.cells, dtype=np.uint8).reshape(self.size, self.size))
+
+    @property
+    def population(self) -> int:
+        return self.occupied
+
+    @property
+    def activeCells(self) -> int:
+        return self.lastVisited
@@ -1,7 +1,18 @@
-from typing import Literal  # more typehints
-import pygame, copy, json
+from typing import TYPE_CHECKING, Literal, Optional  # more typehints
+import os, sys
 from sys import exit
-from time import time as getTime 
+from engines import Board, canJump, makeBoard, defaultEngine, np
+from simulation import Simulation
+from savefile import SaveFormatError, loadSnapshot, saveSnapshot, migrateJsonConfig
+from profiler import Profiler
+from cycles import Cycle, CycleDetector, recordStates
+from rules import presets
+from timeline import Timeline, boardState, loadBoardState
+from stats import StatsCollector
+from time import strftime
+
+if TYPE_CHECKING:  # pygame and the renderer are only imported once a window is opened (importDisplay)
+    import pygame, renderer
 
 # Values
 fieldSize: int = 100
@@ -10,14 +21,29 @@ screenSize: tuple[int, int] = (1600, 900)
 cameraPos: tuple[int, int] = (-(fieldSize * cellSize - screenSize[0]) / 2, - (fieldSize * cellSize - screenSize[1]) / 2)
 panSpeed: float = 0.1  # speed of panning (2 doubles the seed and 0.5 halfs the default speed)
 genSpeed: int = 5 # speed of the simulation from 1 to 10 (1 being the slowest and 10 as fast as possible)
+engine: str = "chunked" if np is not None else defaultEngine()  # stepping engine, see engines.py (the chunked plane has no edge)
+edge: str = "frozen"  # what happens at the edge of the field, see engines.py
+rule: str = "B3/S23"  # rulestring, see rules.py (R cycles through the presets there)
+stepExponent: int = 0  # every generation step advances 2^stepExponent generations (fast with the hashlife engine)
+cycleAction: str = "pause"  # what happens once the field repeats itself: "pause", "fastforward" (replays the cycle without simulating) or "off"
+cycleWindow: int = 1024  # amount of generations that are remembered for finding cycles
+recordTimeline: bool = False  # record every generation and edit for rewinding and undo (T), costs a pass over the field per generation
 
 # 0: dead cell,  1: alive cell
-field: list[list[int]] = [[0 for _ in range(fieldSize)] for _ in range(fieldSize)]  # field grid
+field: Optional[Board] = None  # field grid, made by configHandling (from the save file or a new one)
 steps: int = 0
-pygame.init()
-screen = pygame.display.set_mode(screenSize)
-pygame.display.set_caption("Conway's game of life")
-clock = pygame.time.Clock()
+simulation: Optional[Simulation] = None  # runs the generations in the background once the game is started
+screen: Optional["pygame.Surface"] = None  # the window, only opened by main() so the module can be imported without a display
+clock: Optional["pygame.time.Clock"] = None
+gridOverlay: Optional["renderer.GridOverlay"] = None
+uiText: Optional["renderer.TextCache"] = None  # the lines of displayUI, each one only rendered again when it changes
+profiler = Profiler(("events", "sim", "stats", "record", "grid", "cells", "ui", "flip"))  # F3 shows the timings of the game loop, F4/F5 dump them as csv/chrome trace
+profilerFont: Optional["pygame.font.Font"] = None
+cycleDetector = CycleDetector(cycleWindow)
+cycle: Optional[Cycle] = None  # the cycle the field is in (None until one is found)
+timeline: Optional[Timeline] = Timeline() if recordTimeline and np is not None else None  # every generation and edit, for rewinding and undo
+edited: bool = False  # the field was edited since the last entry of the timeline
+stats: Optional[StatsCollector] = StatsCollector()  # population, births, deaths and bounding box of the last generations (the sparkline)
 
 # helper functions
 def pixelPos2relPos(pos: tuple[int, int]) -> tuple[int, int]:  # returns the relative position on the grid given the pixel position on the screen
@@ -33,24 +59,100 @@ def relPos2pixelPos(pos: tuple[int, int]) -> tuple[int, int]:  # returns the pix
     return ((pos[0] * cellSize) + cameraPos[0], (pos[1] * cellSize) + cameraPos[1])
 
 def modifyCell(pos: list[int, int], state: Literal[1, 0]) -> None:
-    global fieldSize
-    field[pos[1]][pos[0]] = state
+    if field.bounded and not field.inside(pos[0], pos[1]):
+        return
+    if simulation is not None:  # the simulation thread owns the field while it's running
+        simulation.submit(editCell, pos[0], pos[1], state)
+    else:
+        editCell(pos[0], pos[1], state)
+
+def editCell(x: int, y: int, state: Literal[1, 0]) -> None:
+    global edited
+    if field.getCell(x, y) != state:
+        field.setCell(x, y, state)
+        edited = True
+        resetCycle()
+
+def clearField() -> None:
+    global edited
+    field.clear()
+    edited = True
+    resetCycle()
+    recordEdit()
+
+def recordEdit() -> None:  # the edits since the last entry become one entry (a whole stroke of the mouse can be undone at once)
+    global edited
+    if timeline is not None and field.inMemory and (edited or timeline.position < 0):
+        timeline.record(boardState(field), steps, "edit")
+    edited = False
+
+def seekTimeline(position: Optional[int]) -> None:  # puts the field into a recorded entry of the timeline
+    global steps
+    if timeline is None or position is None or not timeline.available(position):
+        return
+    loadBoardState(field, timeline.seek(position))
+    steps = timeline.generationOf(position)
+    resetCycle()
+
+def rewind() -> None:  # one entry back
+    if timeline is not None:
+        recordEdit()
+        seekTimeline(timeline.position - 1)
+
+def undo() -> None:
+    if timeline is not None:
+        recordEdit()
+        seekTimeline(timeline.undoTarget())
+
+def redo() -> None:
+    if timeline is not None:
+        seekTimeline(timeline.redoTarget())
+
+def rewindToStart() -> None:  # the oldest entry that wasnt evicted
+    if timeline is not None:
+        recordEdit()
+        seekTimeline(min(timeline.segments, default=None))
+
+def toggleTimeline() -> None:  # starts recording (the current field is the first entry) or drops everything recorded
+    global recordTimeline, timeline
+    recordTimeline = not recordTimeline
+    timeline = Timeline() if recordTimeline and np is not None else None
+    recordEdit()
+
+def resetCycle() -> None:  # the field was edited, so any cycle found so far is gone
+    global cycle
+    cycle = None
+    cycleDetector.reset()
+    if stats is not None:
+        stats.resync()
+
+def captureField() -> Board:  # the snapshot for the renderer, of a field on disk only the part on the screen
+    if not field.inMemory:
+        return field.copyWindow(*renderer.visibleWindow(cameraPos, cellSize, screenSize, (0, 0, field.size, field.size)))
+    return field.copy()
+
+def visibleBoard() -> Board:  # the board that should be drawn (the latest snapshot while the simulation is running)
+    if simulation is not None:
+        return simulation.snapshot
+    return field
 
 # visual functions
 def drawGrid() -> None:
-    global cellSize, fieldSize
-    endOfGrid = fieldSize * cellSize
-    for i in range(fieldSize + 1):
-        pygame.draw.line(screen, "gray", (i * cellSize + cameraPos[0], cameraPos[1]), (i * cellSize + cameraPos[0], endOfGrid + cameraPos[1]))
-        pygame.draw.line(screen, "gray", (cameraPos[0], i * cellSize + cameraPos[1]), (endOfGrid + cameraPos[0], i * cellSize + cameraPos[1]))
+    global cellSize, fieldSize, gridOverlay
+    if gridOverlay is None:
+        gridOverlay = renderer.GridOverlay()
+    bounds = (0, 0, fieldSize, fieldSize) if field.bounded else None  # the unbounded plane has lines everywhere
+    gridOverlay.draw(screen, cameraPos, cellSize, "gray", bounds)  # only redrawn after panning or zooming
 
 def drawField() -> None:
-    global cellSize, field
-    for y, row in enumerate(field):
-        for x, cell in enumerate(row):
-            if cell:
-                currentPos = relPos2pixelPos((x, y))
-                pygame.draw.rect(screen, "gray", pygame.Rect(currentPos[0], currentPos[1], cellSize, cellSize))
+    global cellSize
+    board = visibleBoard()
+    if np is None:
+        renderer.drawCells(screen, board.liveCells(), cameraPos, cellSize, "gray")
+        return
+    bounds = (0, 0, board.size, board.size) if board.bounded else None
+    x0, y0, x1, y1 = renderer.visibleWindow(cameraPos, cellSize, screen.get_size(), bounds)  # only the cells on screen
+    renderer.drawWindow(screen, board.window(x0, y0, x1, y1), x0, y0, cameraPos, cellSize, "gray")
 
 def zoom(scrollDelta: int) -> None:
     global cellSize, cameraPos
@@ -65,127 +167,277 @@ def zoom(scrollDelta: int) -> None:
         (newRelPos[1] - oldRelPos[1]) * cellSize + cameraPos[1]
     )
 
-def configHandling(filename: str = "config.ini", conf: list = []) -> None:
-    global steps, cameraPos, cellSize, panSpeed, field, screenSize, fieldSize, simulationSpeed, simulationSpeed
+def configHandling(filename: str = "life.sav", conf: dict = {}) -> None:  # loads the save file (conf empty) or saves conf and the field
+    global steps, cameraPos, cellSize, panSpeed, genSpeed, field, screenSize, fieldSize, engine, edge, rule
     if len(conf) == 0:
+        if not os.path.exists(filename):  # converting the old json config once
+            migrateJsonConfig("config.ini", filename, engine)
         try:
-            with open(filename, 'r') as f:
-                config = json.loads(f.read())
+            config, field = loadSnapshot(filename)
             cameraPos = config["cameraPos"]
             cellSize = config["cellSize"]
             panSpeed = config["panSpeed"]
-            field = config["field"]
+            genSpeed = config["genSpeed"]
             screenSize = config["screenSize"]
             fieldSize = config["fieldSize"]
             steps = config["steps"]
+            engine = config["engine"]
+            edge = config["edge"]
+            rule = field.rule.string
         except FileNotFoundError:  # if no file is found, create one
-            configHandling(conf=json.dumps({"steps": steps, "cameraPos": cameraPos, "panSpeed": panSpeed, "genSpeed": genSpeed, "cellSize": cellSize, "screenSize": screenSize, "fieldSize": fieldSize, "field": field}))
+            field = makeBoard(engine, fieldSize, edge, rule)
+            configHandling(filename, conf=currentConfig())
+        except SaveFormatError:  # a broken file (e.g. empty after a full disk) is kept as .bak and a new one is made
+            os.replace(filename, filename + ".bak")
+            field = makeBoard(engine, fieldSize, edge, rule)
+            configHandling(filename, conf=currentConfig())
     else:
-        open(filename, 'w').close()  # empty file; redundant
-        with open(filename, 'w') as f:
-            f.write(json.dumps(conf))
-
-def listNeighbors(x: int, y: int, tempfield) -> int:
-    alive = 0
-    for offsetY in [-1, 0, 1]:
-        for offsetX in [-1, 0, 1]:
-            if tempfield[y + offsetY][x + offsetX]:
-                alive += 1
-    return alive - tempfield[y][x]
+        saveSnapshot(filename, conf, field)
+
+def currentConfig() -> dict:  # everything that gets saved into the save file besides the field
+    return {"steps": steps, "cameraPos": cameraPos, "panSpeed": panSpeed, "genSpeed": genSpeed, "cellSize": cellSize, "screenSize": screenSize, "fieldSize": fieldSize, "engine": engine, "edge": edge, "rule": rule}
 
 def displayUI():
-    font = pygame.font.Font(pygame.font.get_default_font(), 30)
+    global uiText
+    if uiText is None:
+        uiText = renderer.TextCache(30)
     # displaying the genSpeed
-    text = font.render(f"genSpeed: {genSpeed}", True, "white")
-    rect = text.get_rect(topright=(1590, 10))
-    bg = pygame.Surface(text.get_size())
-    bg.fill((0, 0, 0))
-    screen.blit(bg, rect)
-    screen.blit(text, rect)
+    uiText.draw(screen, "genSpeed", f"genSpeed: {genSpeed}", "white", topright=(1590, 10))
+    # displaying the step size
+    uiText.draw(screen, "stepExponent", f"step: 2^{stepExponent}", "white", topright=(1590, 50))
     # displaying the amount of steps
-    text = font.render(f"steps: {steps}", True, "white")
-    rect = text.get_rect(topleft=(10, 10))
-    bg = pygame.Surface(text.get_size())
-    bg.fill((0, 0, 0))
-    screen.blit(bg, rect)
-    screen.blit(text, rect)
-
-def advanceGeneration() -> None:  # advances the field by one generation
+    gensPerSecond = f"  ({simulation.gensPerSecond:.0f} gens/s)" if simulation is not None else ""
+    uiText.draw(screen, "steps", f"steps: {steps}{gensPerSecond}", "white", topleft=(10, 10))
+    # displaying how many tiles were computed in the last generation (tiled engine only)
+    if hasattr(field, "activeTileCounts"):
+        uiText.draw(screen, "engine", f"active tiles: {field.lastActiveTiles}/{field.tilesPerSide ** 2}", "white", topleft=(10, 50))
+    # displaying how many cells the last generation looked at (incremental engine only)
+    if hasattr(field, "lastVisited"):
+        uiText.draw(screen, "engine", f"visited cells: {field.lastVisited}/{fieldSize ** 2}", "white", topleft=(10, 50))
+    # displaying how many tiles are in memory (disk engine only)
+    if hasattr(field, "residentBytes"):
+        uiText.draw(screen, "engine", f"resident tiles: {len(field.resident)} ({field.residentBytes / 2**20:.0f}/{field.budget / 2**20:.0f} MiB)  active: {field.lastActiveTiles}", "white", topleft=(10, 50))
+    # displaying how many chunks are allocated (chunked engine only)
+    if hasattr(field, "chunks"):
+        uiText.draw(screen, "engine", f"chunks: {len(field.chunks)}", "white", topleft=(10, 50))
+    # displaying the last error of the simulation thread (its traceback is printed)
+    if simulation is not None and simulation.error is not None:
+        uiText.draw(screen, "error", f"error: {simulation.error!r}", "red", topleft=(10, 90))
+    # displaying what happens when the field repeats itself and the cycle if one was found
+    cycleText = f"cycles: {cycleAction}"
+    if cycle is not None:
+        state = "stable" if cycle.period == 1 else f"period {cycle.period}"
+        cycleText += f"  ({state} since gen {cycle.start}{', replaying' if cycle.states else ''})"
+    uiText.draw(screen, "cycle", cycleText, "white", topright=(1590, 90))
+    # displaying the rule
+    name = next((name for name, string in presets.items() if string == rule), None)
+    uiText.draw(screen, "rule", f"rule: {rule}" + (f" ({name})" if name else ""), "white", topright=(1590, 130))
+    # displaying where in the timeline the field is and how much memory the timeline takes
+    if timeline is not None:
+        uiText.draw(screen, "timeline", f"timeline: {timeline.position + 1}/{timeline.length}  ({timeline.nbytes / 1024:.0f} KiB)", "white", topright=(1590, 170))
+    # displaying the statistics of the last generation and the population of the last ones as a sparkline
+    if stats is not None and stats.last is not None:
+        _, population, births, deaths, x0, y0, x1, y1, active = stats.last
+        changes = f"  +{births} -{deaths}" if births >= 0 else ""
+        uiText.draw(screen, "stats", f"population: {population}{changes}  box: {x1 - x0}x{y1 - y0}  active: {active}", "white", bottomleft=(10, screen.get_height() - 90))
+        renderer.drawSparkline(screen, stats.series("population"), pygame.Rect(10, screen.get_height() - 85, 400, 75), "white")
+
+def displayProfiler() -> None:
+    global profilerFont
+    if profilerFont is None:  # looking up a system font takes milliseconds
+        profilerFont = pygame.font.SysFont("monospace", 18)
+    gensPerSecond = simulation.gensPerSecond if simulation is not None else None
+    profiler.drawOverlay(screen, profilerFont, clock.get_fps(), gensPerSecond, visibleBoard().population)
+
+def dumpProfile(kind: str) -> None:  # writes the collected samples next to the save file
+    filename = f"profile-{strftime('%Y%m%d-%H%M%S')}"
+    if kind == "csv":
+        profiler.dumpCSV(filename + ".csv")
+    else:
+        profiler.dumpChromeTrace(filename + ".json")
+
+def advanceGeneration() -> int:  # advances the field by one generation (2^stepExponent to be precise)
     global field, steps
-    tempField = copy.deepcopy(field)  # so that the new cells dont interfere w/ the old ones
-    for y, row in enumerate(tempField):
-        for x, _ in enumerate(row):
+    recordEdit()
+    if cycle is not None and cycle.states:  # replaying the detected cycle: any amount of generations costs the same
+        gens = 1 << stepExponent
+        replayCycle(steps + gens)
+        steps += gens
+    else:
+        with profiler.phase("sim"):
+            gens = field.jump(stepExponent) if stepExponent else field.step()
+        steps += gens
+        if cycleAction != "off" and field.inMemory:
+            detectCycle()
+    if stats is not None:
+        with profiler.phase("stats"):
+            stats.observe(field, steps, gens)
+    if timeline is not None and field.inMemory:
+        with profiler.phase("record"):
+            timeline.record(boardState(field), steps)
+    return gens
 
-            if x == 0 or x == fieldSize - 1 or y == 0 or y == fieldSize - 1:  # skipping the cell if its on the edge of the grid
-                continue
+def detectCycle() -> None:
+    global cycle
+    found = cycleDetector.observe(field, steps)
+    if found is None or cycle is not None:
+        return
+    cycle = found
+    if cycleAction == "fastforward" and recordStates(field, cycle):
+        return
+    if simulation is not None:  # pausing (also if the period is too long to replay)
+        simulation.setRunning(False)
 
-            neighbors = listNeighbors(x, y, tempField)
+def replayCycle(generation: int) -> None:  # puts the field into the state it has at `generation`
+    global field
+    index, current = cycle.index(generation), cycle.index(steps)
+    if index == current:
+        return
+    state = cycle.states[index]
+    if isinstance(state, bytes):
+        field.loadBits(state)
+    elif field.bounded:  # the field of a rule with dying states
+        field.clear()
+        field.loadWindow(0, 0, state)
+    else:
+        field = state.copy()
+
+def changeCycleAction() -> None:  # off -> pause -> fastforward -> off
+    global cycleAction
+    cycleAction = {"off": "pause", "pause": "fastforward", "fastforward": "off"}[cycleAction]
+    resetCycle()
+
+def changeRule() -> None:  # the next of the preset rules that the engine can run
+    global rule
+    strings = list(presets.values())
+    start = strings.index(rule) if rule in strings else -1
+    for offset in range(1, len(strings) + 1):
+        candidate = strings[(start + offset) % len(strings)]
+        try:
+            field.setRule(candidate)
+        except ValueError:  # e.g. Larger than Life on the chunked plane
+            continue
+        rule = field.rule.string
+        resetCycle()
+        return
 
-            if tempField[y][x]:  # if cell is alive
-                if neighbors <= 1 or neighbors >= 4:
-                    field[y][x] = 0
-            else:
-                if neighbors == 3:
-                    field[y][x] = 1
-    steps += 1
+def updateGenSpeed() -> None:  # genSpeed 10 runs unthrottled
+    if simulation is not None:
+        simulation.interval = (10 - genSpeed) * 0.1
+
+def importDisplay() -> None:  # pygame (~140 ms) is only imported for the window, python -m life run and importing life dont need it
+    global pygame, renderer
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    import pygame, renderer
+
+def openWindow() -> None:
+    global screen, clock
+    importDisplay()
+    pygame.display.init()  # only the subsystems the game uses (pygame.init would also start audio, joysticks, ...)
+    pygame.font.init()
+    screen = pygame.display.set_mode(screenSize)
+    pygame.display.set_caption("Conway's game of life")
+    clock = pygame.time.Clock()
 
 def main() -> None:
-    global cameraPos, cellSize, panSpeed, genSpeed, field
+    global cameraPos, cellSize, panSpeed, genSpeed, field, stepExponent, simulation
     configHandling()
-    shouldAdvanceCon = False # should advance generatios continously
+    openWindow()
+    recordEdit()  # the loaded field is the first entry of the timeline
     shouldDrawGrid = True
+    simulation = Simulation(advanceGeneration, captureField)
+    updateGenSpeed()
+    simulation.start()
 
     while True:
         delta = pygame.mouse.get_rel()  # needs to be calculatd every iteration in order to work
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                configHandling(conf={"steps": steps, "cameraPos": cameraPos, "panSpeed": panSpeed, "genSpeed": genSpeed, "cellSize": cellSize, "screenSize": screenSize, "fieldSize": fieldSize, "field": field})
-                pygame.quit()
-                exit()
-            # creating a cell
-            if pygame.mouse.get_pressed() == (True, False, False):  # creating new cell
-                mPos = pygame.mouse.get_pos()
-                modifyCell(pixelPos2relPos(mPos), 1)
-            elif pygame.mouse.get_pressed() == (False, False, True):  # deleting a cell
-                mPos = pygame.mouse.get_pos()
-                modifyCell(pixelPos2relPos(mPos), 0)
-            elif pygame.mouse.get_pressed() == (False, True, False):  # panning
-                # panning with the middle mouse button
-                cameraPos = (cameraPos[0] + panSpeed * delta[0], cameraPos[1] + panSpeed * delta[1])
-            if event.type == pygame.MOUSEWHEEL:  # zooming
-                zoom(event.y)
-
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    advanceGeneration()
-                elif event.key == pygame.K_RETURN:
-                    shouldAdvanceCon = not shouldAdvanceCon
-                    t1 = getTime()
-                elif event.key == pygame.K_LCTRL:
-                    shouldDrawGrid = not shouldDrawGrid
-                elif event.key == pygame.K_RIGHT or event.key == pygame.K_UP:
-                    genSpeed = genSpeed + 1 if genSpeed != 10 else 1
-                elif event.key == pygame.K_LEFT or event.key == pygame.K_DOWN:
-                    genSpeed = genSpeed - 1 if genSpeed != 1 else 10
-                elif event.key == pygame.K_c:
-                    field = [[0 for _ in range(fieldSize)] for _ in range(fieldSize)]
+        with profiler.phase("events"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    simulation.stop()
+                    configHandling(conf=currentConfig())
+                    pygame.quit()
+                    exit()
+                # creating a cell
+                if pygame.mouse.get_pressed() == (True, False, False):  # creating new cell
+                    mPos = pygame.mouse.get_pos()
+                    modifyCell(pixelPos2relPos(mPos), 1)
+                elif pygame.mouse.get_pressed() == (False, False, True):  # deleting a cell
+                    mPos = pygame.mouse.get_pos()
+                    modifyCell(pixelPos2relPos(mPos), 0)
+                elif pygame.mouse.get_pressed() == (False, True, False):  # panning
+                    # panning with the middle mouse button
+                    cameraPos = (cameraPos[0] + panSpeed * delta[0], cameraPos[1] + panSpeed * delta[1])
+                    if not field.inMemory:  # the snapshot only has the cells that were on screen
+                        simulation.submit(lambda: None)
+                if event.type == pygame.MOUSEWHEEL:  # zooming
+                    zoom(event.y)
+                    if not field.inMemory:
+                        simulation.submit(lambda: None)
+                if event.type == pygame.MOUSEBUTTONUP and event.button in (1, 3):  # the end of a stroke
+                    simulation.submit(recordEdit)
 
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_SPACE:
+                        simulation.stepOnce()
+                    elif event.key == pygame.K_RETURN:
+                        simulation.setRunning(not simulation.running)
+                    elif event.key == pygame.K_LCTRL:
+                        shouldDrawGrid = not shouldDrawGrid
+                    elif event.key == pygame.K_RIGHT or event.key == pygame.K_UP:
+                        genSpeed = genSpeed + 1 if genSpeed != 10 else 1
+                        updateGenSpeed()
+                    elif event.key == pygame.K_LEFT or event.key == pygame.K_DOWN:
+                        genSpeed = genSpeed - 1 if genSpeed != 1 else 10
+                        updateGenSpeed()
+                    elif event.key == pygame.K_PAGEUP:  # only engines that jump faster than they step (hashlife) go past 2^0
+                        stepExponent = min(stepExponent + 1, 60 if canJump(field) else 0)
+                    elif event.key == pygame.K_PAGEDOWN:
+                        stepExponent = max(stepExponent - 1, 0)
+                    elif event.key == pygame.K_c:
+                        simulation.submit(clearField)
+                    elif event.key == pygame.K_h:
+                        simulation.submit(changeCycleAction)
+                    elif event.key == pygame.K_r:
+                        simulation.submit(changeRule)
+                    elif event.key == pygame.K_BACKSPACE:
+                        simulation.submit(rewind)
+                    elif event.key == pygame.K_HOME:
+                        simulation.submit(rewindToStart)
+                    elif event.key == pygame.K_z:
+                        simulation.submit(undo)
+                    elif event.key == pygame.K_y:
+                        simulation.submit(redo)
+                    elif event.key == pygame.K_t:
+                        simulation.submit(toggleTimeline)
+                    elif event.key == pygame.K_F3:
+                        profiler.toggle()
+                    elif event.key == pygame.K_F4:
+                        dumpProfile("csv")
+                    elif event.key == pygame.K_F5:
+                        dumpProfile("trace")
 
         # visual stuff
         screen.fill(pygame.Color("black"))
 
-        if shouldAdvanceCon:
-            if getTime() - t1 > (10 - genSpeed) * 0.1:
-                advanceGeneration()
-                t1 = getTime()
         if shouldDrawGrid:
-            drawGrid()
-        drawField()
-        displayUI()
+            with profiler.phase("grid"):
+                drawGrid()
+        with profiler.phase("cells"):
+            drawField()
+        with profiler.phase("ui"):
+            displayUI()
+            if profiler.enabled:
+                displayProfiler()
 
-        pygame.display.update()
+        with profiler.phase("flip"):
+            pygame.display.update()
         clock.tick(60)
 
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:2] in (["run"], ["batch"]):  # python -m life run/batch ... runs without a window (see headless.py)
+        import headless
+        headless.main(sys.argv[1:])
+    else:
+        main()
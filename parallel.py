@@ -0,0 +1,75 @@
+from typing import Optional  # more typehints
+from multiprocessing import Pool, shared_memory
+import os, weakref
+from engines import NumpyBoard, Edge, np
+from rules import Rule, parseRule, stepCells, aliveCells
+
+# NumpyBoard that steps horizontal stripes of the field on a pool of worker processes.
+# Both generations live in shared memory, so nothing is pickled: a worker reads its stripe
+# plus the one row halo above and below from the current buffer and writes the next one.
+
+workerBuffers: list = []  # (per worker process) the two generations as numpy arrays
+workerMemory: list = []  # keeps the shared memory of the worker process attached
+
+def attachWorker(names: tuple[str, str], size: int) -> None:
+    global workerBuffers, workerMemory
+    workerMemory = [shared_memory.SharedMemory(name=name) for name in names]
+    workerBuffers = [np.ndarray((size, size), dtype=np.uint8, buffer=memory.buf) for memory in workerMemory]
+
+def stepRows(cells: "np.ndarray", y0: int, y1: int, edge: Edge, rule: Rule) -> "np.ndarray":  # the rows y0 to y1 one generation later
+    size = cells.shape[0]
+    if edge == "wrap":
+        region = np.pad(cells[np.arange(y0 - 1, y1 + 1) % size], ((0, 0), (1, 1)), mode="wrap")
+    else:
+        region = np.pad(cells[max(y0 - 1, 0):y1 + 1], ((int(y0 == 0), int(y1 == size)), (1, 1)))
+    old = cells[y0:y1]
+    new = stepCells(aliveCells(region, rule), old, rule)
+    if edge == "frozen":
+        new[:, 0], new[:, -1] = old[:, 0], old[:, -1]
+        if y0 == 0: new[0] = old[0]
+        if y1 == size: new[-1] = old[-1]
+    return new
+
+def stepStripe(args: tuple[int, int, int, str, str]) -> None:  # runs in the worker processes
+    current, y0, y1, edge, rule = args  # the rule as its string (parseRule caches the tables per worker)
+    workerBuffers[1 - current][y0:y1] = stepRows(workerBuffers[current], y0, y1, edge, parseRule(rule))
+
+
+class ParallelBoard(NumpyBoard):
+    name = "parallel"
+    ruleKinds = frozenset({"simple", "generations"})  # the halo of a stripe is one row
+
+    def __init__(self, size: int, edge: Edge = "frozen", workers: Optional[int] = None) -> None:
+        self.memory = [shared_memory.SharedMemory(create=True, size=size * size) for _ in range(2)]
+        self.buffers = [np.ndarray((size, size), dtype=np.uint8, buffer=memory.buf) for memory in self.memory]
+        self.current = 0
+        super().__init__(size, edge)
+        self.workers = workers or os.cpu_count() or 1
+        bounds = [size * i // self.workers for i in range(self.workers + 1)]
+        self.stripes = [(bounds[i], bounds[i + 1]) for i in range(self.workers) if bounds[i] < bounds[i + 1]]
+        self.pool = Pool(self.workers, initializer=attachWorker, initargs=((self.memory[0].name, self.memory[1].name), size))
+        self.finalizer = weakref.finalize(self, ParallelBoard.release, self.pool, self.memory)
+
+    @property
+    def cells(self) -> "np.ndarray":
+        return self.buffers[self.current]
+
+    @cells.setter
+    def cells(self, value: "np.ndarray") -> None:  # new fields are copied into the shared buffer
+        self.buffers[self.current][:] = value
+
+    def step(self) -> int:
+        self.pool.map(stepStripe, [(self.current, y0, y1, self.edge, self.rule.string) for y0, y1 in self.stripes])
+        self.current = 1 - self.current
+        return 1
+
+    @staticmethod
+    def release(pool, memory: list) -> None:
+        pool.terminate()
+        for block in memory:
+            block.close()
+            block.unlink()
+
+    def close(self) -> None:  # stops the workers and frees the shared memory
+        self.buffers = []
+        self.finalizer()
@@ -0,0 +1,220 @@
+from typing import Iterable, Iterator, TextIO  # more typehints
+import os, re
+from hashlife import Hashlife
+
+# readers and writers for the common pattern formats:
+#   RLE (.rle), Life 1.06 (.lif/.life), plaintext (.cells), Golly macrocell (.mc)
+#   and the old saved_cells.txt of Conways_game_of_life.py (one "(x, y)" per line)
+# the readers read the file line by line and yield runs of alive cells (x, y, length) lazily,
+# so a pattern never has to be in memory as a whole (besides the node table of a macrocell file)
+
+Run = tuple[int, int, int]  # (x, y, length): `length` alive cells from (x, y) to the right
+
+def cellsFromRuns(runs: Iterable[Run]) -> Iterator[tuple[int, int]]:
+    for x, y, length in runs:
+        for i in range(length):
+            yield (x + i, y)
+
+# readers
+def readRLE(lines: Iterable[str]) -> Iterator[Run]:
+    originX = originY = 0
+    x = y = 0
+    count = ""
+    for line in lines:
+        line = line.strip()
+        position = re.match(r"#CXRLE.*Pos=(-?\d+),(-?\d+)", line)
+        if position:  # golly's extension for where the pattern is placed
+            originX, originY = int(position.group(1)), int(position.group(2))
+            x, y = originX, originY
+            continue
+        if not line or line.startswith("#") or (line.startswith("x") and "=" in line):  # comments and the header
+            continue
+        for token in re.finditer(r"\d+|[^\d\s]", line):
+            text = token.group()
+            if text.isdigit():
+                count += text
+                continue
+            n = int(count) if count else 1
+            count = ""
+            if text == "!":
+                return
+            if text == "$":
+                x = originX
+                y += n
+            elif text in "b.":
+                x += n
+            else:  # "o" and the states of multi state patterns
+                yield (x, y, n)
+                x += n
+
+def readLife106(lines: Iterable[str]) -> Iterator[Run]:
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            x, y = line.split()
+            yield (int(x), int(y), 1)
+
+def readPlaintext(lines: Iterable[str]) -> Iterator[Run]:
+    y = 0
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line.startswith("!"):
+            continue
+        for match in re.finditer(r"[O*]+", line):
+            yield (match.start(), y, match.end() - match.start())
+        y += 1
+
+def readMacrocell(lines: Iterable[str]) -> Iterator[Run]:
+    # every line is a node: either an 8x8 leaf ("." dead, "*" alive, "$" end of row)
+    # or "level nw ne sw se" with the indices of earlier nodes (0 is the empty node)
+    nodes: list[tuple[int, tuple]] = [(0, ())]  # (level, children) or (3, alive cells) for leaves
+    leaves: set[int] = set()
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#") or line.startswith("["):
+            continue
+        if line[0] in ".*$":
+            leaf = []
+            for y, row in enumerate(line.split("$")):
+                leaf.extend((x, y) for x, c in enumerate(row) if c == "*")
+            leaves.add(len(nodes))
+            nodes.append((3, tuple(leaf)))
+        else:
+            level, *children = map(int, line.split())
+            nodes.append((level, tuple(children)))
+    if len(nodes) == 1:
+        return
+    rootLevel = nodes[-1][0]
+    half = 1 << (rootLevel - 1)
+    stack = [(len(nodes) - 1, -half, -half)]  # the root is centred around (0, 0) like in golly
+    while stack:
+        index, x, y = stack.pop()
+        if index == 0:
+            continue
+        level, content = nodes[index]
+        if index in leaves:
+            for cellX, cellY in content:
+                yield (x + cellX, y + cellY, 1)
+            continue
+        size = 1 << (level - 1)
+        nw, ne, sw, se = content
+        stack.extend(((se, x + size, y + size), (sw, x, y + size), (ne, x + size, y), (nw, x, y)))
+
+def readLegacy(lines: Iterable[str]) -> Iterator[Run]:  # the old saved_cells.txt format of Conways_game_of_life.py
+    for line in lines:
+        x, comma, y = line.strip().strip("()").partition(",")
+        if comma:
+            yield (int(x), int(y), 1)
+
+readers = {".rle": readRLE, ".lif": readLife106, ".life": readLife106, ".cells": readPlaintext, ".mc": readMacrocell, ".txt": readLegacy}
+
+def readPattern(path: str) -> Iterator[Run]:  # picks the reader from the file extension
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in readers:
+        raise ValueError(f"unknown pattern format: {extension!r} (known: {', '.join(readers)})")
+    with open(path, "r") as f:
+        if extension == ".lif" or extension == ".life":  # .lif is Life 1.06 only if it says so, otherwise its plaintext-like 1.05
+            first = f.readline()
+            if not first.startswith("#Life 1.06"):
+                raise ValueError(f"{path}: only Life 1.06 is supported")
+        yield from readers[extension](f)
+
+# writers
+def rowsOf(cells: Iterable[tuple[int, int]]) -> tuple[dict[int, list[int]], tuple[int, int, int, int]]:
+    rows: dict[int, list[int]] = {}
+    for x, y in cells:
+        rows.setdefault(y, []).append(x)
+    if not rows:
+        return rows, (0, 0, 0, 0)
+    minX = min(min(xs) for xs in rows.values())
+    maxX = max(max(xs) for xs in rows.values())
+    return rows, (minX, min(rows), maxX, max(rows))
+
+def writeRLE(f: TextIO, cells: Iterable[tuple[int, int]], rule: str = "B3/S23") -> None:
+    rows, (minX, minY, maxX, maxY) = rowsOf(cells)
+    f.write(f"#CXRLE Pos={minX},{minY}\n")  # position of the top left corner, so the pattern loads at the same place
+    f.write(f"x = {maxX - minX + 1 if rows else 0}, y = {maxY - minY + 1 if rows else 0}, rule = {rule}\n")
+    line = ""
+    def emit(token: str) -> None:
+        nonlocal line
+        if len(line) + len(token) > 70:
+            f.write(line + "\n")
+            line = ""
+        line += token
+    lastY = minY
+    for y in sorted(rows):
+        if y != lastY:
+            gap = y - lastY
+            emit(f"{gap if gap > 1 else ''}$")
+            lastY = y
+        x = minX
+        xs = sorted(rows[y])
+        i = 0
+        while i < len(xs):
+            start = xs[i]
+            while i + 1 < len(xs) and xs[i + 1] == xs[i] + 1:
+                i += 1
+            length = xs[i] - start + 1
+            if start > x:
+                emit(f"{start - x if start - x > 1 else ''}b")
+            emit(f"{length if length > 1 else ''}o")
+            x = xs[i] + 1
+            i += 1
+    emit("!")
+    f.write(line + "\n")
+
+def writeLife106(f: TextIO, cells: Iterable[tuple[int, int]]) -> None:  # streams, no sorting needed
+    f.write("#Life 1.06\n")
+    for x, y in cells:
+        f.write(f"{x} {y}\n")
+
+def writePlaintext(f: TextIO, cells: Iterable[tuple[int, int]]) -> None:  # positions are relative to the bounding box
+    rows, (minX, minY, maxX, maxY) = rowsOf(cells)
+    if not rows:
+        return
+    for y in range(minY, maxY + 1):
+        alive = set(rows.get(y, ()))
+        f.write("".join("O" if x in alive else "." for x in range(minX, max(alive) + 1)) if alive else "")
+        f.write("\n")
+
+def writeMacrocell(f: TextIO, cells: Iterable[tuple[int, int]]) -> None:  # the hashlife quadtree is exactly what the format stores
+    universe = Hashlife.fromCells(cells)  # the root of a fresh universe is centred around (0, 0) like golly expects
+    f.write("[M2] (conways-game-of-life)\n#R B3/S23\n")
+    indices: dict = {}
+    stack = [(universe.root, False)]
+    while stack:  # post order, children are written before their parents
+        node, childrenDone = stack.pop()
+        if node.population == 0 or node in indices:
+            continue
+        if node.level == 3:
+            rows = []
+            for y in range(8):
+                rows.append("".join("*" if nodeCell(node, x, y) else "." for x in range(8)).rstrip("."))
+            f.write("$".join(rows).rstrip("$") + "$\n")
+            indices[node] = len(indices) + 1
+        elif childrenDone:
+            children = [indices.get(child, 0) if child.population else 0 for child in (node.nw, node.ne, node.sw, node.se)]
+            f.write(f"{node.level} {' '.join(map(str, children))}\n")
+            indices[node] = len(indices) + 1
+        else:
+            stack.append((node, True))
+            stack.extend((child, False) for child in (node.se, node.sw, node.ne, node.nw))
+
+def nodeCell(node, x: int, y: int) -> int:  # the cell (x, y) of a hashlife node
+    while node.level > 0:
+        half = 1 << (node.level - 1)
+        if y < half:
+            node = node.nw if x < half else node.ne
+        else:
+            node = node.sw if x < half else node.se
+        x, y = x % half, y % half
+    return node.population
+
+writers = {".rle": writeRLE, ".lif": writeLife106, ".life": writeLife106, ".cells": writePlaintext, ".mc": writeMacrocell}
+
+def writePattern(path: str, cells: Iterable[tuple[int, int]]) -> None:  # picks the writer from the file extension
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in writers:
+        raise ValueError(f"unknown pattern format: {extension!r} (known: {', '.join(writers)})")
+    with open(path, "w") as f:
+        writers[extension](f, cells)
@@ -0,0 +1,118 @@
+from typing import TYPE_CHECKING, Iterable, Optional  # more typehints
+from collections import deque
+from time import perf_counter
+import json, threading
+
+if TYPE_CHECKING:  # the overlay draws with what it is given, the timers dont need pygame
+    import pygame
+
+# per phase timers for the game loop: every phase keeps its last `samples` durations in a ring buffer
+# (the rolling histogram the percentiles come from), and every sample is also kept as a trace event
+# that can be dumped to csv or to the chrome trace format (chrome://tracing, perfetto).
+# While disabled a timer only checks one flag, so it can stay in the hot paths.
+
+def quantilesOf(durations: list[float], quantiles: Iterable[float]) -> list[float]:  # of sorted durations, 0.0 without any
+    if not durations:
+        return [0.0 for _ in quantiles]
+    return [durations[min(int(q * len(durations)), len(durations) - 1)] for q in quantiles]
+
+
+class PhaseTimer:  # context manager for one phase, created once per phase and reused
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "Profiler", name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        if self.profiler.enabled:
+            self.start = perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        if self.profiler.enabled and self.start:
+            self.profiler.record(self.name, self.start, perf_counter() - self.start)
+            self.start = 0.0
+
+
+class Profiler:
+    def __init__(self, phases: Iterable[str] = (), samples: int = 600, traceEvents: int = 100_000) -> None:
+        self.enabled = False
+        self.samples = samples
+        self.durations: dict[str, deque[float]] = {}  # phase -> its last durations in seconds
+        self.trace: deque[tuple[str, float, float, int]] = deque(maxlen=traceEvents)  # (phase, start, duration, thread id)
+        self.timers: dict[str, PhaseTimer] = {}
+        self.lock = threading.Lock()  # the sim phases are recorded on their own thread while the ui reads the samples
+        self.origin = perf_counter()
+        for name in phases:  # known up front, so no thread adds phases while the overlay goes through them
+            self.phase(name)
+
+    def phase(self, name: str) -> PhaseTimer:  # with profiler.phase("grid"): ...
+        timer = self.timers.get(name)
+        if timer is None:
+            with self.lock:
+                timer = self.timers.setdefault(name, PhaseTimer(self, name))
+                self.durations.setdefault(name, deque(maxlen=self.samples))
+        return timer
+
+    def record(self, name: str, start: float, duration: float) -> None:
+        with self.lock:
+            self.durations[name].append(duration)
+            self.trace.append((name, start, duration, threading.get_ident()))
+
+    def toggle(self) -> None:
+        self.enabled = not self.enabled
+        if self.enabled:  # old samples would mix two different sessions
+            self.reset()
+
+    def reset(self) -> None:
+        with self.lock:
+            for durations in self.durations.values():
+                durations.clear()
+            self.trace.clear()
+            self.origin = perf_counter()
+
+    def durationsCopy(self) -> dict[str, list[float]]:  # phase -> its last durations, safe to go through on any thread
+        with self.lock:
+            return {name: list(durations) for name, durations in self.durations.items()}
+
+    def traceCopy(self) -> list[tuple[str, float, float, int]]:
+        with self.lock:
+            return list(self.trace)
+
+    def percentiles(self, name: str, *quantiles: float) -> list[float]:  # in seconds, 0.0 without samples
+        with self.lock:
+            durations = list(self.durations.get(name, ()))
+        return quantilesOf(sorted(durations), quantiles)
+
+    # dumps
+    def dumpCSV(self, filename: str) -> None:
+        with open(filename, "w") as f:
+            f.write("phase,start_ms,duration_ms,thread\n")
+            for name, start, duration, thread in self.traceCopy():
+                f.write(f"{name},{(start - self.origin) * 1000:.4f},{duration * 1000:.4f},{thread}\n")
+
+    def dumpChromeTrace(self, filename: str) -> None:  # complete events ("X") in microseconds
+        events = [{"name": name, "ph": "X", "ts": (start - self.origin) * 1e6, "dur": duration * 1e6, "pid": 0, "tid": thread}
+                  for name, start, duration, thread in self.traceCopy()]
+        with open(filename, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    # overlay
+    def overlayLines(self, fps: float, gensPerSecond: Optional[float], population: Optional[int]) -> list[str]:
+        lines = [f"fps: {fps:.0f}   gens/s: {gensPerSecond or 0:.0f}   cells: {population if population is not None else '-'}",
+                 f"{'phase':<8}{'p50 ms':>9}{'p99 ms':>9}"]
+        for name, durations in self.durationsCopy().items():
+            p50, p99 = quantilesOf(sorted(durations), (0.5, 0.99))
+            lines.append(f"{name:<8}{p50 * 1000:>9.2f}{p99 * 1000:>9.2f}")
+        return lines
+
+    def drawOverlay(self, screen: "pygame.Surface", font: "pygame.font.Font", fps: float,
+                    gensPerSecond: Optional[float] = None, population: Optional[int] = None) -> None:  # bottom left corner
+        lines = self.overlayLines(fps, gensPerSecond, population)
+        height = font.get_linesize()
+        y = screen.get_height() - 10 - height * len(lines)
+        for line in lines:
+            text = font.render(line, True, "white", "black")
+            screen.blit(text, (10, y))
+            y += height
@@ -0,0 +1,113 @@
+from typing import TYPE_CHECKING, Iterable, Optional  # more typehints
+import math
+from engines import np
+
+if TYPE_CHECKING:  # pygame is only imported by the functions that draw, so visibleWindow & co. work without it
+    import pygame
+
+# draws only the part of the field that is on screen: the visible cells are written into a small
+# surface with one pixel per cell, which is then scaled up to the cell size in one go.
+# The grid is drawn onto its own surface that is only redrawn when the camera or the zoom changes.
+# Text is cached the same way: a line of the ui is only rendered again when it says something else.
+
+def visibleWindow(cameraPos: tuple[float, float], cellSize: int, screenSize: tuple[int, int],
+                  bounds: Optional[tuple[int, int, int, int]] = None) -> tuple[int, int, int, int]:  # (x0, y0, x1, y1) of the visible cells
+    x0 = math.floor(-cameraPos[0] / cellSize)
+    y0 = math.floor(-cameraPos[1] / cellSize)
+    x1 = math.ceil((screenSize[0] - cameraPos[0]) / cellSize)
+    y1 = math.ceil((screenSize[1] - cameraPos[1]) / cellSize)
+    if bounds is not None:
+        x0, y0, x1, y1 = max(x0, bounds[0]), max(y0, bounds[1]), min(x1, bounds[2]), min(y1, bounds[3])
+    return (x0, y0, max(x0, x1), max(y0, y1))
+
+def windowFromCells(cells: Iterable[tuple[int, int]], x0: int, y0: int, x1: int, y1: int) -> "np.ndarray":  # for sparse cell lists
+    out = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+    positions = np.fromiter((c for cell in cells for c in cell), dtype=np.int64).reshape(-1, 2)
+    if len(positions):
+        xs, ys = positions[:, 0] - x0, positions[:, 1] - y0
+        inside = (xs >= 0) & (xs < x1 - x0) & (ys >= 0) & (ys < y1 - y0)
+        out[ys[inside], xs[inside]] = 1
+    return out
+
+def drawWindow(screen: "pygame.Surface", window: "np.ndarray", x0: int, y0: int,
+               cameraPos: tuple[float, float], cellSize: int, color) -> None:  # draws a window of cells (window[y][x]) at its place
+    import pygame
+    h, w = window.shape
+    if w == 0 or h == 0:
+        return
+    small = pygame.Surface((w, h), depth=32)
+    small.set_colorkey((0, 0, 0))  # dead cells are transparent so the grid stays visible
+    pygame.surfarray.blit_array(small, (window.T != 0).astype(np.uint32) * small.map_rgb(pygame.Color(color)))
+    screen.blit(pygame.transform.scale(small, (w * cellSize, h * cellSize)), (x0 * cellSize + cameraPos[0], y0 * cellSize + cameraPos[1]))
+
+def drawCells(screen: "pygame.Surface", cells: Iterable[tuple[int, int]], cameraPos: tuple[float, float], cellSize: int, color) -> None:
+    # fallback without numpy: one rect per visible cell
+    import pygame
+    width, height = screen.get_size()
+    for x, y in cells:
+        px, py = x * cellSize + cameraPos[0], y * cellSize + cameraPos[1]
+        if -cellSize < px < width and -cellSize < py < height:
+            pygame.draw.rect(screen, color, pygame.Rect(px, py, cellSize, cellSize))
+
+def drawSparkline(screen: "pygame.Surface", values: list[int], rect: "pygame.Rect", color) -> None:  # values as a line, scaled to the rect
+    import pygame
+    if len(values) < 2:
+        return
+    low, high = min(values), max(values)
+    scaleX, scaleY = (rect.width - 1) / (len(values) - 1), (rect.height - 1) / (high - low or 1)
+    pygame.draw.rect(screen, (0, 0, 0), rect)
+    pygame.draw.lines(screen, color, False, [(rect.left + i * scaleX, rect.bottom - 1 - (value - low) * scaleY) for i, value in enumerate(values)])
+
+
+class GridOverlay:  # the grid lines, cached on a transparent surface
+    def __init__(self) -> None:
+        self.surface: Optional["pygame.Surface"] = None
+        self.key: Optional[tuple] = None
+
+    def draw(self, screen: "pygame.Surface", cameraPos: tuple[float, float], cellSize: int, color,
+             bounds: Optional[tuple[int, int, int, int]] = None) -> None:
+        key = (cameraPos[0], cameraPos[1], cellSize, str(color), bounds, screen.get_size())
+        if key != self.key:
+            self.surface = self.render(screen.get_size(), cameraPos, cellSize, color, bounds)
+            self.key = key
+        screen.blit(self.surface, (0, 0))
+
+    def render(self, screenSize: tuple[int, int], cameraPos: tuple[float, float], cellSize: int, color,
+               bounds: Optional[tuple[int, int, int, int]]) -> "pygame.Surface":
+        import pygame
+        surface = pygame.Surface(screenSize, depth=32)
+        surface.set_colorkey((0, 0, 0))
+        x0, y0, x1, y1 = visibleWindow(cameraPos, cellSize, screenSize)
+        left, top, right, bottom = 0, 0, screenSize[0], screenSize[1]
+        if bounds is not None:  # only the lines of the field
+            x0, y0, x1, y1 = max(x0, bounds[0]), max(y0, bounds[1]), min(x1, bounds[2]), min(y1, bounds[3])
+            left, top = bounds[0] * cellSize + cameraPos[0], bounds[1] * cellSize + cameraPos[1]
+            right, bottom = bounds[2] * cellSize + cameraPos[0], bounds[3] * cellSize + cameraPos[1]
+        for x in range(x0, x1 + 1):
+            pygame.draw.line(surface, color, (x * cellSize + cameraPos[0], top), (x * cellSize + cameraPos[0], bottom))
+        for y in range(y0, y1 + 1):
+            pygame.draw.line(surface, color, (left, y * cellSize + cameraPos[1]), (right, y * cellSize + cameraPos[1]))
+        return surface
+
+
+class TextCache:  # rendered lines of text, a line is only rendered again when its text or color changes
+    def __init__(self, size: int, name: Optional[str] = None, background="black") -> None:
+        self.size = size
+        self.name = name  # font file, None: the default font of pygame
+        self.background = background  # None: transparent
+        self.font: Optional["pygame.font.Font"] = None  # loaded with the first line (loading takes milliseconds)
+        self.lines: dict[str, tuple[str, str, "pygame.Surface"]] = {}  # slot -> (text, color, rendered text)
+
+    def draw(self, screen: "pygame.Surface", slot: str, text: str, color, **anchor) -> "pygame.Rect":
+        # draws the text of a slot (e.g. "steps"), anchor like Rect: topleft=(10, 10)
+        line = self.lines.get(slot)
+        if line is None or line[0] != text or line[1] != str(color):
+            import pygame
+            if self.font is None:
+                if not pygame.font.get_init():
+                    pygame.font.init()
+                self.font = pygame.font.Font(self.name or pygame.font.get_default_font(), self.size)
+            line = self.lines[slot] = (text, str(color), self.font.render(text, True, color, self.background))
+        rect = line[2].get_rect(**anchor)
+        screen.blit(line[2], rect)
+        return rect
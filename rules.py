@@ -0,0 +1,194 @@
+from typing import Iterable, Optional  # more typehints
+from functools import lru_cache
+import re
+
+try:
+    import numpy as np
+except ImportError:  # the tables are plain lists too, so the list engine works without numpy
+    np = None
+
+# rulestrings and their lookup tables. Supported notations:
+#   B/S:               "B3/S23" (life), "B36/S23" (highlife), "B3678/S34678" (day & night), "B2/S" (seeds)
+#   S/B:               "23/3"
+#   Generations:       "B2/S/C3" or "/2/3" (brian's brain): alive cells that dont survive go through states 2 ... C-1 before dying
+#   Larger than Life:  "R5,C0,M1,S34..58,B34..45,NM" (bosco): radius R, the middle cell counts if M1, N is M(oore) or N (von Neumann)
+# every rule is compiled into tables that the engines look up instead of testing the rule themselves:
+#   countTable[state][count]  next state from the state of a cell and its amount of alive neighbours (all engines)
+#   bitTable                  the alive/dead part of countTable as bits of one integer (the numpy engines, radius 1)
+#   neighbourhoodTable        512 entries, next state of the middle cell of a 3x3 neighbourhood (two state rules with radius 1)
+#   blockTable                2^16 entries, the 2x2 middle of a 4x4 block one generation later (hashlife leaves)
+
+class Rule:
+    def __init__(self, birth: Iterable[int], survive: Iterable[int], states: int = 2, radius: int = 1,
+                 neighbourhood: str = "M", includeCentre: bool = False) -> None:
+        self.birth = frozenset(birth)
+        self.survive = frozenset(survive)
+        self.states = states  # 2 for normal rules, more for Generations (dying states)
+        self.radius = radius
+        self.neighbourhood = neighbourhood  # "M": moore (square), "N": von neumann (diamond)
+        self.includeCentre = includeCentre  # the count includes the cell itself (Larger than Life "M1")
+        if neighbourhood == "M":
+            self.maxCount = (2 * radius + 1) ** 2 - (0 if includeCentre else 1)
+        else:
+            self.maxCount = 2 * radius * (radius + 1) + (1 if includeCentre else 0)
+        if not (self.birth | self.survive) <= set(range(self.maxCount + 1)):
+            raise ValueError(f"neighbour counts above {self.maxCount} in {sorted(self.birth | self.survive)}")
+        self.countTable: list[list[int]] = [[self.nextState(state, count) for count in range(self.maxCount + 1)] for state in range(states)]
+        self.countArray = np.array(self.countTable, dtype=np.uint8) if np is not None else None
+        self.neighbourhoodTable: list[int] = []
+        if self.isSimple:
+            for index in range(512):
+                centre = (index >> 4) & 1
+                self.neighbourhoodTable.append(self.countTable[centre][bin(index).count("1") - centre])
+        self._blockTable: Optional[list[int]] = None
+        # bit 9 * alive + count is set if a dead (alive = 0) or alive (alive = 1) cell is alive next generation,
+        # a whole field is then looked up with one shift (radius 1 only)
+        self.bitTable = sum(1 << (9 * alive + count) for alive in (0, 1) for count in range(9) if self.radius == 1 and self.countTable[alive][count] == 1)
+
+    def nextState(self, state: int, count: int) -> int:
+        if state == 0:
+            return 1 if count in self.birth else 0
+        if state == 1:
+            if count in self.survive:
+                return 1
+            return 2 if self.states > 2 else 0
+        return state + 1 if state + 1 < self.states else 0  # dying cells just age
+
+    @property
+    def isSimple(self) -> bool:  # two states and the 8 direct neighbours: what the bit based engines can do
+        return self.states == 2 and self.radius == 1 and self.neighbourhood == "M" and not self.includeCentre
+
+    @property
+    def kind(self) -> str:  # what an engine has to support to run the rule (Board.ruleKinds)
+        if self.radius > 1 or self.neighbourhood != "M" or self.includeCentre:
+            return "larger"
+        return "generations" if self.states > 2 else "simple"
+
+    @property
+    def blockTable(self) -> list[int]:  # index: the 16 cells of a 4x4 block (bit y * 4 + x), value: nw | ne << 1 | sw << 2 | se << 3
+        if self._blockTable is None:  # built on first use, the 3x3 neighbourhood of each of the 4 middle cells is looked up
+            if np is not None:
+                block = np.arange(1 << 16)
+                table = np.array(self.neighbourhoodTable)
+                result = np.zeros(1 << 16, dtype=np.int64)
+                for bit, (x, y) in enumerate(((1, 1), (2, 1), (1, 2), (2, 2))):
+                    index = ((block >> ((y - 1) * 4 + x - 1)) & 7) | (((block >> (y * 4 + x - 1)) & 7) << 3) | (((block >> ((y + 1) * 4 + x - 1)) & 7) << 6)
+                    result |= table[index] << bit
+                self._blockTable = result.tolist()
+            else:
+                table = self.neighbourhoodTable
+                blocks = []
+                for block in range(1 << 16):
+                    result = 0
+                    for bit, (x, y) in enumerate(((1, 1), (2, 1), (1, 2), (2, 2))):
+                        index = ((block >> ((y - 1) * 4 + x - 1)) & 7) | (((block >> (y * 4 + x - 1)) & 7) << 3) | (((block >> ((y + 1) * 4 + x - 1)) & 7) << 6)
+                        result |= table[index] << bit
+                    blocks.append(result)
+                self._blockTable = blocks
+        return self._blockTable
+
+    @property
+    def string(self) -> str:  # canonical rulestring
+        if self.kind == "larger":
+            return (f"R{self.radius},C{self.states if self.states > 2 else 0},M{int(self.includeCentre)},"
+                    f"S{spanOf(self.survive)},B{spanOf(self.birth)},N{self.neighbourhood}")
+        text = f"B{''.join(map(str, sorted(self.birth)))}/S{''.join(map(str, sorted(self.survive)))}"
+        return text + (f"/C{self.states}" if self.states > 2 else "")
+
+    def __repr__(self) -> str:
+        return f"Rule({self.string!r})"
+
+def spanOf(counts: frozenset[int]) -> str:  # Larger than Life stores contiguous ranges
+    if not counts:
+        return "0..-1"
+    if counts != set(range(min(counts), max(counts) + 1)):
+        raise ValueError("Larger than Life rules need contiguous ranges")
+    return f"{min(counts)}..{max(counts)}"
+
+@lru_cache(maxsize=None)
+def parseRule(text: str) -> Rule:  # the same string always gives the same Rule object (hashlife caches depend on it)
+    text = text.strip()
+    ltl = re.fullmatch(r"R(\d+),C(\d+),M([01]),S(\d+)\.\.(\d+),B(\d+)\.\.(\d+),N([MN])", text, re.IGNORECASE)
+    if ltl:
+        radius, states, middle, s0, s1, b0, b1 = map(int, ltl.groups()[:7])
+        if not 1 <= radius <= 10:
+            raise ValueError(f"radius {radius} is not supported (1 to 10)")
+        return Rule(range(b0, b1 + 1), range(s0, s1 + 1), max(states, 2), radius, ltl.group(8).upper(), bool(middle))
+    bs = re.fullmatch(r"B(\d*)/S(\d*)(?:/C?(\d+))?", text, re.IGNORECASE)
+    sb = re.fullmatch(r"(\d*)/(\d*)(?:/(\d+))?", text)
+    if bs:
+        birth, survive, states = bs.groups()
+    elif sb:
+        survive, birth, states = sb.groups()
+    else:
+        raise ValueError(f"unknown rule: {text!r} (B3/S23, 23/3, B2/S/C3 or R5,C0,M1,S34..58,B34..45,NM)")
+    states = int(states) if states else 2
+    if states < 2 or states > 256:
+        raise ValueError(f"{states} states are not supported (2 to 256)")
+    return Rule(map(int, birth), map(int, survive), states)
+
+life: Rule = parseRule("B3/S23")
+
+# a few well known rules (R cycles through them in life.py)
+presets: dict[str, str] = {
+    "life": "B3/S23",
+    "highlife": "B36/S23",
+    "day & night": "B3678/S34678",
+    "seeds": "B2/S",
+    "brian's brain": "B2/S/C3",
+    "star wars": "B2/S345/C4",
+    "bosco": "R5,C0,M1,S34..58,B34..45,NM",
+}
+
+# numpy helpers for the array based engines
+def neighbourCounts(region: "np.ndarray", rule: Rule, base: Optional["np.ndarray"] = None) -> "np.ndarray":
+    # amount of alive neighbours of every cell of a region that has a border of rule.radius cells on every side
+    # (region is 1 for alive and 0 for everything else, dying cells of Generations rules dont count).
+    # The counts are added onto `base` if given (radius 1 only), which saves a pass when building table indices
+    r = rule.radius
+    h, w = region.shape[0] - 2 * r, region.shape[1] - 2 * r
+    if r == 1:  # sum of 8 shifted slices
+        counts = base if base is not None else np.zeros((h, w), dtype=np.uint8)
+        for offsetY in (0, 1, 2):
+            for offsetX in (0, 1, 2):
+                if offsetY == 1 and offsetX == 1:
+                    continue
+                counts += region[offsetY:offsetY + h, offsetX:offsetX + w]
+        return counts
+    if rule.neighbourhood == "M":  # box sums from a summed area table
+        table = np.zeros((region.shape[0] + 1, region.shape[1] + 1), dtype=np.int32)
+        np.cumsum(np.cumsum(region, axis=0, dtype=np.int32), axis=1, out=table[1:, 1:])
+        d = 2 * r + 1
+        counts = table[d:, d:] - table[:-d, d:] - table[d:, :-d] + table[:-d, :-d]
+    else:  # diamond: sum of the shifted slices with |dx| + |dy| <= r
+        counts = np.zeros((h, w), dtype=np.int32)
+        for offsetY in range(2 * r + 1):
+            for offsetX in range(2 * r + 1):
+                if abs(offsetY - r) + abs(offsetX - r) <= r:
+                    counts += region[offsetY:offsetY + h, offsetX:offsetX + w]
+    if not rule.includeCentre:
+        counts -= region[r:r + h, r:r + w]
+    return counts.astype(np.uint16)
+
+def stepCells(region: "np.ndarray", cells: "np.ndarray", rule: Rule) -> "np.ndarray":
+    # the next states of `cells`, region is the alive mask of cells plus a border of rule.radius cells (see aliveCells)
+    r = rule.radius
+    if r == 1:
+        alive = region[1:-1, 1:-1]
+        index = neighbourCounts(region, rule, alive * np.uint8(9))  # 9 * alive + count: the bit of bitTable to look up
+        nextAlive = np.right_shift(np.uint32(rule.bitTable), index, dtype=np.uint32)
+        new = np.bitwise_and(nextAlive, 1, out=np.empty(cells.shape, dtype=np.uint8), casting="unsafe")
+        if rule.states == 2:
+            return new
+        # Generations: every cell ages by one (the oldest ones die), then the empty cells that arent born
+        # go back from 1 to 0 and the alive cells that survive from 2 to 1 (arithmetic only, masks are slow here)
+        out = cells + np.uint8(1)
+        out *= out < rule.states
+        out -= (cells == 0).view(np.uint8) & (new ^ np.uint8(1))
+        out -= alive & new
+        return out
+    counts = neighbourCounts(region, rule)
+    return rule.countArray.ravel().take(cells.astype(np.intp) * (rule.maxCount + 1) + counts)
+
+def aliveCells(cells: "np.ndarray", rule: Rule) -> "np.ndarray":  # 1 for alive cells (dying cells of Generations rules are not alive)
+    return cells if rule.states == 2 else (cells == 1).astype(np.uint8)
@@ -0,0 +1,149 @@
+from typing import Any  # more typehints
+import base64, json, mmap, os, stat, struct, tempfile, zlib
+from engines import Board, makeBoard, defaultEngine, np
+
+# binary save file of life.py:
+#   header: magic, version, steps, cameraPos, cellSize, panSpeed, genSpeed, screenSize, fieldSize,
+#           the stored rectangle (x0, y0, width, height), then the engine, edge and rule names (utf-8, lengths are in the fixed part)
+#   body:   the rectangle packed to one bit per cell (row by row, lowest bit first), zlib compressed.
+#           For bounded boards the rectangle is the field (the body is Board.toBits), for unbounded boards
+#           it's the bounding box of the alive cells, which can be anywhere on the plane.
+#           Rules with more than 2 states (Generations) store one byte per cell instead, so dying cells are kept.
+#           Boards on disk (see diskboard.py) store no rectangle: their cells stay in the tile file next to the
+#           save file (tilesPath), so saving only writes back the tiles that changed
+# version 1 files have no rectangle, their body is always the field
+
+magic: bytes = b"GOLS"
+version: int = 2
+headerFormats: dict[int, str] = {1: "<4sHQddIdBHHIBBB", 2: "<4sHQddIdBHHIBBBqqII"}  # little endian, no padding
+headerFormat: str = headerFormats[version]
+defaultRule: str = "B3/S23"  # of version 1 files without a rule
+
+class SaveFormatError(ValueError):  # the file is no save file, or a broken one (empty, truncated, ...)
+    pass
+
+def tilesPath(filename: str) -> str:  # the tile file of a board on disk
+    return filename + ".tiles"
+
+def fileMode(filename: str) -> int:  # the permissions a save keeps: those of the file it replaces, or the default of new files
+    try:
+        return stat.S_IMODE(os.stat(filename).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def saveSnapshot(filename: str, settings: dict[str, Any], board: Board) -> None:
+    # written to a temporary file first and then renamed, so a crash never leaves half a save behind
+    names = [settings.get("engine", board.name).encode(), board.edge.encode(), board.rule.string.encode()]
+    if not board.inMemory:
+        x0, y0, width, height = 0, 0, 0, 0
+    elif board.bounded:
+        x0, y0, width, height = 0, 0, board.size, board.size
+    else:
+        x0, y0, x1, y1 = board.boundingBox() or (0, 0, 0, 0)
+        width, height = x1 - x0, y1 - y0
+    if not board.inMemory:
+        board.saveAs(tilesPath(filename))
+        body = b""
+    elif board.rule.states > 2:
+        body = board.window(x0, y0, x0 + width, y0 + height).tobytes()
+    elif board.bounded:
+        body = board.toBits()
+    else:
+        body = np.packbits(board.window(x0, y0, x0 + width, y0 + height), axis=None, bitorder="little").tobytes()
+    header = struct.pack(headerFormat, magic, version, settings["steps"], settings["cameraPos"][0], settings["cameraPos"][1],
+                         settings["cellSize"], settings["panSpeed"], settings["genSpeed"], settings["screenSize"][0], settings["screenSize"][1],
+                         board.size, *map(len, names), x0, y0, width, height)
+    folder = os.path.dirname(os.path.abspath(filename))
+    fd, tempName = tempfile.mkstemp(prefix=".save-", dir=folder)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(b"".join(names))
+            f.write(zlib.compress(body, 1))
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tempName, fileMode(filename))  # mkstemp files are only readable by their owner
+        os.replace(tempName, filename)
+    except BaseException:
+        os.unlink(tempName)
+        raise
+
+def loadSnapshot(filename: str) -> tuple[dict[str, Any], Board]:  # returns the settings and the field
+    with open(filename, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # an empty file cant be mapped
+            raise SaveFormatError(f"{filename} is not a save file (empty)") from None
+        with data:
+            return readSnapshot(filename, data)
+
+def readSnapshot(filename: str, data: mmap.mmap) -> tuple[dict[str, Any], Board]:
+    if len(data) < 6 or data[:4] != magic:
+        raise SaveFormatError(f"{filename} is not a save file")
+    fileVersion = struct.unpack_from("<H", data, 4)[0]
+    if fileVersion not in headerFormats:
+        raise SaveFormatError(f"{filename} has version {fileVersion}, only up to {version} is supported")
+    fileHeaderFormat = headerFormats[fileVersion]
+    if len(data) < struct.calcsize(fileHeaderFormat):
+        raise SaveFormatError(f"{filename} is not a save file (too short)")
+    (_, _, steps, cameraX, cameraY, cellSize, panSpeed, genSpeed, screenWidth, screenHeight,
+     fieldSize, engineLength, edgeLength, ruleLength, *rectangle) = struct.unpack_from(fileHeaderFormat, data, 0)
+    x0, y0, width, height = rectangle or (0, 0, fieldSize, fieldSize)
+    offset = struct.calcsize(fileHeaderFormat)
+    engine, edge, rule = [], [], []
+    for target, length in ((engine, engineLength), (edge, edgeLength), (rule, ruleLength)):
+        target.append(bytes(data[offset:offset + length]).decode(errors="replace"))
+        offset += length
+    if offset > len(data):
+        raise SaveFormatError(f"{filename} is not a save file (too short)")
+    settings = {"steps": steps, "cameraPos": (cameraX, cameraY), "cellSize": cellSize, "panSpeed": panSpeed, "genSpeed": genSpeed,
+                "screenSize": (screenWidth, screenHeight), "fieldSize": fieldSize, "engine": engine[0], "edge": edge[0], "rule": rule[0] or defaultRule}
+    try:
+        if engine[0] == "disk":  # the cells are in the tile file
+            from diskboard import DiskBoard
+            board = DiskBoard(fieldSize, edge[0], tilesPath(filename))
+            board.setRule(settings["rule"])
+        else:
+            board = makeBoard(engine[0], fieldSize, edge[0], settings["rule"])
+    except (ValueError, struct.error) as error:  # an unknown engine, edge or rule, or a broken tile file
+        raise SaveFormatError(f"{filename} has a field that cant be built ({error})") from None
+    try:
+        with memoryview(data) as body:  # decompressed straight from the mapped file
+            bits = zlib.decompress(body[offset:])
+    except zlib.error:
+        raise SaveFormatError(f"{filename} is not a save file (the field is truncated or damaged)") from None
+    expected = width * height if board.rule.states > 2 else (width * height + 7) // 8
+    if len(bits) < expected:
+        raise SaveFormatError(f"{filename} is not a save file (the field is too short)")
+    if board.rule.states > 2:
+        if width and height:
+            board.loadWindow(x0, y0, np.frombuffer(bits, dtype=np.uint8).reshape(height, width))
+    elif board.bounded and (x0, y0, width, height) == (0, 0, fieldSize, fieldSize):
+        board.loadBits(bits)
+    elif width and height:
+        cells = np.unpackbits(np.frombuffer(bits, dtype=np.uint8), count=width * height, bitorder="little")
+        board.loadWindow(x0, y0, cells.reshape(height, width))
+    return settings, board
+
+def migrateJsonConfig(jsonFile: str, filename: str, engine: str) -> bool:
+    # one-shot conversion of the old json config (config.ini) into a save file, the old file is kept as .bak
+    try:
+        with open(jsonFile, "r") as f:
+            config = json.loads(f.read())
+    except (FileNotFoundError, ValueError):
+        return False
+    # the old field was bounded (frozen edge unless it says otherwise), an unbounded plane (e.g. chunked) would drop the edge
+    board = makeBoard(config.get("engine", engine), config["fieldSize"], config.get("edge", "frozen"))
+    if not board.bounded:
+        board = makeBoard(defaultEngine(), config["fieldSize"], board.edge)
+    if "fieldBits" in config:
+        board.loadBits(base64.b64decode(config["fieldBits"]))
+    else:
+        board.loadList(config["field"])
+    settings = {key: config[key] for key in ("steps", "cameraPos", "cellSize", "panSpeed", "screenSize")}
+    settings["genSpeed"] = config.get("genSpeed", 5)
+    saveSnapshot(filename, settings, board)
+    os.replace(jsonFile, jsonFile + ".bak")
+    return True
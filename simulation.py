@@ -0,0 +1,106 @@
+from typing import Any, Callable, Optional  # more typehints
+from collections import deque
+from time import perf_counter
+import threading, queue, traceback
+
+# runs the simulation on its own thread so the speed of the game doesnt depend on the frame rate:
+# the thread owns the board, edits from the ui are queued and applied between two generations,
+# and the renderer only ever reads the latest published snapshot.
+# An exception in a command or a step is printed and kept in `error` for the ui, the thread keeps going
+# (a failing step pauses the simulation, so it isnt repeated every generation)
+
+class Simulation(threading.Thread):
+    publishInterval: float = 1 / 120  # at most this often a new snapshot is made while running unthrottled
+
+    def __init__(self, advance: Callable[[], int], capture: Callable[[], Any]) -> None:
+        super().__init__(daemon=True)
+        self.advance = advance  # advances the board, returns the amount of generations that passed
+        self.capture = capture  # makes a snapshot of the board that the renderer can use without locking
+        self.running = False  # advancing continuously
+        self.interval = 0.0  # seconds between two generations, 0 is unthrottled
+        self.commands: queue.SimpleQueue = queue.SimpleQueue()
+        self.buffers: list[Any] = [capture(), None]  # double buffer: [front, back]
+        self.lock = threading.Lock()
+        self.history: deque[tuple[float, int]] = deque()  # (time, generations) of the last second
+        self.stopped = threading.Event()
+        self.error: Optional[BaseException] = None  # the last exception of a command or a step (None: none so far)
+
+    @property
+    def snapshot(self) -> Any:  # the latest published snapshot
+        with self.lock:
+            return self.buffers[0]
+
+    @property
+    def gensPerSecond(self) -> float:
+        with self.lock:
+            if not self.history:
+                return 0.0
+            now = perf_counter()
+            return sum(gens for t, gens in self.history if now - t <= 1.0)
+
+    def submit(self, function: Callable, *args) -> None:  # runs the function on the simulation thread between two generations
+        self.commands.put((function, args))
+
+    def setRunning(self, running: bool) -> None:  # turns the continuous advancing on or off
+        self.running = running
+        self.submit(lambda: None)  # waking up the thread if it's waiting for edits
+
+    def stepOnce(self) -> None:
+        self.submit(self.advanceAndCount)
+
+    def stop(self) -> None:  # stops the thread and waits until it's done, the board can be used directly afterwards
+        self.stopped.set()
+        self.commands.put((lambda: None, ()))  # waking up the thread
+        if self.is_alive():
+            self.join()
+
+    def publish(self) -> None:
+        self.buffers[1] = self.capture()
+        with self.lock:
+            self.buffers.reverse()
+
+    def execute(self, function: Callable, args: tuple = ()) -> bool:  # runs a command, False if it raised
+        try:
+            function(*args)
+            return True
+        except Exception as error:
+            traceback.print_exc()
+            self.error = error
+            return False
+
+    def advanceAndCount(self) -> None:
+        gens = self.advance()
+        now = perf_counter()
+        with self.lock:
+            self.history.append((now, gens))
+            while self.history and now - self.history[0][0] > 1.0:
+                self.history.popleft()
+
+    def run(self) -> None:
+        lastGen = lastPublish = perf_counter()
+        dirty = False
+        while not self.stopped.is_set():
+            now = perf_counter()
+            if self.running:
+                timeout: Optional[float] = max(0.0, self.interval - (now - lastGen))
+            else:
+                timeout = None if not dirty else self.publishInterval
+            try:  # applying queued edits (or waiting for them while paused)
+                function, args = self.commands.get(timeout=timeout) if timeout != 0 else self.commands.get_nowait()
+                self.execute(function, args)
+                dirty = True
+                while not self.commands.empty():
+                    function, args = self.commands.get_nowait()
+                    self.execute(function, args)
+            except queue.Empty:
+                pass
+            now = perf_counter()
+            if self.running and now - lastGen >= self.interval and not self.stopped.is_set():
+                if not self.execute(self.advanceAndCount):
+                    self.running = False
+                lastGen = now
+                dirty = True
+            if dirty and (self.interval >= self.publishInterval or not self.running or perf_counter() - lastPublish >= self.publishInterval):
+                self.execute(self.publish)
+                lastPublish = perf_counter()
+                dirty = False
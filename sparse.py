@@ -0,0 +1,182 @@
+from typing import Iterable, Iterator, Literal, Optional  # more typehints
+from collections import Counter
+from rules import Rule, life
+
+# sparse engine for the unbounded plane: only the alive cells are stored (in a set),
+# a generation is a single pass that counts the neighbours of every alive cell
+
+neighbourOffsets: tuple[tuple[int, int], ...] = ((-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+
+class SparseLife:
+    trackStats: bool = False  # like Board.trackStats: step() then also fills lastStats (births, deaths, bounding box)
+    lastStats: Optional[tuple[int, int, Optional[tuple[int, int, int, int]]]] = None
+
+    def __init__(self, cells: Iterable[tuple[int, int]] = (), rule: Rule = life) -> None:
+        self.cells: set[tuple[int, int]] = set(cells)
+        self.lastVisited = 0  # amount of cells the last step looked at
+        self.setRule(rule)
+
+    def setRule(self, rule: Rule) -> None:  # two states and radius 1, B0 would fill the whole plane
+        if not rule.isSimple or 0 in rule.birth:
+            raise ValueError(f"the sparse engine cant run {rule.string}")
+        self.rule = rule
+
+    def step(self) -> int:  # advances the plane by one generation
+        cells = self.cells
+        birth, survive = self.rule.birth, self.rule.survive
+        counts = Counter((x + offsetX, y + offsetY) for x, y in cells for offsetX, offsetY in neighbourOffsets)
+        if self.rule is life:
+            self.cells = {pos for pos, n in counts.items() if n == 3 or (n == 2 and pos in cells)}
+        else:
+            self.cells = {pos for pos, n in counts.items() if (n in survive if pos in cells else n in birth)}
+            if 0 in survive:  # cells without neighbours arent counted at all
+                self.cells.update(pos for pos in cells if pos not in counts)
+        self.lastVisited = len(counts)
+        if self.trackStats:
+            births = len(self.cells - cells)
+            self.lastStats = (births, len(cells) + births - len(self.cells), self.boundingBox())
+        return 1
+
+    def toggle(self, pos: tuple[int, int]) -> Literal[1, 0]:  # flips the cell, returns the new state
+        if pos in self.cells:
+            self.cells.remove(pos)
+            return 0
+        self.cells.add(pos)
+        return 1
+
+    def add(self, pos: tuple[int, int]) -> None:
+        self.cells.add(pos)
+
+    def discard(self, pos: tuple[int, int]) -> None:
+        self.cells.discard(pos)
+
+    def translate(self, offsetX: int, offsetY: int) -> None:  # moves every cell by the offset
+        self.cells = {(x + offsetX, y + offsetY) for x, y in self.cells}
+
+    def clear(self) -> None:
+        self.cells = set()
+
+    def boundingBox(self) -> Optional[tuple[int, int, int, int]]:  # (x0, y0, x1, y1) (exclusive, like Board) of the alive cells, None if empty
+        if not self.cells:
+            return None
+        xs = [x for x, _ in self.cells]
+        ys = [y for _, y in self.cells]
+        return (min(xs), min(ys), max(xs) + 1, max(ys) + 1)
+
+    @property
+    def population(self) -> int:
+        return len(self.cells)
+
+    @property
+    def activeCells(self) -> int:
+        return self.lastVisited
+
+    def liveCells(self) -> Iterator[tuple[int, int]]:
+        return iter(self.cells)
+
+    def __contains__(self, pos: tuple[int, int]) -> bool:
+        return pos in self.cells
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return iter(self.cells)
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+
+class IncrementalLife(SparseLife):
+    # SparseLife that keeps the amount of alive neighbours of every cell next to an alive cell in a dict,
+    # updated by +1/-1 deltas whenever cells flip. A cell can only change if it flipped itself or its count moved,
+    # those cells are collected as the candidates of the next step, so a step costs O(changes) instead of O(population)
+    def __init__(self, cells: Iterable[tuple[int, int]] = (), rule: Rule = life) -> None:
+        self.counts: dict[tuple[int, int], int] = {}  # only cells with at least one alive neighbour
+        self.candidates: set[tuple[int, int]] = set()  # the only cells that can change in the next step
+        self.box: Optional[tuple[int, int, int, int]] = None  # bounding box kept along for lastStats (None: unknown)
+        super().__init__((), rule)
+        for pos in cells:
+            self.add(pos)
+
+    def setRule(self, rule: Rule) -> None:
+        super().setRule(rule)
+        self.candidates = set(self.cells) | set(self.counts)  # under the new rule any of them can change
+
+    def move(self, born: Iterable[tuple[int, int]], died: Iterable[tuple[int, int]]) -> set[tuple[int, int]]:
+        # moves the counts around the flipped cells, returns the cells whose count changed
+        counts = self.counts
+        get = counts.get
+        deltas = Counter([(x + offsetX, y + offsetY) for x, y in born for offsetX, offsetY in neighbourOffsets])
+        deltas.subtract(Counter([(x + offsetX, y + offsetY) for x, y in died for offsetX, offsetY in neighbourOffsets]))
+        moved = set()
+        for pos, delta in deltas.items():
+            if delta:
+                n = get(pos, 0) + delta
+                if n:
+                    counts[pos] = n
+                else:
+                    del counts[pos]
+                moved.add(pos)
+        return moved
+
+    def step(self) -> int:
+        cells, get = self.cells, self.counts.get
+        birth, survive = self.rule.birth, self.rule.survive
+        # all new states first, then the counts are moved, so the cells dont interfere w/ each other
+        born = [pos for pos in self.candidates if pos not in cells and get(pos, 0) in birth]
+        died = [pos for pos in self.candidates if pos in cells and get(pos, 0) not in survive]
+        cells.update(born)
+        cells.difference_update(died)
+        self.lastVisited = len(self.candidates)
+        self.candidates = self.move(born, died)
+        self.candidates.update(born)
+        self.candidates.update(died)
+        if self.trackStats:
+            self.lastStats = (len(born), len(died), self.trackBox(born, died))
+        return 1
+
+    def trackBox(self, born: list[tuple[int, int]], died: list[tuple[int, int]]) -> Optional[tuple[int, int, int, int]]:
+        # the bounding box only grows by the born cells, it's only searched again if a cell on its border died
+        box = self.box
+        if box is not None and any(x in (box[0], box[2] - 1) or y in (box[1], box[3] - 1) for x, y in died):
+            box = None
+        if box is None:
+            box = self.boundingBox()
+        elif born:
+            xs, ys = [x for x, _ in born], [y for _, y in born]
+            box = (min(box[0], min(xs)), min(box[1], min(ys)), max(box[2], max(xs) + 1), max(box[3], max(ys) + 1))
+        self.box = box
+        return box
+
+    def edit(self, pos: tuple[int, int], alive: bool) -> None:  # sets a single cell
+        if alive:
+            self.cells.add(pos)
+            self.candidates |= self.move((pos,), ())
+        else:
+            self.cells.remove(pos)
+            self.candidates |= self.move((), (pos,))
+        self.candidates.add(pos)
+        self.box = None
+
+    def toggle(self, pos: tuple[int, int]) -> Literal[1, 0]:
+        alive = pos not in self.cells
+        self.edit(pos, alive)
+        return 1 if alive else 0
+
+    def add(self, pos: tuple[int, int]) -> None:
+        if pos not in self.cells:
+            self.edit(pos, True)
+
+    def discard(self, pos: tuple[int, int]) -> None:
+        if pos in self.cells:
+            self.edit(pos, False)
+
+    def translate(self, offsetX: int, offsetY: int) -> None:
+        super().translate(offsetX, offsetY)
+        self.counts = {(x + offsetX, y + offsetY): n for (x, y), n in self.counts.items()}
+        self.candidates = {(x + offsetX, y + offsetY) for x, y in self.candidates}
+        self.box = None
+
+    def clear(self) -> None:
+        super().clear()
+        self.counts = {}
+        self.candidates = set()
+        self.box = None
@@ -0,0 +1,110 @@
+from typing import Iterator, Optional  # more typehints
+from collections import deque
+import csv, os, struct, threading
+from engines import Board
+
+# statistics of every generation: population, births, deaths, bounding box and the amount of cells the step computed.
+# The engines count births and deaths and find the bounding box while stepping (Board.trackStats / lastStats),
+# from the cells and arrays they touch anyway. The population is carried along with them (+births -deaths)
+# and only counted again after an edit (resync). Engines that cant tell (hashlife, bits, parallel, list)
+# and jumps of more than one generation are counted after the step instead, their births/deaths are unknown (-1).
+# The samples go into a ring buffer (the sparklines) and optionally into an append only log:
+#   .csv:      a header line, then one line per sample
+#   otherwise: binary, magic and version, then one record of 9 little endian int64 per sample
+# readStats streams a log back block by block, so logs of millions of generations are never loaded at once.
+# An empty board has the bounding box (0, 0, 0, 0)
+
+fields: tuple[str, ...] = ("generation", "population", "births", "deaths", "x0", "y0", "x1", "y1", "active")
+Sample = tuple[int, int, int, int, int, int, int, int, int]
+magic: bytes = b"GOLSTATS"
+version: int = 1
+headerFormat: str = "<8sH"
+recordFormat: str = "<9q"
+blockSize: int = 4096  # records per read of readStats
+
+class StatsCollector:
+    def __init__(self, capacity: int = 512, log: Optional[str] = None) -> None:
+        self.samples: deque[Sample] = deque(maxlen=capacity)  # the last `capacity` samples
+        self.lock = threading.Lock()  # samples are added on the simulation thread while the ui reads them
+        self.population: Optional[int] = None  # carried along, None: counted with the next sample
+        self.log = None
+        self.writer = None  # csv writer or the struct of the records
+        if log is not None:
+            self.openLog(log)
+
+    def openLog(self, path: str) -> None:  # appends to the log if it exists
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        if path.endswith(".csv"):
+            self.log = open(path, "a", newline="")
+            self.writer = csv.writer(self.log)
+            if new:
+                self.writer.writerow(fields)
+        else:
+            self.log = open(path, "ab")
+            if new:
+                self.log.write(struct.pack(headerFormat, magic, version))
+            self.writer = struct.Struct(recordFormat)
+
+    def resync(self) -> None:  # the board was edited, its population is counted again with the next sample
+        self.population = None
+
+    def observe(self, board: Board, generation: int, gens: int = 1) -> Sample:  # after `gens` generations of the board (or a SparseLife)
+        changes, board.lastStats = board.lastStats, None
+        board.trackStats = True  # from the next step on (a new board is counted once)
+        if changes is None or gens != 1:
+            births = deaths = -1
+            population = board.population
+            box = board.boundingBox()
+        else:
+            births, deaths, box = changes
+            population = self.population + births - deaths if self.population is not None else board.population
+        self.population = population
+        sample = (generation, population, births, deaths, *(box or (0, 0, 0, 0)), board.activeCells)
+        self.add(sample)
+        return sample
+
+    def add(self, sample: Sample) -> None:
+        with self.lock:
+            self.samples.append(sample)
+        if isinstance(self.writer, struct.Struct):
+            self.log.write(self.writer.pack(*sample))
+        elif self.writer is not None:
+            self.writer.writerow(sample)
+
+    def series(self, field: str = "population") -> list[int]:  # one field of the samples in the ring buffer
+        index = fields.index(field)
+        with self.lock:
+            samples = list(self.samples)
+        return [sample[index] for sample in samples]
+
+    @property
+    def last(self) -> Optional[Sample]:
+        with self.lock:
+            return self.samples[-1] if self.samples else None
+
+    def clear(self) -> None:  # forgets the ring buffer (the log keeps everything)
+        with self.lock:
+            self.samples.clear()
+        self.population = None
+
+    def close(self) -> None:
+        if self.log is not None:
+            self.log.close()
+            self.log = self.writer = None
+
+def readStats(path: str) -> Iterator[Sample]:  # the samples of a log, one block at a time
+    if path.endswith(".csv"):
+        with open(path, "r", newline="") as f:
+            reader = csv.reader(f)
+            next(reader, None)  # header
+            for row in reader:
+                yield tuple(map(int, row))
+        return
+    record = struct.Struct(recordFormat)
+    with open(path, "rb") as f:
+        header = f.read(struct.calcsize(headerFormat))
+        fileMagic, fileVersion = struct.unpack(headerFormat, header) if len(header) == struct.calcsize(headerFormat) else (b"", 0)
+        if fileMagic != magic or fileVersion > version:
+            raise ValueError(f"{path} is not a statistics log (or a newer version)")
+        while block := f.read(record.size * blockSize):
+            yield from record.iter_unpack(block[:len(block) - len(block) % record.size])  # a half written last record is skipped
@@ -0,0 +1,4 @@
+import os, sys
+
+# the modules are in the top folder of the repository (there is no package), the tests import them from there
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,29 @@
+import json
+import benchsuite
+from benchsuite import compare, main
+
+def results(**seconds: float) -> dict:
+    return {"meta": {}, "results": {name.replace("_", "/"): value for name, value in seconds.items()}}
+
+def testCompareFlagsOnlyRealRegressions(capsys) -> None:
+    baseline = results(step_a=0.010, step_b=0.010, step_c=0.00001, step_gone=0.01)
+    current = results(step_a=0.013, step_b=0.0115, step_c=0.00005, step_new=0.01)
+    # a: 30% and 3 ms slower, b: only 15%, c: 400% but far below the minimum
+    assert compare(baseline, current, 0.2, 0.0001) == ["step/a"]
+    out = capsys.readouterr().out
+    assert "missing" in out and "new" in out and "REGRESSION" in out
+
+def testMainExitCode(tmp_path) -> None:
+    baseline, current = tmp_path / "baseline.json", tmp_path / "current.json"
+    baseline.write_text(json.dumps(results(step_a=0.01, load_b=0.01)))
+    current.write_text(json.dumps(results(step_a=0.02, load_b=0.01)))
+    assert main(["compare", str(baseline), "--current", str(current)]) == 1
+    assert main(["compare", str(baseline), "--current", str(current), "--threshold", "1.5"]) == 0
+    assert main(["compare", str(baseline), "--current", str(current), "--only", "load"]) == 0
+
+def testRunOneCase(tmp_path, monkeypatch) -> None:  # the suite itself runs (on a small field)
+    monkeypatch.setattr(benchsuite, "fieldSize", 32)
+    out = tmp_path / "results.json"
+    assert main(["run", "--out", str(out), "--repeat", "1", "--only", "step/acorn/numpy"]) == 0
+    written = json.loads(out.read_text())
+    assert list(written["results"]) == ["step/acorn/numpy"] and written["meta"]["repeat"] == 1
@@ -0,0 +1,28 @@
+import random
+import pytest
+from bitboard import BitBoard
+from engines import NumpyBoard
+
+@pytest.mark.parametrize("size", [63, 64, 70, 130])  # inside one word, exactly one, and rows that end in a partly used word
+@pytest.mark.parametrize("edge", ["frozen", "dead", "wrap"])
+def testWordBordersMatchNumpy(size: int, edge: str) -> None:
+    rng = random.Random(size)
+    bits, reference = BitBoard(size, edge), NumpyBoard(size, edge)
+    for y in range(size):
+        for x in range(size):
+            if rng.random() < 0.3:
+                bits.setCell(x, y, 1)
+                reference.setCell(x, y, 1)
+    for _ in range(40):
+        bits.step()
+        reference.step()
+    assert bits.toList() == reference.toList()
+    assert bits.population == reference.population
+
+def testOneBitPerCell() -> None:
+    board = BitBoard(1000)
+    assert board.nbytes == 1000 * 16 * 8  # 16 words of 64 cells per row
+    board.setCell(999, 999, 1)
+    board.setCell(0, 0, 1)
+    board.setCell(0, 0, 0)
+    assert list(board.liveCells()) == [(999, 999)]
@@ -0,0 +1,51 @@
+import random
+from chunked import ChunkedBoard
+from engines import makeBoard
+
+glider = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+
+def testGliderCrossesChunks() -> None:  # travels up left through negative positions, 4 generations per cell
+    board = ChunkedBoard(100)
+    for x, y in glider:
+        board.setCell(-x, -y, 1)
+    for _ in range(4 * 70):
+        board.step()
+    assert set(board.liveCells()) == {(-x - 70, -y - 70) for x, y in glider}
+    assert len(board.chunks) <= 2  # the chunks it left behind are freed
+    assert board.boundingBox() == (-72, -72, -69, -69)
+
+def testMatchesHashlife() -> None:
+    chunked, hashlife = makeBoard("chunked", 100), makeBoard("hashlife", 100)
+    rng = random.Random(7)
+    for y in range(-40, 40):
+        for x in range(-40, 40):
+            if rng.random() < 0.35:
+                chunked.setCell(x, y, 1)
+                hashlife.setCell(x, y, 1)
+    for _ in range(60):
+        chunked.step()
+        hashlife.step()
+    assert set(chunked.liveCells()) == set(hashlife.liveCells())
+    assert chunked.population == hashlife.population and chunked.boundingBox() == hashlife.boundingBox()
+
+def testEmptyChunksAreFreed() -> None:
+    board = ChunkedBoard(100)
+    board.setCell(1000, -1000, 1)
+    assert len(board.chunks) == 1 and board.nbytes == 64 * 64
+    board.setCell(1000, -1000, 0)
+    assert board.chunks == {} and board.boundingBox() is None
+    board.setCell(5, 5, 1)
+    board.step()  # a lonely cell dies, its chunk goes with it
+    assert board.chunks == {} and board.population == 0
+
+def testWindows() -> None:
+    board = ChunkedBoard(100)
+    for x, y in glider:
+        board.setCell(x + 62, y - 2, 1)  # on the corner of four chunks
+    window = board.window(60, -5, 70, 5)
+    other = ChunkedBoard(100)
+    other.loadWindow(60, -5, window)
+    assert set(other.liveCells()) == set(board.liveCells())
+    copy = board.copy()
+    board.clear()
+    assert len(set(copy.liveCells())) == 5
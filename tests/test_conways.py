@@ -0,0 +1,54 @@
+import pytest
+import Conways_game_of_life as conways
+from sparse import IncrementalLife
+from stats import StatsCollector
+from timeline import Timeline
+
+glider = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+
+@pytest.fixture
+def game(monkeypatch):  # a fresh game state, the module keeps it in globals
+    monkeypatch.setattr(conways, "universe", IncrementalLife(glider))
+    monkeypatch.setattr(conways, "jump_board", None)
+    monkeypatch.setattr(conways, "generation", 0)
+    monkeypatch.setattr(conways, "step_exponent", 2)
+    monkeypatch.setattr(conways, "timeline", Timeline())
+    monkeypatch.setattr(conways, "statistics", StatsCollector())
+    return conways
+
+def testJumpsKeepOneHashlifeUniverse(game) -> None:
+    assert game.advance_state_by_exponent() == 4
+    board = game.jump_board
+    assert board is not None
+    assert game.advance_state_by_exponent() == 4
+    assert game.jump_board is board  # the memo cache of the first jump is reused
+    assert game.generation == 8 and set(game.current_cells()) == {(x + 2, y + 2) for x, y in glider}
+    game.step_exponent = 0
+    game.advance_state_by_exponent()  # a single step goes back to the incremental universe
+    assert game.jump_board is None and game.generation == 9
+    expected = IncrementalLife(glider)
+    for _ in range(9):
+        expected.step()
+    assert set(game.universe) == expected.cells
+
+def testEditsLeaveJumpMode(game) -> None:
+    game.advance_state_by_exponent()
+    game.create_new_cell(20, 20)
+    assert game.jump_board is None
+    assert set(game.universe) == {(x + 1, y + 1) for x, y in glider} | {(20, 20)}
+
+def testSeekDropsTheJumpUniverse(game) -> None:
+    game.record_state("edit")
+    game.advance_state_by_exponent()
+    game.seek_state(0)
+    assert game.jump_board is None and set(game.universe) == set(glider) and game.generation == 0
+
+def testTimelineIsOnlyRecordedWhenSwitchedOn(game) -> None:
+    game.timeline = None
+    game.advance_state_by_exponent()  # nothing is recorded while it's off
+    game.toggle_timeline()
+    assert game.timeline.length == 1 and game.timeline.generationOf(0) == 4  # the current cells are the first entry
+    game.advance_state_by_exponent()
+    assert game.timeline.length == 2
+    game.toggle_timeline()
+    assert game.timeline is None
@@ -0,0 +1,95 @@
+from typing import Optional
+import random
+import pytest
+from cycles import BoardHasher, Cycle, CycleDetector, boardKey, recordStates
+from engines import Board, makeBoard
+
+def place(engine: str, cells, size: int = 20, edge: str = "dead") -> Board:
+    board = makeBoard(engine, size, edge)
+    for x, y in cells:
+        board.setCell(x, y, 1)
+    return board
+
+def run(board: Board, detector: CycleDetector, gens: int) -> Optional[Cycle]:
+    cycle = detector.observe(board, 0)
+    for generation in range(1, gens + 1):
+        board.step()
+        cycle = cycle or detector.observe(board, generation)
+    return cycle
+
+blinker = [(5, 6), (6, 6), (7, 6)]
+block = [(3, 3), (4, 3), (3, 4), (4, 4)]
+glider = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+
+@pytest.mark.parametrize("engine", ["numpy", "hashlife"])
+def testPeriods(engine: str) -> None:
+    assert (cycle := run(place(engine, blinker), CycleDetector(), 10)) and (cycle.start, cycle.period, cycle.detectedAt) == (0, 2, 2)
+    assert (cycle := run(place(engine, block), CycleDetector(), 10)) and (cycle.start, cycle.period) == (0, 1)
+    if engine == "hashlife":  # the r-pentomino below needs 1103 generations and throws out gliders on the plane
+        return
+    # the r-pentomino dies down on a small dead edged field
+    cycle = run(place(engine, [(9, 8), (10, 8), (8, 9), (9, 9), (9, 10)]), CycleDetector(), 200)
+    assert cycle is not None and cycle.period in (1, 2) and cycle.start > 0
+
+def testGliderOnATorus() -> None:  # back at its place after 4 generations per cell of the field
+    assert (cycle := run(place("numpy", glider, 12, "wrap"), CycleDetector(), 60)) and cycle.period == 48
+    assert run(place("numpy", glider, 12, "wrap"), CycleDetector(window=40), 60) is None  # longer than the window
+    assert run(place("hashlife", glider), CycleDetector(), 100) is None  # on the plane it never comes back
+
+def testIncrementalHashMatchesAFreshOne() -> None:
+    board = place("numpy", glider, 30, "wrap")
+    hasher = BoardHasher()
+    for _ in range(20):
+        board.step()
+        board.setCell(15, 15, 1 - board.getCell(15, 15))
+        assert hasher.update(board) == BoardHasher().update(board)
+    assert BoardHasher().update(makeBoard("numpy", 30)) == 0
+
+def testResetForgetsTheHistory() -> None:
+    board, detector = place("numpy", blinker), CycleDetector()
+    detector.observe(board, 0)
+    board.step()
+    detector.observe(board, 1)
+    detector.reset()
+    board.step()
+    assert detector.observe(board, 2) is None
+
+def testRecordStates() -> None:
+    board = place("numpy", blinker)
+    cycle = run(board, CycleDetector(), 4)
+    assert recordStates(board, cycle)
+    assert len(cycle.states) == 2 and cycle.states[0] != cycle.states[1]
+    assert cycle.states[cycle.index(4)] == board.toBits()
+    board.step()
+    assert cycle.states[cycle.index(5)] == board.toBits()
+    assert not recordStates(board, Cycle(0, 100, 100, []), maxPeriod=64)
+
+@pytest.mark.parametrize("rule", ["B3/S23", "B2/S345/C4"])
+@pytest.mark.parametrize("engine", ["incremental", "chunked"])
+def testFlipsKeepTheHashOfTheWholeBoard(engine: str, rule: str) -> None:  # the engines that report their flips
+    board = makeBoard(engine, 40, "wrap", rule)
+    assert board.reportsFlips
+    rng = random.Random(5)
+    for y in range(10, 30):
+        for x in range(10, 30):
+            if rng.random() < 0.4:
+                board.setCell(x, y, 1)
+    hasher = BoardHasher()
+    for generation in range(40):
+        board.step()
+        if generation % 3 == 0:
+            board.jump(2)  # flipped twice cancels out
+        if generation == 20:
+            board.setCell(0, 0, 1)  # edits make the flips unknown, the board is hashed again
+        assert hasher.update(board) == boardKey(board), f"generation {generation}"
+        assert board.flips == []
+
+def testUntakenFlipsAreDropped(monkeypatch) -> None:
+    board = place("incremental", glider, 20, "wrap")
+    monkeypatch.setattr(board, "maxFlipCells", 30)
+    hasher = BoardHasher()
+    hasher.update(board)
+    for _ in range(20):  # 20 generations of a glider flip more than 30 cells
+        board.step()
+    assert board.flips is None
+    assert hasher.update(board) == boardKey(board)
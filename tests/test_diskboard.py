@@ -0,0 +1,100 @@
+import random
+import pytest
+from diskboard import DiskBoard
+from engines import edgeModes, makeBoard
+from savefile import loadSnapshot, saveSnapshot, tilesPath
+
+@pytest.fixture
+def smallTiles(monkeypatch) -> None:  # many tiles on a small field, so the edges between them are tested
+    monkeypatch.setattr(DiskBoard, "tileSize", 16)
+
+def soup(boards, seed: int, size: int) -> None:
+    rng = random.Random(seed)
+    for y in range(size):
+        for x in range(size):
+            if rng.random() < 0.35:
+                for board in boards:
+                    board.setCell(x, y, 1)
+
+@pytest.mark.parametrize("edge", edgeModes)
+def testMatchesNumpyWithATinyBudget(smallTiles, monkeypatch, edge: str) -> None:
+    monkeypatch.setattr(DiskBoard, "budget", 9 * 16 * 16)  # only 9 tiles are resident at once
+    disk, reference = DiskBoard(70, edge), makeBoard("numpy", 70, edge)
+    try:
+        soup((disk, reference), 1, 70)
+        for generation in range(30):
+            disk.step()
+            reference.step()
+            assert disk.residentBytes <= 9 * 16 * 16
+        assert disk.toList() == reference.toList() and disk.population == reference.population
+        assert disk.pagedIn > 0 and disk.writtenBack > 0  # the tiles really went through the file
+        assert disk.boundingBox() == reference.boundingBox()
+    finally:
+        disk.close()
+
+@pytest.mark.parametrize("edge", edgeModes)
+def testTrackedBoxMatchesSearching(smallTiles, edge: str) -> None:  # the box kept along while stepping against the tiles
+    board = DiskBoard(70, edge)
+    try:
+        soup((board,), 2, 70)
+        board.trackStats = True
+        for generation in range(120):
+            board.step()
+            assert board.lastStats[2] == board.boundingBox(), f"generation {generation}"
+            if generation == 40:
+                board.setCell(69, 69, 1)
+    finally:
+        board.close()
+
+def testSettledTilesAreNotStepped(smallTiles) -> None:
+    board = DiskBoard(160)
+    try:
+        for x, y in ((40, 40), (41, 40), (40, 41), (41, 41)):  # a block
+            board.setCell(x, y, 1)
+        board.step()
+        board.step()
+        assert board.lastActiveTiles == 0
+    finally:
+        board.close()
+
+def testSaveAsAndReopen(smallTiles, tmp_path) -> None:
+    path = str(tmp_path / "field.tiles")
+    board = DiskBoard(100, "wrap")
+    soup((board,), 2, 100)
+    cells = board.toList()
+    board.saveAs(path)
+    board.step()
+    stepped = board.toList()
+    board.close()  # saves the stepped field into the same file
+    reopened = DiskBoard(100, "wrap", path)
+    try:
+        assert reopened.toList() == stepped != cells
+    finally:
+        reopened.close()
+    with pytest.raises(ValueError):
+        DiskBoard(50, "wrap", path)
+
+def testSaveFileKeepsTheTiles(smallTiles, tmp_path) -> None:
+    filename = str(tmp_path / "life.sav")
+    board = makeBoard("disk", 64)
+    soup((board,), 3, 64)
+    settings = {"steps": 1, "cameraPos": (0.0, 0.0), "cellSize": 4, "panSpeed": 1.0, "genSpeed": 5, "screenSize": (800, 600), "engine": "disk"}
+    saveSnapshot(filename, settings, board)
+    loaded, loadedBoard = loadSnapshot(filename)
+    try:
+        assert loaded["engine"] == "disk" and loadedBoard.path == tilesPath(filename)
+        assert loadedBoard.toList() == board.toList()
+    finally:
+        board.close()
+        loadedBoard.close()
+
+def testWindowCopy(smallTiles) -> None:
+    board = DiskBoard(64)
+    try:
+        soup((board,), 4, 64)
+        snapshot = board.copyWindow(10, 20, 30, 25)
+        assert snapshot.population == board.population
+        assert set(snapshot.liveCells()) == {(x, y) for x, y in board.liveCells() if 10 <= x < 30 and 20 <= y < 25}
+        assert snapshot.window(0, 0, 64, 64)[20:25, 10:30].tolist() == board.window(10, 20, 30, 25).tolist()
+    finally:
+        board.close()
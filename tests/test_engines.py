@@ -0,0 +1,171 @@
+from typing import Callable, Iterator, Optional
+from collections import Counter
+import random
+import pytest
+from engines import Board, canJump, edgeModes, engines, makeBoard
+from rules import Rule, life, parseRule
+
+# every engine against a plain python step that counts the neighbours of every cell (B3/S23 and other rules)
+
+size = 48
+
+def soup(board: Board, seed: int, x0: int, y0: int, width: int) -> None:  # a random square of alive cells, same seed same cells
+    rng = random.Random(seed)
+    for y in range(y0, y0 + width):
+        for x in range(x0, x0 + width):
+            if rng.random() < 0.4:
+                board.setCell(x, y, 1)
+
+@pytest.fixture
+def boards() -> Iterator[Callable[..., Board]]:  # makeBoard, every board made through it is closed afterwards (parallel pools)
+    made: list[Board] = []
+    def make(engine: str, size: int, edge: str = "frozen") -> Board:
+        made.append(makeBoard(engine, size, edge))
+        return made[-1]
+    yield make
+    for board in made:
+        if hasattr(board, "close"):
+            board.close()
+
+def cellsOf(board: Board) -> dict[tuple[int, int], int]:  # position -> state of every non empty cell
+    return {(x, y): board.getCell(x, y) for x, y in board.liveCells()}
+
+def offsetsOf(rule: Rule) -> list[tuple[int, int]]:  # the cells a cell counts as its neighbours
+    r = rule.radius
+    offsets = [(offsetX, offsetY) for offsetY in range(-r, r + 1) for offsetX in range(-r, r + 1)
+               if rule.neighbourhood == "M" or abs(offsetX) + abs(offsetY) <= r]
+    return offsets if rule.includeCentre else [offset for offset in offsets if offset != (0, 0)]
+
+def referenceStep(cells: dict[tuple[int, int], int], size: int, edge: Optional[str], rule: Rule = life) -> dict[tuple[int, int], int]:
+    # edge None: the plane. Only alive cells (state 1) are counted, dying cells of Generations rules just age
+    counts = Counter()
+    for (x, y), state in cells.items():
+        if state != 1:
+            continue
+        for offsetX, offsetY in offsetsOf(rule):
+            nx, ny = x + offsetX, y + offsetY
+            if edge == "wrap":
+                counts[(nx % size, ny % size)] += 1
+            elif edge is None or (0 <= nx < size and 0 <= ny < size):
+                counts[(nx, ny)] += 1
+    new = {}
+    for pos in counts.keys() | cells.keys():
+        state = rule.nextState(cells.get(pos, 0), counts[pos])
+        if state:
+            new[pos] = state
+    if edge == "frozen":  # the outer ring (as wide as the neighbourhood) keeps its cells
+        r = rule.radius
+        onBorder = lambda pos: min(pos[0], pos[1]) < r or max(pos[0], pos[1]) >= size - r
+        new = {pos: state for pos, state in new.items() if not onBorder(pos)}
+        new.update((pos, state) for pos, state in cells.items() if onBorder(pos))
+    return new
+
+@pytest.mark.parametrize("edge", edgeModes)
+@pytest.mark.parametrize("engine", list(engines))
+def testStepMatchesReference(boards: Callable[..., Board], engine: str, edge: str) -> None:
+    board = boards(engine, size, edge)
+    if not board.bounded:  # the whole plane is simulated, the edge has no meaning
+        soup(board, 1, -8, -8, 16)  # around the origin, negative positions too
+    else:
+        soup(board, 1, 0, 0, size)
+    expected = cellsOf(board)
+    for generation in range(1, 25):
+        assert board.step() == 1
+        expected = referenceStep(expected, size, edge if board.bounded else None)
+        assert cellsOf(board) == expected, f"generation {generation}"
+    assert board.population == len(expected)
+
+@pytest.mark.parametrize("rule", ["B36/S23", "B3678/S34678", "B2/S/C3", "B2/S345/C4", "R2,C0,M1,S3..8,B4..6,NN", "R3,C0,M0,S8..20,B10..14,NM"])
+@pytest.mark.parametrize("edge", edgeModes)
+@pytest.mark.parametrize("engine", list(engines))
+def testRulesMatchReference(boards: Callable[..., Board], engine: str, edge: str, rule: str) -> None:
+    board = boards(engine, size, edge)
+    if parseRule(rule).kind not in board.ruleKinds:
+        with pytest.raises(ValueError):
+            board.setRule(rule)
+        return
+    board.setRule(rule)
+    if not board.bounded:
+        soup(board, 6, -8, -8, 16)
+    else:
+        soup(board, 6, 0, 0, size)
+    expected = cellsOf(board)
+    for generation in range(1, 9):
+        board.step()
+        expected = referenceStep(expected, size, edge if board.bounded else None, parseRule(rule))
+        assert cellsOf(board) == expected, f"generation {generation}"
+
+def testB0OnlyOnBoundedFields() -> None:
+    with pytest.raises(ValueError):
+        makeBoard("hashlife", size, rule="B0/S8")
+    board = makeBoard("numpy", 8, "dead", "B0/S8")
+    board.step()
+    assert board.population == 64
+
+@pytest.mark.parametrize("engine", list(engines))
+def testJumpMatchesSteps(boards: Callable[..., Board], engine: str) -> None:
+    jumped, stepped = boards(engine, size, "wrap"), boards(engine, size, "wrap")
+    for board in (jumped, stepped):
+        soup(board, 3, 16, 16, 16)
+    for exponent in (0, 3, 2):
+        assert jumped.jump(exponent) == 1 << exponent
+        for _ in range(1 << exponent):
+            stepped.step()
+        assert cellsOf(jumped) == cellsOf(stepped)
+
+@pytest.mark.parametrize("engine", list(engines))
+def testLongJumpsAreRefused(boards: Callable[..., Board], engine: str) -> None:  # 2^60 steps would never finish
+    board = boards(engine, size, "wrap")
+    soup(board, 3, 16, 16, 16)
+    if canJump(board):
+        assert board.jump(60) == 1 << 60
+        return
+    with pytest.raises(ValueError):
+        board.jump(board.maxJumpExponent + 1)
+    with pytest.raises(ValueError):
+        board.jump(-1)
+
+@pytest.mark.parametrize("engine", list(engines))
+def testListRoundTrip(boards: Callable[..., Board], engine: str) -> None:
+    board = boards(engine, size)
+    soup(board, 2, 0, 0, size)
+    rows = board.toList()
+    other = boards(engine, size)
+    other.loadList(rows)
+    assert cellsOf(other) == cellsOf(board)
+    other.clear()
+    assert other.population == 0 and not list(other.liveCells())
+
+@pytest.mark.parametrize("engine", list(engines))
+def testBitsRoundTrip(boards: Callable[..., Board], engine: str) -> None:  # the packed field of one engine loads into any other
+    board = boards(engine, size)
+    soup(board, 4, 0, 0, size)
+    data = board.toBits()
+    assert len(data) == -(-size * size // 8)
+    for other in ("numpy", engine):
+        loaded = boards(other, size)
+        loaded.loadBits(data)
+        assert cellsOf(loaded) == cellsOf(board)
+
+@pytest.mark.parametrize("engine", list(engines))
+def testWindowAndCopy(boards: Callable[..., Board], engine: str) -> None:
+    board = boards(engine, size)
+    soup(board, 5, 0, 0, size)
+    for x0, y0, x1, y1 in ((0, 0, size, size), (5, 7, 20, 11), (-4, -3, 6, 9), (40, 40, size + 5, size + 2), (3, 3, 3, 8)):
+        window = board.window(x0, y0, x1, y1)
+        assert window.shape == (y1 - y0, x1 - x0)
+        expected = [[board.getCell(x, y) if 0 <= x < size and 0 <= y < size else 0 for x in range(x0, x1)] for y in range(y0, y1)]
+        assert window.tolist() == expected
+    snapshot = board.copy()
+    board.step()
+    board.setCell(1, 1, 1 - board.getCell(1, 1))
+    assert cellsOf(snapshot) != cellsOf(board)  # the copy does not follow the original
+    snapshot.step()
+    board.setCell(1, 1, 1 - board.getCell(1, 1))
+    assert cellsOf(snapshot) == cellsOf(board)
+
+def testUnknownEngineAndEdge() -> None:
+    with pytest.raises(ValueError):
+        makeBoard("nope", size)
+    with pytest.raises(ValueError):
+        makeBoard("numpy", size, "mirror")
@@ -0,0 +1,38 @@
+from hashlife import Hashlife
+
+glider = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]  # moves one cell down and right every 4 generations
+blinker = [(-20, 5), (-19, 5), (-18, 5)]
+
+def testGliderJumpsFar() -> None:
+    universe = Hashlife.fromCells(glider)
+    assert universe.step(40) == 1 << 40
+    assert universe.generation == 1 << 40
+    shift = 1 << 38
+    assert sorted(universe.liveCells()) == sorted((x + shift, y + shift) for x, y in glider)
+    assert universe.population == 5
+
+def testJumpsAddUp() -> None:  # 2^3 + 2^0 + 2^2 generations in jumps and one by one end up at the same cells
+    jumped, stepped = Hashlife.fromCells(glider + blinker), Hashlife.fromCells(glider + blinker)
+    for exponent in (3, 0, 2):
+        jumped.step(exponent)
+    for _ in range(13):
+        stepped.step()
+    assert sorted(jumped.liveCells()) == sorted(stepped.liveCells())
+
+def testCollectKeepsThePattern() -> None:  # a tiny node limit collects the garbage after every step
+    universe = Hashlife.fromCells(glider + blinker, maxNodes=50)
+    reference = Hashlife.fromCells(glider + blinker)
+    for _ in range(20):
+        universe.step(1)
+        reference.step(1)
+    assert sorted(universe.liveCells()) == sorted(reference.liveCells())
+
+def testCellAccess() -> None:
+    universe = Hashlife()
+    universe.setCell(-100, 300, 1)
+    universe.setCell(5, 5, 1)
+    assert universe.getCell(-100, 300) == 1 and universe.getCell(5, 6) == 0
+    universe.setCell(5, 5, 0)
+    assert list(universe.liveCells()) == [(-100, 300)]
+    universe.clear()
+    assert universe.population == 0
@@ -0,0 +1,70 @@
+import json
+import pytest
+from engines import makeBoard
+from headless import advance, loadBoard, main, parseArgs, runBatch, runJob
+
+class Recorder:  # a board that only remembers how it was advanced
+    def __init__(self) -> None:
+        self.calls: list[int] = []
+    def step(self) -> int:
+        self.calls.append(0)
+        return 1
+    def jump(self, exponent: int) -> int:
+        self.calls.append(exponent)
+        return 1 << exponent
+
+def testAdvanceUsesTheBinaryDigits() -> None:
+    board = Recorder()
+    assert advance(board, 1000) == 1000
+    assert board.calls == [9, 8, 7, 6, 5, 3]
+    board.calls.clear()
+    assert advance(board, 0) == 0 and board.calls == []
+
+def testAdvanceSplitsLongJumpsOfSteppingEngines(monkeypatch) -> None:
+    board = loadBoard("soup", "numpy", 16, "wrap")
+    monkeypatch.setattr(board, "maxJumpExponent", 2)
+    exponents = []
+    jump = board.jump
+    monkeypatch.setattr(board, "jump", lambda exponent: exponents.append(exponent) or jump(exponent))
+    assert advance(board, 0b10110) == 22
+    assert exponents == [2, 2, 2, 2, 2, 1]  # 16 in four jumps of 4, then 4 and 2
+
+def testAdvanceMatchesSteps() -> None:
+    advanced, stepped = loadBoard("soup", "numpy", 40, "wrap", seed=3), loadBoard("soup", "numpy", 40, "wrap", seed=3)
+    advance(advanced, 37)
+    for _ in range(37):
+        stepped.step()
+    assert advanced.toList() == stepped.toList()
+
+def testPatternIsCentred(tmp_path) -> None:
+    path = tmp_path / "glider.rle"
+    path.write_text("x = 3, y = 3\nbo$2bo$3o!\n")
+    board = loadBoard(str(path), "numpy", 11, "dead")
+    assert set(board.liveCells()) == {(5, 4), (6, 5), (4, 6), (5, 6), (6, 6)}
+
+def testRunJob() -> None:
+    job = {"pattern": "soup", "engine": "numpy", "edge": "wrap", "size": 32, "gens": 20, "seed": 5, "density": 0.3}
+    result = runJob(job)
+    board = loadBoard("soup", "numpy", 32, "wrap", seed=5)
+    advance(board, 20)
+    assert {key: result[key] for key in job} == job
+    assert result["population"] == board.population
+    assert result["gensPerSecond"] > 0 and result["cellsPerSecond"] == pytest.approx(result["gensPerSecond"] * 32 * 32)
+
+def testRunPrintsJson(capsys) -> None:
+    main(["run", "--engine", "list", "--size", "16", "--gens", "3", "--report", "json"])
+    result = json.loads(capsys.readouterr().out)
+    assert result["engine"] == "list" and result["gens"] == 3
+
+def testBatch(tmp_path) -> None:
+    out = tmp_path / "results.jsonl"
+    runBatch(parseArgs(["batch", "--engines", "numpy,list", "--seeds", "2", "--size", "20", "--gens", "8", "--workers", "2", "--out", str(out)]))
+    results = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [(result["engine"], result["seed"]) for result in results] == [("numpy", 0), ("numpy", 1), ("list", 0), ("list", 1)]
+    assert results[0]["population"] == results[2]["population"] and results[1]["population"] == results[3]["population"]
+
+def testUnknownEngines() -> None:
+    with pytest.raises(SystemExit):
+        parseArgs(["batch", "--engines", "numpy,nope"])
+    with pytest.raises(SystemExit):
+        parseArgs(["run", "--engine", "nope"])
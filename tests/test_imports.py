@@ -0,0 +1,10 @@
+import os, subprocess, sys
+import pytest
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.mark.parametrize("module", ["life", "headless", "profiler", "renderer", "Conways_game_of_life"])
+def testNoPygameOnImport(module: str) -> None:  # in a fresh interpreter, the test process has pygame loaded already
+    code = f"import sys, {module}; print('pygame' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,32 @@
+import random
+import pytest
+from multiprocessing import shared_memory
+from engines import NumpyBoard
+from parallel import ParallelBoard
+
+@pytest.mark.parametrize("workers", [1, 3, 7])  # stripes of different heights, one halo row between each
+@pytest.mark.parametrize("edge", ["frozen", "dead", "wrap"])
+def testStripesMatchNumpy(workers: int, edge: str) -> None:
+    rng = random.Random(workers)
+    board, reference = ParallelBoard(50, edge, workers), NumpyBoard(50, edge)
+    try:
+        for y in range(50):
+            for x in range(50):
+                if rng.random() < 0.3:
+                    board.setCell(x, y, 1)
+                    reference.setCell(x, y, 1)
+        for _ in range(20):
+            board.step()
+            reference.step()
+            assert board.toList() == reference.toList()
+    finally:
+        board.close()
+
+def testCloseFreesTheSharedMemory() -> None:
+    board = ParallelBoard(16, "dead", 2)
+    names = [memory.name for memory in board.memory]
+    board.close()
+    board.close()  # closing twice does nothing
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
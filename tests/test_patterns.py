@@ -0,0 +1,60 @@
+import io, random
+import pytest
+from patterns import (cellsFromRuns, readLegacy, readLife106, readMacrocell, readPattern, readPlaintext, readRLE,
+                      writeLife106, writeMacrocell, writePattern, writePlaintext, writeRLE)
+
+glider = {(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)}
+
+def normalised(cells) -> set[tuple[int, int]]:  # moved to the top left corner, for formats without a position
+    cells = set(cells)
+    if not cells:
+        return cells
+    minX, minY = min(x for x, y in cells), min(y for x, y in cells)
+    return {(x - minX, y - minY) for x, y in cells}
+
+def soup(seed: int) -> set[tuple[int, int]]:
+    rng = random.Random(seed)
+    return {(x, y) for y in range(-30, 50) for x in range(-70, 20) if rng.random() < 0.3}
+
+def roundTrip(write, read, cells) -> set[tuple[int, int]]:
+    f = io.StringIO()
+    write(f, iter(cells))
+    f.seek(0)
+    return set(cellsFromRuns(read(f)))
+
+def testReadRLE() -> None:
+    lines = ["#N Glider", "x = 3, y = 3, rule = B3/S23", "bob$2bo$3o!"]
+    assert set(cellsFromRuns(readRLE(lines))) == glider
+    lines = ["x = 0, y = 0", "2o$", "2o!", "3o!"]  # a block over two lines, nothing after the "!"
+    assert set(cellsFromRuns(readRLE(lines))) == {(0, 0), (1, 0), (0, 1), (1, 1)}
+    assert list(readRLE(["#CXRLE Pos=-5,7", "x = 3, y = 1", "12o2$o!"])) == [(-5, 7, 12), (-5, 9, 1)]
+
+def testReadOtherFormats() -> None:
+    assert set(cellsFromRuns(readPlaintext(["!Name: Glider", ".O", "..O", "OOO"]))) == glider
+    assert set(cellsFromRuns(readLife106(["#Life 1.06", "-1 4", "3 -2"]))) == {(-1, 4), (3, -2)}
+    assert set(cellsFromRuns(readLegacy(["(10, -3)\n", "(0, 0)\n", "\n"]))) == {(10, -3), (0, 0)}
+
+@pytest.mark.parametrize("seed", [1, 2])
+def testRoundTrips(seed: int) -> None:
+    cells = soup(seed)
+    assert roundTrip(writeRLE, readRLE, cells) == cells  # rle and life 1.06 keep the position
+    assert roundTrip(writeLife106, readLife106, cells) == cells
+    assert normalised(roundTrip(writePlaintext, readPlaintext, cells)) == normalised(cells)
+    assert normalised(roundTrip(writeMacrocell, readMacrocell, cells)) == normalised(cells)
+
+def testEmptyPatterns() -> None:
+    for write, read in ((writeRLE, readRLE), (writeLife106, readLife106), (writePlaintext, readPlaintext), (writeMacrocell, readMacrocell)):
+        assert roundTrip(write, read, set()) == set()
+
+def testFilesByExtension(tmp_path) -> None:
+    for extension in (".rle", ".lif", ".cells", ".mc"):
+        path = str(tmp_path / f"glider{extension}")
+        writePattern(path, glider)
+        assert normalised(cellsFromRuns(readPattern(path))) == glider
+    with pytest.raises(ValueError):
+        writePattern(str(tmp_path / "glider.png"), glider)
+    with pytest.raises(ValueError):
+        list(readPattern(str(tmp_path / "glider.png")))
+    (tmp_path / "old.lif").write_text("#Life 1.05\n*.*\n")
+    with pytest.raises(ValueError):
+        list(readPattern(str(tmp_path / "old.lif")))
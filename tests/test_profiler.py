@@ -0,0 +1,64 @@
+import csv, json
+import pytest
+from profiler import Profiler, quantilesOf
+
+def filled() -> Profiler:  # "step" took 1 to 100 ms, "draw" 5 ms
+    profiler = Profiler(("step", "draw"))
+    for i in range(1, 101):
+        profiler.record("step", 10.0 + i, i / 1000)
+    profiler.record("draw", 20.0, 0.005)
+    return profiler
+
+def testQuantiles() -> None:
+    assert quantilesOf([], (0.5, 0.99)) == [0.0, 0.0]
+    assert quantilesOf([1.0, 2.0, 3.0, 4.0], (0.0, 0.5, 0.99, 1.0)) == [1.0, 3.0, 4.0, 4.0]
+
+def testPercentiles() -> None:
+    profiler = filled()
+    assert profiler.percentiles("step", 0.5, 0.99) == pytest.approx([0.051, 0.1])
+    assert profiler.percentiles("draw", 0.5) == [0.005]
+    assert profiler.percentiles("unknown", 0.5) == [0.0]
+
+def testRingBufferKeepsTheLastSamples() -> None:
+    profiler = Profiler(("step",), samples=10, traceEvents=15)
+    for i in range(30):
+        profiler.record("step", float(i), float(i))
+    assert profiler.durationsCopy()["step"] == [float(i) for i in range(20, 30)]
+    assert [event[1] for event in profiler.traceCopy()] == [float(i) for i in range(15, 30)]
+
+def testTimersOnlyRecordWhileEnabled() -> None:
+    profiler = Profiler(("step",))
+    with profiler.phase("step"):
+        pass
+    assert profiler.durationsCopy() == {"step": []}
+    profiler.toggle()
+    with profiler.phase("step"):
+        pass
+    with profiler.phase("late"):  # phases can still be added on the fly
+        pass
+    durations = profiler.durationsCopy()
+    assert len(durations["step"]) == 1 and len(durations["late"]) == 1
+    profiler.toggle()
+    profiler.toggle()  # enabling again starts over
+    assert profiler.durationsCopy() == {"step": [], "late": []} and profiler.traceCopy() == []
+
+def testOverlayLines() -> None:
+    lines = filled().overlayLines(59.6, 1234.0, 42)
+    assert lines[0] == "fps: 60   gens/s: 1234   cells: 42"
+    assert [line.split() for line in lines[2:]] == [["step", "51.00", "100.00"], ["draw", "5.00", "5.00"]]
+    assert "cells: -" in Profiler().overlayLines(0, None, None)[0]
+
+def testDumps(tmp_path) -> None:
+    profiler = filled()
+    profiler.origin = 10.0
+    profiler.dumpCSV(str(tmp_path / "trace.csv"))
+    with open(tmp_path / "trace.csv") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 101 and rows[0]["phase"] == "step"
+    assert float(rows[0]["start_ms"]) == pytest.approx(1000.0) and float(rows[0]["duration_ms"]) == pytest.approx(1.0)
+    profiler.dumpChromeTrace(str(tmp_path / "trace.json"))
+    with open(tmp_path / "trace.json") as f:
+        events = json.load(f)["traceEvents"]
+    assert len(events) == 101
+    assert events[-1]["name"] == "draw" and events[-1]["ph"] == "X"
+    assert events[-1]["ts"] == pytest.approx(10e6) and events[-1]["dur"] == pytest.approx(5000)
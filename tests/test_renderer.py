@@ -0,0 +1,27 @@
+from renderer import TextCache, visibleWindow, windowFromCells
+
+def testVisibleWindow() -> None:
+    assert visibleWindow((0, 0), 10, (100, 50)) == (0, 0, 10, 5)
+    assert visibleWindow((-15, 25), 10, (100, 50)) == (1, -3, 12, 3)  # partly visible cells count
+    assert visibleWindow((0, 0), 10, (100, 50), bounds=(0, 0, 4, 20)) == (0, 0, 4, 5)
+    assert visibleWindow((500, 0), 10, (100, 50), bounds=(0, 0, 4, 4)) == (0, 0, 0, 4)  # field left of the screen: empty
+
+def testWindowFromCells() -> None:
+    window = windowFromCells([(0, 0), (2, 1), (-1, 1), (5, 5)], -1, 0, 3, 2)
+    assert window.tolist() == [[0, 1, 0, 0],
+                               [1, 0, 0, 1]]
+    assert windowFromCells([], 0, 0, 2, 1).tolist() == [[0, 0]]
+
+def testTextIsOnlyRenderedWhenItChanges() -> None:
+    import pygame
+    screen = pygame.Surface((200, 100))
+    text = TextCache(20)
+    rect = text.draw(screen, "steps", "steps: 1", "white", topleft=(10, 10))
+    assert rect.topleft == (10, 10)
+    first = text.lines["steps"][2]
+    text.draw(screen, "steps", "steps: 1", "white", topleft=(10, 40))
+    assert text.lines["steps"][2] is first
+    text.draw(screen, "steps", "steps: 1", "red", topleft=(10, 10))
+    assert text.lines["steps"][2] is not first
+    text.draw(screen, "speed", "speed: 5", "white", topright=(190, 10))
+    assert set(text.lines) == {"steps", "speed"}
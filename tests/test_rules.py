@@ -0,0 +1,45 @@
+import pytest
+from rules import parseRule, presets
+
+def testBirthSurvive() -> None:
+    rule = parseRule("B36/S23")
+    assert rule.birth == {3, 6} and rule.survive == {2, 3} and rule.states == 2 and rule.kind == "simple"
+    assert parseRule("b36/s23").string == "B36/S23"
+    assert parseRule("23/36").string == "B36/S23"  # S/B order
+    assert parseRule("B2/S").survive == frozenset() and parseRule("B2/S").string == "B2/S"
+    assert parseRule(" B3/S23 ") is parseRule(" B3/S23 ")  # cached
+
+def testGenerations() -> None:
+    rule = parseRule("B2/S/C3")
+    assert rule.states == 3 and rule.kind == "generations" and not rule.isSimple
+    assert parseRule("/2/3").string == "B2/S/C3"
+    assert [rule.nextState(1, count) for count in (0, 2)] == [2, 2]  # not surviving: starts dying
+    assert rule.nextState(2, 2) == 0 and rule.nextState(0, 2) == 1
+    assert parseRule("B2/S345/C4").nextState(2, 3) == 3
+
+def testLargerThanLife() -> None:
+    rule = parseRule(presets["bosco"])
+    assert (rule.radius, rule.neighbourhood, rule.includeCentre, rule.states) == (5, "M", True, 2)
+    assert rule.birth == set(range(34, 46)) and rule.survive == set(range(34, 59))
+    assert rule.kind == "larger" and rule.maxCount == 121
+    assert rule.string == "R5,C0,M1,S34..58,B34..45,NM"
+    diamond = parseRule("R2,C3,M0,S1..3,B2..2,NN")
+    assert diamond.maxCount == 12 and diamond.states == 3 and diamond.string == "R2,C3,M0,S1..3,B2..2,NN"
+
+def testTables() -> None:
+    rule = parseRule("B3/S23")
+    assert rule.countTable[0][3] == 1 and rule.countTable[1][2] == 1 and rule.countTable[1][4] == 0
+    assert len(rule.neighbourhoodTable) == 512 and rule.neighbourhoodTable[0b000_111_000] == 1  # centre and 2 neighbours
+    assert rule.bitTable >> (9 * 0 + 3) & 1 and not rule.bitTable >> (9 * 0 + 2) & 1
+    # the 4x4 block of a blinker: the middle 2x2 of the vertical phase
+    horizontal = sum(1 << (1 * 4 + x) for x in range(3))
+    assert rule.blockTable[horizontal] == 0b0101  # nw and sw of the middle are alive one generation later
+
+@pytest.mark.parametrize("text", ["", "life", "B9/S23", "B3/S23/C1", "B3/S23/C300", "R11,C0,M1,S1..2,B1..2,NM", "R2,C0,M0,S1..30,B1..2,NN"])
+def testInvalidRules(text: str) -> None:
+    with pytest.raises(ValueError):
+        parseRule(text)
+
+def testPresetsParse() -> None:
+    for text in presets.values():
+        assert parseRule(parseRule(text).string).string == parseRule(text).string
@@ -0,0 +1,115 @@
+import json, os, struct, zlib
+import pytest
+from engines import makeBoard
+from savefile import SaveFormatError, headerFormats, loadSnapshot, migrateJsonConfig, saveSnapshot
+
+settings = {"steps": 42, "cameraPos": (-12.5, 30.0), "cellSize": 8, "panSpeed": 1.5, "genSpeed": 7, "screenSize": (800, 600)}
+
+def glider(board) -> None:
+    for x, y in ((1, 0), (2, 1), (0, 2), (1, 2), (2, 2)):
+        board.setCell(x + 10, y + 20, 1)
+
+def testRoundTrip(tmp_path) -> None:
+    board = makeBoard("numpy", 37, "wrap")
+    glider(board)
+    filename = str(tmp_path / "save.gol")
+    saveSnapshot(filename, dict(settings, engine="numpy", rule="B3/S23"), board)
+    loaded, loadedBoard = loadSnapshot(filename)
+    assert loaded == dict(settings, fieldSize=37, engine="numpy", edge="wrap", rule="B3/S23")
+    assert loadedBoard.toList() == board.toList()
+    assert [name for name in os.listdir(tmp_path)] == ["save.gol"]  # no temporary file left behind
+
+def testBrokenSaveFiles(tmp_path) -> None:
+    board = makeBoard("numpy", 37)
+    glider(board)
+    filename = str(tmp_path / "save.gol")
+    saveSnapshot(filename, settings, board)
+    with open(filename, "rb") as f:
+        content = f.read()
+    headerSize = struct.calcsize(headerFormats[2])
+    broken = [b"", b"GOLS", b"NOPE" + bytes(100), content[:4] + b"\x63\x00" + content[6:],  # empty, short, not a save, unknown version
+              content[:headerSize - 3], content[:headerSize + 4], content[:-5], content[:-1] + b"x"]  # cut in the header, names and body
+    broken.append(content[:-len(zlib.compress(board.toBits(), 1))] + zlib.compress(board.toBits()[:-10], 1))  # a field too short
+    for data in broken:
+        path = tmp_path / "broken.gol"
+        path.write_bytes(data)
+        with pytest.raises(SaveFormatError):
+            loadSnapshot(str(path))
+
+@pytest.mark.parametrize("name, replacement", [(b"numpy", b"nompy"), (b"frozen", b"frizen"), (b"B3/S23", b"B3/Sxx")])
+def testUnknownNamesAreFormatErrors(tmp_path, name: bytes, replacement: bytes) -> None:  # engine, edge and rule of the header
+    filename = str(tmp_path / "save.gol")
+    saveSnapshot(filename, dict(settings, engine="numpy", rule="B3/S23"), makeBoard("numpy", 8))
+    with open(filename, "rb") as f:
+        content = f.read()
+    with open(filename, "wb") as f:
+        f.write(content.replace(name, replacement, 1))
+    with pytest.raises(SaveFormatError):
+        loadSnapshot(filename)
+
+def testSavesKeepTheirPermissions(tmp_path) -> None:
+    filename = str(tmp_path / "save.gol")
+    umask = os.umask(0o022)
+    try:
+        saveSnapshot(filename, settings, makeBoard("numpy", 8))
+        assert os.stat(filename).st_mode & 0o777 == 0o644  # like any new file, not the 0600 of the temporary file
+        os.chmod(filename, 0o640)
+        saveSnapshot(filename, settings, makeBoard("numpy", 8))
+        assert os.stat(filename).st_mode & 0o777 == 0o640
+    finally:
+        os.umask(umask)
+
+@pytest.mark.parametrize("packed", [False, True])
+def testMigrateJsonConfig(tmp_path, packed: bool) -> None:
+    board = makeBoard("numpy", 30)
+    glider(board)
+    config = dict(settings, cameraPos=list(settings["cameraPos"]), screenSize=list(settings["screenSize"]), fieldSize=30)
+    if packed:
+        import base64
+        config["fieldBits"] = base64.b64encode(board.toBits()).decode()
+    else:
+        config["field"] = board.toList()
+    jsonFile, filename = tmp_path / "config.ini", str(tmp_path / "save.gol")
+    jsonFile.write_text(json.dumps(config))
+    assert migrateJsonConfig(str(jsonFile), filename, "numpy")
+    assert not jsonFile.exists() and (tmp_path / "config.ini.bak").exists()
+    loaded, loadedBoard = loadSnapshot(filename)
+    assert loaded["steps"] == 42 and loaded["cameraPos"] == (-12.5, 30.0) and loaded["edge"] == "frozen"
+    assert loadedBoard.toList() == board.toList()
+    assert not migrateJsonConfig(str(jsonFile), filename, "numpy")  # nothing left to migrate
+
+def testMigrateIntoABoundedField(tmp_path) -> None:  # the old field had a frozen edge, the unbounded planes dont
+    board = makeBoard("numpy", 30)
+    for x, y in ((28, 10), (29, 10), (28, 11)):  # cells at the edge stay as they are
+        board.setCell(x, y, 1)
+    config = dict(settings, cameraPos=list(settings["cameraPos"]), screenSize=list(settings["screenSize"]), fieldSize=30, field=board.toList())
+    jsonFile, filename = tmp_path / "config.ini", str(tmp_path / "save.gol")
+    jsonFile.write_text(json.dumps(config))
+    assert migrateJsonConfig(str(jsonFile), filename, "chunked")
+    loaded, loadedBoard = loadSnapshot(filename)
+    assert loadedBoard.bounded and loadedBoard.edge == "frozen" and loaded["engine"] != "chunked"
+    board.step()
+    loadedBoard.step()
+    assert loadedBoard.toList() == board.toList()
+
+@pytest.mark.parametrize("engine", ["chunked", "hashlife"])
+def testUnboundedRoundTrip(tmp_path, engine: str) -> None:  # only the bounding box is stored, wherever it is on the plane
+    board = makeBoard(engine, 100)
+    for x, y in ((1, 0), (2, 1), (0, 2), (1, 2), (2, 2), (-5000, 7000)):
+        board.setCell(x - 300, y - 200, 1)
+    filename = str(tmp_path / "save.gol")
+    saveSnapshot(filename, dict(settings, engine=engine), board)
+    loaded, loadedBoard = loadSnapshot(filename)
+    assert loaded["engine"] == engine and set(loadedBoard.liveCells()) == set(board.liveCells())
+    saveSnapshot(filename, dict(settings, engine=engine), makeBoard(engine, 100))
+    assert loadSnapshot(filename)[1].population == 0
+
+def testVersion1StillLoads(tmp_path) -> None:
+    board = makeBoard("numpy", 20)
+    board.setCell(3, 4, 1)
+    names = [b"numpy", b"frozen", b"B3/S23"]
+    header = struct.pack(headerFormats[1], b"GOLS", 1, 42, -12.5, 30.0, 8, 1.5, 7, 800, 600, 20, *map(len, names))
+    path = tmp_path / "old.gol"
+    path.write_bytes(header + b"".join(names) + zlib.compress(board.toBits()))
+    loaded, loadedBoard = loadSnapshot(str(path))
+    assert loaded["steps"] == 42 and set(loadedBoard.liveCells()) == {(3, 4)}
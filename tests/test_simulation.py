@@ -0,0 +1,113 @@
+from time import perf_counter, sleep
+from typing import Callable
+from simulation import Simulation
+
+def waitFor(condition: Callable[[], bool], timeout: float = 5.0) -> bool:
+    end = perf_counter() + timeout
+    while not condition():
+        if perf_counter() > end:
+            return False
+        sleep(0.001)
+    return True
+
+class Counter:  # a stand in board: its state is the amount of generations and the edits applied to it
+    def __init__(self) -> None:
+        self.generation = 0
+        self.edits: list[tuple[int, int]] = []  # (edit, generation it was applied at)
+
+    def advance(self) -> int:
+        self.generation += 1
+        return 1
+
+    def capture(self) -> tuple[int, int]:
+        return (self.generation, len(self.edits))
+
+    def edit(self, value: int) -> None:
+        self.edits.append((value, self.generation))
+
+def testCommandsRunInOrder() -> None:
+    board = Counter()
+    simulation = Simulation(board.advance, board.capture)
+    simulation.start()
+    try:
+        for value in range(200):
+            simulation.submit(board.edit, value)
+            if value % 50 == 0:
+                simulation.stepOnce()
+        assert waitFor(lambda: simulation.snapshot == (4, 200))
+    finally:
+        simulation.stop()
+    assert [value for value, _ in board.edits] == list(range(200))
+    assert [generation for _, generation in board.edits] == sorted(generation for _, generation in board.edits)  # steps stay between the edits
+    assert board.edits[50] == (50, 1) and board.edits[51] == (51, 2)
+
+def testSnapshotIsPublishedWhilePaused() -> None:
+    board = Counter()
+    simulation = Simulation(board.advance, board.capture)
+    assert simulation.snapshot == (0, 0)  # the first snapshot is made right away
+    simulation.start()
+    try:
+        simulation.submit(board.edit, 1)
+        assert waitFor(lambda: simulation.snapshot == (0, 1))
+        simulation.stepOnce()
+        assert waitFor(lambda: simulation.snapshot == (1, 1))
+        sleep(0.05)
+        assert board.generation == 1  # paused: nothing advances on its own
+    finally:
+        simulation.stop()
+
+def testRunningAndPausing() -> None:
+    board = Counter()
+    simulation = Simulation(board.advance, board.capture)
+    simulation.start()
+    try:
+        simulation.setRunning(True)
+        assert waitFor(lambda: board.generation >= 100)
+        assert simulation.gensPerSecond > 0
+        simulation.setRunning(False)
+        assert waitFor(lambda: simulation.snapshot[0] == board.generation)  # the last generation is published too
+        paused = board.generation
+        sleep(0.05)
+        assert board.generation == paused
+    finally:
+        simulation.stop()
+    assert not simulation.is_alive()
+
+def testIntervalThrottles() -> None:
+    board = Counter()
+    simulation = Simulation(board.advance, board.capture)
+    simulation.interval = 0.02
+    simulation.start()
+    try:
+        simulation.setRunning(True)
+        sleep(0.2)
+    finally:
+        simulation.stop()
+    assert 2 <= board.generation <= 15
+
+def testExceptionsAreReportedAndTheThreadKeepsGoing(capsys) -> None:
+    board = Counter()
+    failing = [3]  # the generation at which advancing fails once
+
+    def advance() -> int:
+        if board.generation in failing:
+            failing.clear()
+            raise RuntimeError("broken step")
+        return board.advance()
+
+    simulation = Simulation(advance, board.capture)
+    simulation.start()
+    try:
+        simulation.submit(lambda: 1 / 0)
+        simulation.submit(board.edit, 1)
+        assert waitFor(lambda: simulation.snapshot == (0, 1))  # the commands after the failing one still run
+        assert isinstance(simulation.error, ZeroDivisionError)
+        simulation.setRunning(True)
+        assert waitFor(lambda: not simulation.running)  # a failing step pauses
+        assert isinstance(simulation.error, RuntimeError) and board.generation == 3
+        simulation.stepOnce()
+        assert waitFor(lambda: simulation.snapshot == (4, 1))
+    finally:
+        simulation.stop()
+    assert not simulation.is_alive()
+    assert "ZeroDivisionError" in capsys.readouterr().err
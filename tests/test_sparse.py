@@ -0,0 +1,108 @@
+from collections import Counter
+import random
+import pytest
+from rules import parseRule
+from sparse import IncrementalLife, SparseLife, neighbourOffsets
+
+glider = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]  # the glider paste_copy places (relative to the mouse)
+
+def referenceStep(cells: set[tuple[int, int]]) -> set[tuple[int, int]]:  # B3/S23 over every cell of the bounding box and its border
+    if not cells:
+        return set()
+    xs, ys = [x for x, _ in cells], [y for _, y in cells]
+    new = set()
+    for y in range(min(ys) - 1, max(ys) + 2):
+        for x in range(min(xs) - 1, max(xs) + 2):
+            n = sum((x + offsetX, y + offsetY) in cells for offsetX, offsetY in neighbourOffsets)
+            if n == 3 or (n == 2 and (x, y) in cells):
+                new.add((x, y))
+    return new
+
+def oldAdvanceState(cells: list[tuple[int, int]]) -> set[tuple[int, int]]:
+    # what advance_state of Conways_game_of_life.py did before the sparse engine: only the dead neighbours
+    # of alive cells with 1 or 2 neighbours were checked for births
+    amount = lambda x, y: sum((x + offsetX, y + offsetY) in cells for offsetX, offsetY in neighbourOffsets)
+    dead, born = [], []
+    for x, y in cells:
+        n = amount(x, y)
+        if n <= 1 or n >= 4:
+            dead.append((x, y))
+        if n in (1, 2):
+            born += [pos for pos in ((x + offsetX, y + offsetY) for offsetX, offsetY in neighbourOffsets) if pos not in cells and amount(*pos) == 3]
+    return {pos for pos in cells if pos not in dead} | set(born)
+
+@pytest.mark.parametrize("engine", [SparseLife, IncrementalLife])
+def testStepMatchesReference(engine: type) -> None:
+    rng = random.Random(1)
+    cells = {(x, y) for y in range(-20, 20) for x in range(-20, 20) if rng.random() < 0.35}
+    universe = engine(cells)
+    for generation in range(1, 40):
+        assert universe.step() == 1
+        cells = referenceStep(cells)
+        assert universe.cells == cells, f"generation {generation}"
+    assert universe.population == len(cells) == len(universe)
+
+def testGliderLikeTheOldAdvanceState() -> None:
+    universe, cells = SparseLife(glider), list(glider)
+    for _ in range(28):
+        universe.step()
+        cells = list(oldAdvanceState(cells))
+        assert universe.cells == set(cells)
+    assert universe.cells == {(x + 7, y + 7) for x, y in glider}  # one cell down and right every 4 generations
+
+def testOldAdvanceStateMissedBirths() -> None:
+    # the documented difference: a dead cell with 3 neighbours that each have no other neighbour was never born before
+    cells = [(0, 0), (2, 0), (0, 2)]
+    universe = SparseLife(cells)
+    universe.step()
+    assert universe.cells == {(1, 1)}
+    assert oldAdvanceState(cells) == set()
+
+def testNewCellsAreASupersetOfTheOldOnes() -> None:  # only births are missing from the old result
+    rng = random.Random(2)
+    cells = [(x, y) for y in range(12) for x in range(12) if rng.random() < 0.5]
+    universe = SparseLife(cells)
+    universe.step()
+    old = oldAdvanceState(cells)
+    assert old <= universe.cells
+    counts = Counter((x + offsetX, y + offsetY) for x, y in cells for offsetX, offsetY in neighbourOffsets)
+    assert all(pos not in cells and counts[pos] == 3 for pos in universe.cells - old)
+
+def testIncrementalCountsFollowEdits() -> None:  # edits between steps go through the same counts
+    rng = random.Random(3)
+    cells = {(x, y) for y in range(16) for x in range(16) if rng.random() < 0.4}
+    universe = IncrementalLife(cells)
+    for generation in range(30):
+        universe.step()
+        cells = referenceStep(cells)
+        pos = (rng.randrange(-2, 18), rng.randrange(-2, 18))
+        universe.toggle(pos)
+        cells ^= {pos}
+        assert universe.cells == cells, f"generation {generation}"
+    counts = Counter((x + offsetX, y + offsetY) for x, y in cells for offsetX, offsetY in neighbourOffsets)
+    assert universe.counts == counts  # no zero counts are left behind
+
+def testIncrementalRules() -> None:
+    rng = random.Random(4)
+    cells = {(x, y) for y in range(20) for x in range(20) if rng.random() < 0.4}
+    plain, incremental = SparseLife(cells, parseRule("B36/S23")), IncrementalLife(cells)
+    incremental.setRule(parseRule("B36/S23"))
+    for _ in range(20):
+        plain.step()
+        incremental.step()
+        assert incremental.cells == plain.cells
+    with pytest.raises(ValueError):
+        incremental.setRule(parseRule("B0/S8"))
+
+@pytest.mark.parametrize("engine", [SparseLife, IncrementalLife])
+def testEdits(engine: type) -> None:
+    universe = engine()
+    assert universe.toggle((3, 4)) == 1 and (3, 4) in universe
+    assert universe.toggle((3, 4)) == 0 and (3, 4) not in universe
+    universe.add((1, 1))
+    universe.add((-2, 5))
+    universe.discard((7, 7))  # not alive, nothing happens
+    universe.translate(2, -1)
+    assert sorted(universe) == [(0, 4), (3, 0)]
+    universe.clear()
+    assert universe.population == 0 and universe.boundingBox() is None
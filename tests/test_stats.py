@@ -0,0 +1,109 @@
+import random
+import pytest
+from engines import engines, makeBoard
+from sparse import IncrementalLife, SparseLife
+from stats import StatsCollector, fields, readStats
+
+def soup(board, seed: int = 1, width: int = 30) -> None:
+    rng = random.Random(seed)
+    for y in range(5, 5 + width):
+        for x in range(5, 5 + width):
+            if rng.random() < 0.4:
+                board.setCell(x, y, 1)
+
+@pytest.mark.parametrize("engine", list(engines))
+def testObserveMatchesCounting(engine: str) -> None:  # what the engines track while stepping against counting afterwards
+    board = makeBoard(engine, 48, "dead")
+    try:
+        soup(board)
+        stats = StatsCollector()
+        stats.observe(board, 0)
+        for generation in range(1, 25):
+            before = set(board.liveCells())
+            board.step()
+            after = set(board.liveCells())
+            box = board.boundingBox()
+            if generation == 12:  # the population is counted again after an edit, births and deaths are the ones of the step
+                board.setCell(1, 1, 1)
+                stats.resync()
+            sample = dict(zip(fields, stats.observe(board, generation)))
+            assert sample["generation"] == generation and sample["population"] == board.population
+            if sample["births"] != -1:  # engines that cant tell report -1
+                assert (sample["births"], sample["deaths"]) == (len(after - before), len(before - after)), f"generation {generation}"
+                assert (sample["x0"], sample["y0"], sample["x1"], sample["y1"]) == (box or (0, 0, 0, 0))
+    finally:
+        if hasattr(board, "close"):
+            board.close()
+
+@pytest.mark.parametrize("engine", list(engines))
+def testTrackedBoxesFollowLongRuns(engine: str) -> None:  # the engines that keep the box along while the soup dies down
+    board = makeBoard(engine, 40, "wrap")
+    try:
+        soup(board, seed=3, width=30)
+        board.trackStats = True
+        for generation in range(150):
+            board.step()
+            if board.lastStats is not None:
+                assert board.lastStats[2] == board.boundingBox(), f"generation {generation}"
+            if generation == 60:
+                board.setCell(0, 0, 1)
+    finally:
+        if hasattr(board, "close"):
+            board.close()
+
+@pytest.mark.parametrize("engine", [SparseLife, IncrementalLife])
+def testObserveSparse(engine: type) -> None:
+    universe = engine()
+    rng = random.Random(2)
+    for y in range(-10, 10):
+        for x in range(-10, 10):
+            if rng.random() < 0.4:
+                universe.add((x, y))
+    stats = StatsCollector()
+    stats.observe(universe, 0)
+    for generation in range(1, 30):
+        before = set(universe.cells)
+        universe.step()
+        generation, population, births, deaths, *box, active = stats.observe(universe, generation)
+        assert (population, births, deaths) == (len(universe.cells), len(universe.cells - before), len(before - universe.cells))
+        assert tuple(box) == (universe.boundingBox() or (0, 0, 0, 0)) and active == universe.activeCells
+
+def testJumpsAreCountedAfterwards() -> None:
+    board = makeBoard("numpy", 32, "wrap")
+    soup(board, width=20)
+    stats = StatsCollector()
+    stats.observe(board, 0)
+    board.jump(3)
+    sample = stats.observe(board, 8, gens=8)
+    assert sample[1:4] == (board.population, -1, -1)
+
+def testRingBuffer() -> None:
+    stats = StatsCollector(capacity=4)
+    for generation in range(10):
+        stats.add((generation, generation * 10, 0, 0, 0, 0, 0, 0, 0))
+    assert stats.series() == [60, 70, 80, 90] and stats.series("generation") == [6, 7, 8, 9]
+    assert stats.last[0] == 9
+    stats.clear()
+    assert stats.series() == [] and stats.last is None
+
+@pytest.mark.parametrize("name", ["stats.csv", "stats.bin"])
+def testLogs(tmp_path, monkeypatch, name: str) -> None:
+    import stats as statsModule
+    monkeypatch.setattr(statsModule, "blockSize", 7)  # more than one block
+    path = str(tmp_path / name)
+    samples = [(generation, generation * 3, 1, -1, -5, 0, 5, 9, 100) for generation in range(20)]
+    collector = StatsCollector(capacity=2, log=path)
+    for sample in samples[:12]:
+        collector.add(sample)
+    collector.close()
+    collector = StatsCollector(log=path)  # appends, the header is not written again
+    for sample in samples[12:]:
+        collector.add(sample)
+    collector.close()
+    assert list(readStats(path)) == samples
+
+def testNotAStatsLog(tmp_path) -> None:
+    path = tmp_path / "stats.bin"
+    path.write_bytes(b"nope")
+    with pytest.raises(ValueError):
+        list(readStats(str(path)))
@@ -0,0 +1,36 @@
+import random
+from engines import NumpyBoard
+from tiled import TiledBoard
+
+def testStillLifeCostsNothing() -> None:
+    board = TiledBoard(160)
+    for x, y in ((40, 40), (41, 40), (40, 41), (41, 41)):  # a block
+        board.setCell(x, y, 1)
+    board.step()
+    assert board.lastActiveTiles == 9  # the tile of the edit and its neighbours
+    board.step()
+    assert board.lastActiveTiles == 0
+    assert sorted(board.liveCells()) == [(40, 40), (40, 41), (41, 40), (41, 41)]
+
+def testOscillatorOnlyWakesItsTiles() -> None:
+    board = TiledBoard(160)
+    for x in (79, 80, 81):  # a blinker in the middle of tile (2, 2)
+        board.setCell(x, 80, 1)
+    for _ in range(10):
+        board.step()
+        assert board.lastActiveTiles == 9
+
+def testSmallTilesMatchNumpy(monkeypatch) -> None:  # many tile borders (and a last tile that reaches over the field)
+    monkeypatch.setattr(TiledBoard, "tileSize", 8)
+    rng = random.Random(4)
+    for edge in ("frozen", "dead", "wrap"):
+        tiled, reference = TiledBoard(44, edge), NumpyBoard(44, edge)
+        for y in range(44):
+            for x in range(44):
+                if rng.random() < 0.3:
+                    tiled.setCell(x, y, 1)
+                    reference.setCell(x, y, 1)
+        for _ in range(60):
+            tiled.step()
+            reference.step()
+            assert sorted(tiled.liveCells()) == sorted(reference.liveCells())
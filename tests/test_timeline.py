@@ -0,0 +1,111 @@
+import random
+import pytest
+from engines import makeBoard
+from timeline import Timeline, boardState, entryBytes, cellsFromState, cellsState, difference, loadBoardState, pack, unpack
+
+def soupBoard(engine: str = "numpy", size: int = 40):
+    board = makeBoard(engine, size, "wrap")
+    rng = random.Random(1)
+    for y in range(10, 30):
+        for x in range(10, 30):
+            if rng.random() < 0.4:
+                board.setCell(x, y, 1)
+    return board
+
+def recorded(board, timeline: Timeline, gens: int) -> list[set]:  # the alive cells of every recorded generation
+    history = []
+    for generation in range(gens):
+        if generation:
+            board.step()
+        timeline.record(boardState(board), generation)
+        history.append(set(board.liveCells()))
+    return history
+
+def cellsOf(state) -> set:
+    return set(cellsFromState(state))
+
+@pytest.mark.parametrize("engine", ["numpy", "chunked"])
+def testSeekAnyGeneration(engine: str) -> None:
+    board, timeline = soupBoard(engine), Timeline(interval=8)
+    history = recorded(board, timeline, 50)
+    for position in (49, 48, 40, 3, 4, 17, 0, 31, 32, 49):  # near the current entry and across segments
+        assert cellsOf(timeline.seek(position)) == history[position]
+        assert timeline.position == position
+    assert cellsOf(timeline.seekGeneration(20)) == history[20]
+    assert timeline.seekGeneration(50) is None
+    with pytest.raises(LookupError):
+        timeline.seek(50)
+
+def testLoadBoardState() -> None:
+    board, timeline = soupBoard(), Timeline(interval=8)
+    history = recorded(board, timeline, 12)
+    loadBoardState(board, timeline.seek(5))
+    assert set(board.liveCells()) == history[5]
+    state = cellsState([(-3, 4), (2, 9)])
+    assert state[:2] == (-3, 4) and cellsOf(state) == {(-3, 4), (2, 9)}
+    assert cellsOf(unpack(pack(difference(state, cellsState([(2, 9)]))))) == {(-3, 4)}
+
+def testUndoRedo() -> None:
+    board, timeline = soupBoard(), Timeline(interval=4)
+    recorded(board, timeline, 6)
+    before = set(board.liveCells())
+    board.setCell(0, 0, 1)
+    timeline.record(boardState(board), 5, "edit")
+    edited = set(board.liveCells())
+    board.step()
+    timeline.record(boardState(board), 6)
+    target = timeline.undoTarget()
+    assert target == 5 and cellsOf(timeline.seek(target)) == before
+    assert timeline.undoTarget() is None  # nothing edited before
+    target = timeline.redoTarget()
+    assert target == 6 and cellsOf(timeline.seek(target)) == edited
+    assert timeline.redoTarget() is None
+    timeline.seek(5)
+    timeline.record(boardState(board), 7)  # recording after going back drops the redo history
+    assert timeline.redoTarget() is None and not timeline.available(7)
+
+def testEvictionKeepsTheBudget() -> None:
+    board = soupBoard("numpy", 64)
+    timeline = Timeline(interval=4, budget=4000)
+    history = recorded(board, timeline, 80)
+    assert timeline.evicted > 0 and timeline.nbytes <= timeline.budget
+    assert timeline.nbytes == sum(segment.nbytes for segment in timeline.segments.values())
+    assert not timeline.available(0) and timeline.seekGeneration(0) is None
+    assert timeline.available(79) and cellsOf(timeline.seek(79)) == history[79]
+    timeline.clear()
+    assert timeline.nbytes == 0 and not timeline.available(0)
+
+def testEntriesAreCountedAndEvicted() -> None:  # a settled board costs next to nothing per delta, the entries themselves count
+    board = makeBoard("numpy", 16)
+    board.setCell(3, 3, 1)
+    timeline = Timeline(interval=16, budget=20_000)
+    for generation in range(5000):
+        timeline.record(boardState(board), generation)
+    kept = sum(len(segment.generations) for segment in timeline.segments.values())
+    assert timeline.nbytes <= timeline.budget and kept * entryBytes <= timeline.budget
+    assert timeline.length == 5000 and timeline.evicted > 0
+    assert timeline.generationOf(4999) == 4999
+    with pytest.raises(LookupError):
+        timeline.generationOf(0)
+
+def testGenerationsAndEditsAcrossSegments() -> None:
+    board, timeline = soupBoard(), Timeline(interval=4)
+    history = {}
+    for generation in range(12):
+        board.step()
+        timeline.record(boardState(board), generation)
+        if generation in (2, 3, 7):  # the edits have the generation of the step before them
+            board.setCell(generation, 0, 1)
+            timeline.record(boardState(board), generation, "edit")
+        history[generation] = set(board.liveCells())
+    assert timeline.length == 15
+    for generation in (11, 0, 3, 7, 4):  # the last entry of a generation, the edit if there is one
+        assert cellsOf(timeline.seekGeneration(generation)) == history[generation]
+        assert timeline.generationOf(timeline.position) == generation
+    timeline.seek(14)
+    targets = []
+    while (target := timeline.undoTarget()) is not None:
+        targets.append(target)
+        timeline.seek(target)
+    assert targets == [9, 4, 2]  # before each edit, from the last one
+    assert timeline.redoTarget() == 3 and timeline.seek(3) is not None and timeline.redoTarget() == 5
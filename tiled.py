@@ -0,0 +1,150 @@
+from typing import Iterator, Literal, Optional, Union  # more typehints
+from collections import deque
+from engines import NumpyBoard, Edge, changeCounts, cellBox, np
+from rules import Rule, parseRule, stepCells, aliveCells
+
+# NumpyBoard that only recomputes the parts of the field that can change:
+# the field is split into tileSize x tileSize tiles and a tile is only stepped if it
+# or one of its 8 neighbours changed in the last generation
+
+class TiledBoard(NumpyBoard):
+    name = "tiled"
+    ruleKinds = frozenset({"simple", "generations"})  # the halo of a tile is one cell wide
+    tileSize: int = 32
+
+    def __init__(self, size: int, edge: Edge = "frozen") -> None:
+        super().__init__(size, edge)
+        self.tilesPerSide = -(-size // self.tileSize)
+        self.active = np.zeros((self.tilesPerSide, self.tilesPerSide), dtype=bool)  # tiles to compute next generation
+        self.tileCells: dict[tuple[int, int], list[tuple[int, int]]] = {}  # alive cells per non empty tile (render cache)
+        self.staleTiles: set[tuple[int, int]] = set()  # tiles whose entry in tileCells has to be rebuilt
+        self.activeTileCounts: deque[int] = deque(maxlen=1000)  # amount of computed tiles of the last generations
+        self.box: Optional[tuple[int, int, int, int]] = None  # bounding box kept along for lastStats (None: empty)
+        self.boxStale = True  # the box has to be searched again (after edits and loads)
+
+    @property
+    def lastActiveTiles(self) -> int:
+        return self.activeTileCounts[-1] if self.activeTileCounts else 0
+
+    def tileBounds(self, tileX: int, tileY: int) -> tuple[int, int, int, int]:  # (x0, y0, x1, y1) of a tile in cells
+        t = self.tileSize
+        return (tileX * t, tileY * t, min((tileX + 1) * t, self.size), min((tileY + 1) * t, self.size))
+
+    def markChanged(self, tileX: int, tileY: int) -> None:  # the tile and its neighbours have to be computed next generation
+        n = self.tilesPerSide
+        for offsetY in (-1, 0, 1):
+            for offsetX in (-1, 0, 1):
+                nx, ny = tileX + offsetX, tileY + offsetY
+                if self.edge == "wrap":
+                    nx, ny = nx % n, ny % n
+                elif not (0 <= nx < n and 0 <= ny < n):
+                    continue
+                self.active[ny, nx] = True
+        self.staleTiles.add((tileX, tileY))
+
+    def setRule(self, rule: Union[Rule, str]) -> None:
+        rule = parseRule(rule) if isinstance(rule, str) else rule
+        if 0 in rule.birth:  # B0 changes tiles that have no changed neighbours
+            raise ValueError(f"the {self.name} engine cant run B0 rules ({rule.string})")
+        super().setRule(rule)
+        self.markAll()  # stable tiles arent stable under the new rule
+
+    def markAll(self) -> None:
+        self.active[:] = True
+        self.boxStale = True
+        self.tileCells.clear()
+        self.staleTiles = {(tileX, tileY) for tileY in range(self.tilesPerSide) for tileX in range(self.tilesPerSide)}
+
+    def setCell(self, x: int, y: int, state: Literal[1, 0]) -> None:
+        if self.cells[y, x] != state:
+            self.cells[y, x] = state
+            self.markChanged(x // self.tileSize, y // self.tileSize)
+            self.boxStale = True
+
+    def haloRegion(self, x0: int, y0: int, x1: int, y1: int) -> "np.ndarray":  # the tile plus a one cell border
+        if self.edge == "wrap":
+            rows = np.arange(y0 - 1, y1 + 1) % self.size
+            cols = np.arange(x0 - 1, x1 + 1) % self.size
+            return self.cells[np.ix_(rows, cols)]
+        region = self.cells[max(y0 - 1, 0):y1 + 1, max(x0 - 1, 0):x1 + 1]
+        return np.pad(region, ((int(y0 == 0), int(y1 == self.size)), (int(x0 == 0), int(x1 == self.size))))
+
+    def stepTile(self, x0: int, y0: int, x1: int, y1: int) -> "np.ndarray":
+        region = self.haloRegion(x0, y0, x1, y1)
+        old = region[1:-1, 1:-1]
+        new = stepCells(aliveCells(region, self.rule), old, self.rule)
+        if self.edge == "frozen":
+            last = self.size - 1
+            if y0 == 0: new[0, :] = old[0, :]
+            if y1 - 1 == last: new[-1, :] = old[-1, :]
+            if x0 == 0: new[:, 0] = old[:, 0]
+            if x1 - 1 == last: new[:, -1] = old[:, -1]
+        return new
+
+    def step(self) -> int:
+        tileYs, tileXs = np.nonzero(self.active)
+        updates = []
+        for tileX, tileY in zip(tileXs.tolist(), tileYs.tolist()):
+            x0, y0, x1, y1 = self.tileBounds(tileX, tileY)
+            new = self.stepTile(x0, y0, x1, y1)
+            if not np.array_equal(new, self.cells[y0:y1, x0:x1]):
+                updates.append((tileX, tileY, new))
+        # writing the new tiles back only after all tiles are computed, so they dont interfere w/ each other
+        self.active[:] = False
+        births = deaths = 0
+        box, stale = self.box, self.boxStale or not self.trackStats
+        for tileX, tileY, new in updates:
+            x0, y0, x1, y1 = self.tileBounds(tileX, tileY)
+            if self.trackStats:  # only the changed tiles
+                born, died = changeCounts(self.cells[y0:y1, x0:x1], new)
+                births, deaths = births + born, deaths + died
+                if not stale:  # the box grows by the changed tiles, the field is only searched again if cells died in a tile on its border
+                    if died and box is not None and (x0 <= box[0] < x1 or x0 < box[2] <= x1 or y0 <= box[1] < y1 or y0 < box[3] <= y1):
+                        stale = True
+                    elif born:
+                        tileBox = cellBox(new, x0, y0)
+                        box = tileBox if box is None else (min(box[0], tileBox[0]), min(box[1], tileBox[1]), max(box[2], tileBox[2]), max(box[3], tileBox[3]))
+            self.cells[y0:y1, x0:x1] = new
+            self.markChanged(tileX, tileY)
+        if self.trackStats:
+            self.box, self.boxStale = cellBox(self.cells) if stale else box, False
+            self.lastStats = (births, deaths, self.box)
+        else:
+            self.boxStale = True
+        self.activeTileCounts.append(len(tileXs))
+        return 1
+
+    @property
+    def activeCells(self) -> int:
+        return self.lastActiveTiles * self.tileSize * self.tileSize
+
+    def liveCells(self) -> Iterator[tuple[int, int]]:  # stable tiles reuse their cached cell list
+        for tileX, tileY in self.staleTiles:
+            x0, y0, x1, y1 = self.tileBounds(tileX, tileY)
+            ys, xs = np.nonzero(self.cells[y0:y1, x0:x1])
+            if len(xs):
+                self.tileCells[(tileX, tileY)] = list(zip((xs + x0).tolist(), (ys + y0).tolist()))
+            else:
+                self.tileCells.pop((tileX, tileY), None)
+        self.staleTiles.clear()
+        for cells in self.tileCells.values():
+            yield from cells
+
+    def clear(self) -> None:
+        super().clear()
+        self.active[:] = False
+        self.tileCells.clear()
+        self.staleTiles.clear()
+        self.box, self.boxStale = None, False
+
+    def loadList(self, rows: list[list[int]]) -> None:
+        super().loadList(rows)
+        self.markAll()
+
+    def loadBits(self, data: bytes) -> None:
+        super().loadBits(data)
+        self.markAll()
+
+    def loadWindow(self, x0: int, y0: int, window: "np.ndarray") -> None:
+        super().loadWindow(x0, y0, window)
+        self.markAll()
@@ -0,0 +1,236 @@
+from typing import Iterable, Optional  # more typehints
+from collections import OrderedDict
+from bisect import bisect_left, bisect_right
+import zlib
+from engines import Board, np
+
+# rewind/undo history of a board: every generation (and every finished edit) is an entry of the timeline.
+# Every `interval` entries a keyframe (the whole state, compressed) starts a new segment, the entries in between
+# only store the cells that flipped: the xor of the state before and after, cropped to the changed rectangle and
+# compressed (one bit per cell for two state rules). Xor works in both directions, so the neighbouring entries of the
+# current one are reached by applying a single delta, anything further away by decoding the keyframe of its segment.
+# The compressed segments are capped by a memory budget: the least recently used ones are evicted first
+# (never the segment the board is in), evicted entries cant be sought anymore. A segment also keeps the generation
+# and kind of its entries, so they are counted into the budget and go with it.
+# The generations of the entries never go down (recording after a seek drops the entries after it),
+# so an entry of a generation is found by bisecting.
+# A state is (x0, y0, cells): the uint8 array of the cells from (x0, y0), the field for bounded boards
+# and the bounding box of the non empty cells for the unbounded plane
+
+State = tuple[int, int, "np.ndarray"]
+Packed = tuple[int, int, int, int, bool, bytes]  # x0, y0, width, height, one bit per cell, compressed data
+entryBytes: int = 64  # what the generation and kind of an entry take in memory (list slots, the int), counted into the budget
+
+def boardState(board: Board) -> State:
+    if board.bounded:
+        return 0, 0, board.window(0, 0, board.size, board.size)
+    x0, y0, x1, y1 = board.boundingBox() or (0, 0, 0, 0)
+    return x0, y0, board.window(x0, y0, x1, y1)
+
+def loadBoardState(board: Board, state: State) -> None:
+    x0, y0, cells = state
+    if board.bounded and board.rule.states == 2 and cells.shape == (board.size, board.size):
+        board.loadBits(np.packbits(cells, axis=None, bitorder="little").tobytes())
+        return
+    board.clear()
+    if cells.size:
+        board.loadWindow(x0, y0, cells)
+
+def cellsState(cells: Iterable[tuple[int, int]]) -> State:  # state of a set of alive cells (Conways_game_of_life.py)
+    cells = np.array(list(cells), dtype=np.int64).reshape(-1, 2)
+    if not len(cells):
+        return 0, 0, np.zeros((0, 0), dtype=np.uint8)
+    (x0, y0), (x1, y1) = cells.min(axis=0), cells.max(axis=0) + 1
+    out = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+    out[cells[:, 1] - y0, cells[:, 0] - x0] = 1
+    return int(x0), int(y0), out
+
+def cellsFromState(state: State) -> list[tuple[int, int]]:
+    x0, y0, cells = state
+    ys, xs = np.nonzero(cells)
+    return list(zip((xs + x0).tolist(), (ys + y0).tolist()))
+
+def cropped(x0: int, y0: int, cells: "np.ndarray") -> State:  # the smallest rectangle around the non empty cells
+    rows, cols = np.flatnonzero(cells.any(axis=1)), np.flatnonzero(cells.any(axis=0))
+    if not len(rows):
+        return 0, 0, np.zeros((0, 0), dtype=np.uint8)
+    return x0 + int(cols[0]), y0 + int(rows[0]), cells[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+
+def xorStates(a: State, b: State) -> State:  # xor of two states on the rectangle around both
+    (ax, ay, aCells), (bx, by, bCells) = a, b
+    if (ax, ay) == (bx, by) and aCells.shape == bCells.shape:
+        return ax, ay, aCells ^ bCells
+    rects = [(x, y, cells) for x, y, cells in (a, b) if cells.size]
+    if not rects:
+        return 0, 0, np.zeros((0, 0), dtype=np.uint8)
+    x0, y0 = min(x for x, _, _ in rects), min(y for _, y, _ in rects)
+    x1, y1 = max(x + c.shape[1] for x, _, c in rects), max(y + c.shape[0] for _, y, c in rects)
+    out = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+    for x, y, cells in rects:
+        out[y - y0:y - y0 + cells.shape[0], x - x0:x - x0 + cells.shape[1]] ^= cells
+    return x0, y0, out
+
+def difference(a: State, b: State) -> State:  # the flipped cells between two states, cropped
+    return cropped(*xorStates(a, b))
+
+def applyDelta(state: State, delta: State) -> State:  # in place if the delta is inside the state (the field of bounded boards)
+    (x0, y0, cells), (dx, dy, flips) = state, delta
+    h, w = flips.shape
+    if not flips.size:
+        return state
+    if x0 <= dx and y0 <= dy and dx + w <= x0 + cells.shape[1] and dy + h <= y0 + cells.shape[0]:
+        cells[dy - y0:dy - y0 + h, dx - x0:dx - x0 + w] ^= flips
+        return state
+    return xorStates(state, delta)
+
+def pack(state: State) -> Packed:
+    x0, y0, cells = state
+    bits = bool(cells.size) and int(cells.max()) <= 1
+    data = np.packbits(cells, axis=None, bitorder="little").tobytes() if bits else cells.tobytes()
+    return x0, y0, cells.shape[1], cells.shape[0], bits, zlib.compress(data, 1)
+
+def unpack(packed: Packed) -> State:
+    x0, y0, width, height, bits, data = packed
+    raw = np.frombuffer(bytearray(zlib.decompress(data)), dtype=np.uint8)  # writable, deltas are applied in place
+    if bits:
+        raw = np.unpackbits(raw, count=width * height, bitorder="little")
+    return x0, y0, raw.reshape(height, width)
+
+
+class Segment:  # a keyframe and the deltas of the entries after it, with the generation and kind of every entry
+    def __init__(self, keyframe: Packed, generation: int, kind: str) -> None:
+        self.keyframe = keyframe
+        self.deltas: list[Packed] = []
+        self.generations: list[int] = [generation]
+        self.kinds: list[str] = [kind]  # "step" or "edit"
+        self.nbytes = len(keyframe[-1]) + entryBytes
+
+    def add(self, delta: Packed, generation: int, kind: str) -> None:
+        self.deltas.append(delta)
+        self.generations.append(generation)
+        self.kinds.append(kind)
+        self.nbytes += len(delta[-1]) + entryBytes
+
+    def truncate(self, length: int) -> None:  # keeps the keyframe and the first `length - 1` deltas
+        for delta in self.deltas[length - 1:]:
+            self.nbytes -= len(delta[-1]) + entryBytes
+        del self.deltas[length - 1:]
+        del self.generations[length:]
+        del self.kinds[length:]
+
+
+class Timeline:
+    def __init__(self, interval: int = 32, budget: int = 64 * 1024 * 1024) -> None:
+        self.interval = interval  # entries per segment (one keyframe each)
+        self.budget = budget  # bytes of compressed segments
+        self.length = 0  # amount of entries (the evicted ones too)
+        self.segments: OrderedDict[int, Segment] = OrderedDict()  # first entry -> segment, least recently used first
+        self.starts: list[int] = []  # the first entries of the segments in order, for bisecting
+        self.edits: list[int] = []  # the "edit" entries of the segments in order
+        self.position = -1  # the entry the board is in
+        self.state: Optional[State] = None  # the state of that entry
+        self.evicted = 0  # amount of evicted segments
+        self.nbytes = 0  # bytes of all segments, kept along so the ui thread never goes through the segments
+
+    def segmentOf(self, position: int) -> Optional[Segment]:
+        return self.segments.get(position - position % self.interval)
+
+    def record(self, state: State, generation: int, kind: str = "step") -> None:
+        # a new entry after the current one, the entries after the current one (the redo history) are dropped
+        position = self.position + 1
+        if position < self.length:
+            self.length = position
+            del self.edits[bisect_left(self.edits, position):]
+            for start in self.starts[bisect_right(self.starts, position - self.interval):]:
+                segment = self.segments[start]
+                self.nbytes -= segment.nbytes
+                if start >= position:
+                    del self.segments[start]
+                else:
+                    segment.truncate(position - start)
+                    self.nbytes += segment.nbytes
+            del self.starts[bisect_left(self.starts, position):]
+        if position % self.interval == 0:
+            segment = self.segments[position] = Segment(pack(state), generation, kind)
+            self.starts.append(position)
+        else:  # the segment of the current entry is never evicted
+            segment = self.segmentOf(position)
+            self.nbytes -= segment.nbytes
+            segment.add(pack(difference(self.state, state)), generation, kind)
+        self.nbytes += segment.nbytes
+        if kind == "edit":
+            self.edits.append(position)
+        self.length = position + 1
+        self.position, self.state = position, state
+        self.segments.move_to_end(position - position % self.interval)
+        self.evict()
+
+    def evict(self) -> None:
+        current = self.position - self.position % self.interval
+        while self.nbytes > self.budget and len(self.segments) > 1:
+            start = next((start for start in self.segments if start != current), None)
+            if start is None:
+                return
+            self.nbytes -= self.segments.pop(start).nbytes
+            del self.starts[bisect_left(self.starts, start)]
+            del self.edits[bisect_left(self.edits, start):bisect_left(self.edits, start + self.interval)]
+            self.evicted += 1
+
+    def available(self, position: int) -> bool:
+        return 0 <= position < self.length and self.segmentOf(position) is not None
+
+    def generationOf(self, position: int) -> int:  # the generation of a recorded entry
+        if not self.available(position):
+            raise LookupError(f"entry {position} is not recorded (anymore)")
+        return self.segmentOf(position).generations[position % self.interval]
+
+    def seek(self, position: int) -> State:  # the state of an entry, which becomes the current one
+        segment = self.segmentOf(position)
+        if not 0 <= position < self.length or segment is None:
+            raise LookupError(f"entry {position} is not recorded (anymore)")
+        start = position - position % self.interval
+        current = self.position
+        if self.state is not None and start <= current < start + self.interval and abs(position - current) <= position - start:
+            x0, y0, cells = self.state  # from the current entry, one delta per entry in either direction
+            state = (x0, y0, cells.copy())
+            for i in range(current + 1, position + 1):
+                state = applyDelta(state, unpack(segment.deltas[i - start - 1]))
+            for i in range(current, position, -1):
+                state = applyDelta(state, unpack(segment.deltas[i - start - 1]))
+        else:  # from the keyframe
+            state = unpack(segment.keyframe)
+            for delta in segment.deltas[:position - start]:
+                state = applyDelta(state, unpack(delta))
+        self.segments.move_to_end(start)
+        self.position, self.state = position, state
+        return state
+
+    def seekGeneration(self, generation: int) -> Optional[State]:  # the last recorded entry of a generation
+        index = bisect_right(self.starts, generation, key=lambda start: self.segments[start].generations[0])
+        if not index:
+            return None
+        start = self.starts[index - 1]
+        generations = self.segments[start].generations
+        offset = bisect_right(generations, generation) - 1
+        return self.seek(start + offset) if generations[offset] == generation else None
+
+    def undoTarget(self) -> Optional[int]:  # the entry before the last edit up to the current entry
+        index = bisect_right(self.edits, self.position) - 1
+        if index < 0 or self.edits[index] == 0:
+            return None
+        return self.edits[index] - 1 if self.available(self.edits[index] - 1) else None
+
+    def redoTarget(self) -> Optional[int]:  # the next edit after the current entry
+        index = bisect_right(self.edits, self.position)
+        if index == len(self.edits):
+            return None
+        return self.edits[index] if self.available(self.edits[index]) else None
+
+    def clear(self) -> None:
+        self.length = 0
+        self.segments.clear()
+        self.starts.clear()
+        self.edits.clear()
+        self.nbytes = 0
+        self.position = -1
+        self.state = None